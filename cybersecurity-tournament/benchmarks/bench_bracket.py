@@ -0,0 +1,37 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bracket
+
+# Builds and plays out whole brackets on team indices only (no Team/Match
+# objects), single and double elimination, with and without byes.
+
+def time_bracket(team_count, double_elimination, seed=0):
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    tree = bracket.build(team_count, double_elimination)
+    built = time.perf_counter()
+    champion = tree.play_out(rng)
+    played = time.perf_counter()
+    return built - start, played - built, champion
+
+def main():
+    parser = argparse.ArgumentParser(description="Bracket build and play-out time")
+    parser.add_argument("sizes", nargs="*", type=int,
+                        default=[16, 1000, 1 << 16, (1 << 20) - 1000, 1 << 20])
+    parser.add_argument("--double", action="store_true", help="double elimination")
+    args = parser.parse_args()
+
+    print(f"{'teams':>9} {'format':>7} {'build s':>8} {'play s':>8} {'total s':>8}")
+    for size in args.sizes:
+        build_s, play_s, _ = time_bracket(size, args.double)
+        fmt = "double" if args.double else "single"
+        print(f"{size:>9} {fmt:>7} {build_s:>8.3f} {play_s:>8.3f} {build_s + play_s:>8.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bracket_view
+from bench_memory import write_teams
+from bracket_view import TILE, ZOOMS
+from scheduler import Scheduler
+
+# Bracket canvas tiles (bracket_view.py), without Tk: the Pillow work a pan
+# step costs at every zoom level, and redrawing the visible tiles after a
+# round, patched (only changed matches) against drawn from scratch. A pan
+# step has to stay well under a frame (16 ms) to feel smooth.
+
+def visible(tiles, level, x, y, width, height):
+    across, down = tiles.tiles(level)
+    return [(tx, ty)
+            for tx in range(max(0, int(x // TILE) - 1), min(across, int((x + width) // TILE) + 2))
+            for ty in range(max(0, int(y // TILE) - 1), min(down, int((y + height) // TILE) + 2))]
+
+def pan(tiles, level, width, height, step):
+    # Straight down the middle of the bracket, like dragging the canvas
+    state = tiles.state()
+    scale = ZOOMS[level]
+    x = max(0, (tiles.world_width * scale - width) / 2)
+    shown = {}
+    times = []
+    drawn = 0
+    y = 0
+    while y + height <= tiles.world_height * scale or not times:
+        start = time.perf_counter()
+        spots = visible(tiles, level, x, y, width, height)
+        for spot in spots:
+            key = tiles.tile_key(level, *spot, state)
+            if shown.get(spot) != key:
+                shown[spot] = tiles.tile(level, *spot, state)[0]
+                drawn += 1
+        shown = {spot: shown[spot] for spot in spots}
+        times.append(time.perf_counter() - start)
+        y += step
+    return times, drawn
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Bracket canvas tile rendering")
+    parser.add_argument("--teams", type=int, default=1024)
+    parser.add_argument("--double", action="store_true", help="double elimination")
+    parser.add_argument("--width", type=int, default=1100)
+    parser.add_argument("--height", type=int, default=700)
+    parser.add_argument("--step", type=int, default=40, help="pixels per pan step")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "teams.txt")
+        write_teams(path, args.teams)
+        scheduler = Scheduler(seed=1)
+        scheduler.load_teams(path)
+        scheduler.divide_groups()
+        scheduler.build_bracket(args.double, random_draw=True)
+
+    tiles = bracket_view.BracketTiles(scheduler)
+    print(f"{args.teams} teams, {tiles.world_width} x {tiles.world_height} px at zoom 1")
+    # First screen separately; the step columns are the pan steps after it
+    print(f"{'zoom':>7} {'steps':>6} {'tiles':>6} {'first ms':>9} {'p50 ms':>8} {'p99 ms':>8}"
+          f" {'max ms':>8} {'again max':>10}")
+    for level in range(len(ZOOMS)):
+        times, drawn = pan(tiles, level, args.width, args.height, args.step)
+        # The same pan again comes from the cache
+        again, _ = pan(tiles, level, args.width, args.height, args.step)
+        first, steps = times[0], times[1:] or times
+        print(f"{ZOOMS[level]:>7} {len(times):>6} {drawn:>6} {first * 1000:>9.2f} "
+              f"{percentile(steps, 0.5) * 1000:>8.2f} {percentile(steps, 0.99) * 1000:>8.2f} "
+              f"{max(steps) * 1000:>8.2f} {max(again[1:] or again) * 1000:>10.2f}")
+
+    # One round played: the first screen redrawn, patched vs from scratch
+    spots = visible(tiles, 0, 0, 0, args.width, args.height)
+    before = tiles.state()
+    keys = {spot: tiles.tile(0, *spot, before)[0] for spot in spots}
+    round_name = scheduler.round_names[0]
+    scheduler.schedule_round(round_name)
+    scheduler.complete_round(round_name)
+    after = tiles.state()
+    changed = bracket_view.changed_nodes(before, after, tiles.size)
+    start = time.perf_counter()
+    for spot in spots:
+        tiles.tile(0, *spot, after, keys[spot], changed)
+    patched = time.perf_counter() - start
+    tiles.cache.clear()
+    start = time.perf_counter()
+    for spot in spots:
+        tiles.tile(0, *spot, after)
+    scratch = time.perf_counter() - start
+    print(f"\n{round_name}: {len(changed)} boxes changed, {len(spots)} tiles redrawn in "
+          f"{patched * 1000:.1f} ms patched, {scratch * 1000:.1f} ms from scratch")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database
+from bench_memory import write_teams
+from scheduler import Scheduler
+
+# SQLite store: cost of keeping a tournament in the database as it is played
+# (teams, groups, every round and result), history queries once many
+# tournaments are stored, and how long readers wait while a round is being
+# written on another thread (WAL mode).
+
+def play(scheduler):
+    scheduler.divide_groups()
+    scheduler.build_bracket(random_draw=True)
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+
+def timed_run(path, store, compact, seed):
+    scheduler = Scheduler(compact=compact, seed=seed)
+    scheduler.load_teams(path)
+    start = time.perf_counter()
+    if store is not None:
+        scheduler.attach_store(store)
+    play(scheduler)
+    return scheduler, time.perf_counter() - start
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite tournament store")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1 << 10, 1 << 14, 1 << 17])
+    parser.add_argument("--tournaments", type=int, default=20,
+                        help="tournaments stored before timing history queries")
+    parser.add_argument("--compact", action="store_true", help="compact column storage")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = database.TournamentStore(os.path.join(directory, "tournaments.db"))
+        print(f"{'teams':>8} {'memory s':>9} {'stored s':>9} {'overhead':>9} {'rows/s':>9}")
+        for size in args.sizes:
+            path = os.path.join(directory, f"teams-{size}.txt")
+            write_teams(path, size)
+            _, plain_s = timed_run(path, None, args.compact, 1)
+            _, stored_s = timed_run(path, store, args.compact, 1)
+            # teams + groups + matches inserted + results updated
+            rows = 4 * size
+            print(f"{size:>8} {plain_s:>9.3f} {stored_s:>9.3f} {stored_s / plain_s:>8.1f}x "
+                  f"{rows / (stored_s - plain_s):>9.0f}")
+
+        size = args.sizes[0]
+        path = os.path.join(directory, f"teams-{size}.txt")
+        for seed in range(args.tournaments):
+            timed_run(path, store, args.compact, seed)
+        champion = store.champions(1)[0][0]
+        queries = {
+            "tournaments": lambda: store.tournaments(),
+            "team_history": lambda: store.team_history(champion),
+            "head_to_head": lambda: store.head_to_head(champion, "Team 1"),
+            "champions": lambda: store.champions(),
+            "round page": lambda: store.round_matches(1, "Round 1", 200, 250),
+        }
+        print(f"\n{len(store.tournaments(limit=1 << 30))} tournaments stored")
+        print(f"{'query':<14} {'ms':>8}")
+        for name, query in queries.items():
+            start = time.perf_counter()
+            for _ in range(100):
+                query()
+            print(f"{name:<14} {(time.perf_counter() - start) * 10:>8.3f}")
+
+        # Readers on this thread while a worker writes the largest tournament
+        path = os.path.join(directory, f"teams-{args.sizes[-1]}.txt")
+        worker = threading.Thread(target=timed_run, args=(path, store, args.compact, 99))
+        waits = []
+        worker.start()
+        while worker.is_alive():
+            start = time.perf_counter()
+            store.tournaments()
+            store.team_history(champion)
+            waits.append(time.perf_counter() - start)
+        worker.join()
+        print(f"\n{len(waits)} reads during a {args.sizes[-1]}-team write: "
+              f"p50 {percentile(waits, 0.5) * 1000:.2f} ms, p99 {percentile(waits, 0.99) * 1000:.2f} ms, "
+              f"max {max(waits) * 1000:.2f} ms")
+        store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import export
+from bench_memory import write_teams
+from scheduler import Scheduler
+
+# Export speed and peak memory per format. The streaming writers should peak
+# at the same few hundred KiB whatever the tournament size; run once with
+# --trace for the memory column (tracemalloc slows the writers down a lot).
+
+def played(path, compact):
+    scheduler = Scheduler(compact=compact, seed=1)
+    scheduler.load_teams(path)
+    scheduler.divide_groups()
+    scheduler.build_bracket(random_draw=True)
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+    return scheduler
+
+def main():
+    parser = argparse.ArgumentParser(description="Result export speed and memory")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 1 << 16, 1 << 20])
+    parser.add_argument("--formats", default="csv,jsonl,svg,png")
+    parser.add_argument("--compact", action="store_true", help="compact column storage")
+    parser.add_argument("--trace", action="store_true", help="measure peak memory (slow)")
+    args = parser.parse_args()
+
+    print(f"{'teams':>9} {'format':>6} {'rows':>9} {'seconds':>8} {'rows/s':>9} {'MiB':>7} {'peak KiB':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"teams-{size}.txt")
+            write_teams(path, size)
+            scheduler = played(path, args.compact)
+            rows = export.match_count(scheduler)
+            for extension in args.formats.split(","):
+                out = os.path.join(directory, f"results.{extension}")
+                if args.trace:
+                    tracemalloc.start()
+                start = time.perf_counter()
+                export.export(scheduler, out)
+                seconds = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1] if args.trace else 0
+                tracemalloc.stop()
+                print(f"{size:>9} {extension:>6} {rows:>9} {seconds:>8.3f} {rows / seconds:>9.0f} "
+                      f"{os.path.getsize(out) / 2**20:>7.1f} "
+                      f"{peak / 1024 if args.trace else float('nan'):>9.0f}")
+
+if __name__ == "__main__":
+    main()
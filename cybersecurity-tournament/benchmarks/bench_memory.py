@@ -0,0 +1,57 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import Scheduler
+
+# Compares retained memory of the default (object per team/match) and compact
+# (column storage) Scheduler modes after loading teams and scheduling Round 1.
+
+def write_teams(path, count, seed=0):
+    rng = random.Random(seed)
+    with open(path, "w") as file:
+        for i in range(count):
+            file.write(f"Team {i};Member{rng.randrange(count)},Member{rng.randrange(count)};"
+                       f"{rng.randint(1, count)}\n")
+
+def measure(path, compact):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    scheduler = Scheduler(compact=compact)
+    scheduler.load_teams(path)
+    teams = scheduler.teams[:len(scheduler.teams) // 2 * 2]
+    scheduler.schedule_matches(teams, "Round 1")
+    del teams
+    gc.collect()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return scheduler, current, peak, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduler memory: default vs compact storage")
+    parser.add_argument("sizes", nargs="*", type=int, default=[100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"{'teams':>10} {'mode':>8} {'retained MiB':>13} {'peak MiB':>9} {'B/team':>7} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"teams-{size}.txt")
+            write_teams(path, size)
+            for compact in (False, True):
+                scheduler, current, peak, elapsed = measure(path, compact)
+                mode = "compact" if compact else "default"
+                print(f"{size:>10} {mode:>8} {current / (1 << 20):>13.1f} "
+                      f"{peak / (1 << 20):>9.1f} {current / size:>7.0f} {elapsed:>8.2f}")
+                del scheduler
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import random
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ratings
+
+# Rating engine: one match at a time (what a running tournament does) against
+# the NumPy batch replay of a whole match history, on synthetic knockout
+# tournaments. Both have to end with the same ratings.
+
+def history(tournaments, teams, pool, seed=0):
+    # [(team names by index, [(winners, losers) per round])], every round a
+    # random knockout round over the teams still in
+    rng = random.Random(seed)
+    result = []
+    for _ in range(tournaments):
+        names = [f"Team {i}" for i in rng.sample(range(pool), teams)]
+        alive = list(range(teams))
+        rounds = []
+        while len(alive) > 1:
+            winners, losers = array("i"), array("i")
+            for a, b in zip(alive[0::2], alive[1::2]):
+                if rng.random() < 0.5:
+                    a, b = b, a
+                winners.append(a)
+                losers.append(b)
+            rounds.append((winners, losers))
+            alive = list(winners)
+        result.append((names, rounds))
+    return result
+
+def incremental(system, tournaments):
+    table = ratings.RatingTable(system)
+    for names, rounds in tournaments:
+        rows = array("i", map(table.row, names))
+        table.system.new_period(table, rows)
+        for winners, losers in rounds:
+            for w, l in zip(winners, losers):
+                table.record(rows[w], rows[l])
+    return table
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental vs batch rating updates")
+    parser.add_argument("--tournaments", type=int, default=200)
+    parser.add_argument("--teams", type=int, default=1 << 10, help="teams per tournament")
+    parser.add_argument("--pool", type=int, default=1 << 14, help="distinct teams overall")
+    args = parser.parse_args()
+
+    tournaments = history(args.tournaments, args.teams, args.pool)
+    matches = sum(len(w) for _, rounds in tournaments for w, _ in rounds)
+    print(f"{args.tournaments} tournaments, {matches:,} matches")
+    print(f"{'system':<8} {'one by one s':>13} {'batch s':>9} {'speedup':>8} {'max diff':>10}")
+    for system in ratings.SYSTEMS:
+        start = time.perf_counter()
+        one = incremental(system, tournaments)
+        one_s = time.perf_counter() - start
+        start = time.perf_counter()
+        batch = ratings.RatingTable(system)
+        batch.recompute(tournaments)
+        batch_s = time.perf_counter() - start
+        diff = max(abs(one.rating[one.rows[name]] - batch.rating[row])
+                   for name, row in batch.rows.items())
+        print(f"{system:<8} {one_s:>13.3f} {batch_s:>9.3f} {one_s / batch_s:>7.1f}x {diff:>10.2e}")
+
+if __name__ == "__main__":
+    main()
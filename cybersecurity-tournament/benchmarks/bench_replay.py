@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memory import write_teams
+from scheduler import Scheduler
+
+# Plays a seeded tournament through Scheduler.complete_round, then rebuilds it
+# from the event log with Scheduler.replay (no draws, no win model) and checks
+# both end with the same champion.
+
+def loaded(path, compact, seed=None):
+    scheduler = Scheduler(compact=compact, seed=seed)
+    scheduler.load_teams(path)
+    scheduler.divide_groups()
+    return scheduler
+
+def play(scheduler, double_elimination, model):
+    scheduler.build_bracket(double_elimination, random_draw=True)
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name, model)
+    return scheduler
+
+def main():
+    parser = argparse.ArgumentParser(description="Event log replay vs playing again")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 1 << 16, 1 << 18])
+    parser.add_argument("--double", action="store_true", help="double elimination")
+    parser.add_argument("--compact", action="store_true", help="compact column storage")
+    parser.add_argument("--model", choices=("coin", "logistic"), default="coin",
+                        help="win model of the played run (logistic needs NumPy)")
+    args = parser.parse_args()
+    model = None
+    if args.model == "logistic":
+        import simulation
+        model = simulation.RankLogistic()
+
+    print(f"{'teams':>9} {'events':>9} {'log KiB':>8} {'play s':>8} {'replay s':>9} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"teams-{size}.txt")
+            write_teams(path, size)
+            played = loaded(path, args.compact, seed=1)
+            start = time.perf_counter()
+            play(played, args.double, model)
+            play_s = time.perf_counter() - start
+
+            replayed = loaded(path, args.compact)
+            start = time.perf_counter()
+            replayed.replay(played.events)
+            replay_s = time.perf_counter() - start
+            assert replayed.winner == played.winner or replayed.winner.name == played.winner.name
+
+            events = played.events
+            print(f"{size:>9} {len(events):>9} {len(events.tobytes()) / 1024:>8.0f} "
+                  f"{play_s:>8.3f} {replay_s:>9.3f} {play_s / replay_s:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
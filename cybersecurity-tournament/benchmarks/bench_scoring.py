@@ -0,0 +1,86 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scoring
+from bench_memory import write_teams
+from scheduler import Scheduler
+
+# Load test for the live scoring service: the server runs on its own thread
+# as in the GUI, and a stand-in for the judges' client sends every result of
+# every round over a few connections, pipelined, then waits for the replies.
+# Each round is asked for with {"get": "round"} once the previous round is
+# closed, like a judge's tablet would.
+
+async def judge(host, port, events):
+    reader, writer = await asyncio.open_connection(host, port, limit=scoring.LINE_LIMIT)
+    writer.write(b"".join(json.dumps(event).encode() + b"\n" for event in events))
+    await writer.drain()
+    rejected = 0
+    for _ in events:
+        reply = json.loads(await reader.readline())
+        rejected += not reply["ok"]
+    writer.close()
+    await writer.wait_closed()
+    return rejected
+
+async def ask(host, port, query):
+    reader, writer = await asyncio.open_connection(host, port, limit=1 << 30)
+    writer.write(json.dumps(query).encode() + b"\n")
+    reply = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return reply
+
+async def play(host, port, connections, rng):
+    sent = rejected = 0
+    while True:
+        status = await ask(host, port, {"get": "status"})
+        if status["winner"] is not None:
+            return sent, rejected
+        open_rounds = [entry["name"] for entry in status["rounds"] if entry["open"]]
+        round_name = open_rounds[0]
+        matches = (await ask(host, port, {"get": "round", "round": round_name}))["matches"]
+        events = [{"round": round_name, "match": i, "scores": [rng.randrange(100), rng.randrange(100, 200)]
+                   if rng.random() < 0.5 else [rng.randrange(100, 200), rng.randrange(100)]}
+                  for i, (_, _, winner) in enumerate(matches, 1) if winner is None]
+        shares = [events[c::connections] for c in range(connections)]
+        counts = await asyncio.gather(*(judge(host, port, share) for share in shares if share))
+        sent += len(events)
+        rejected += sum(counts)
+
+def main():
+    parser = argparse.ArgumentParser(description="Live scoring throughput")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1024, 1 << 14, 1 << 16])
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=scoring.BATCH_SIZE)
+    parser.add_argument("--compact", action="store_true", help="compact column storage")
+    args = parser.parse_args()
+
+    print(f"{'teams':>9} {'events':>9} {'batches':>8} {'seconds':>8} {'events/s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"teams-{size}.txt")
+            write_teams(path, size)
+            scheduler = Scheduler(compact=args.compact, seed=1)
+            scheduler.load_teams(path)
+            scheduler.divide_groups()
+            scheduler.build_bracket(random_draw=True)
+            service = scoring.ScoreService(scheduler, port=0, batch_size=args.batch)
+            host, port = service.start_in_thread()
+            start = time.perf_counter()
+            sent, rejected = asyncio.run(play(host, port, args.connections, random.Random(size)))
+            seconds = time.perf_counter() - start
+            service.stop()
+            assert rejected == 0 and service.applied == sent, (rejected, service.applied, sent)
+            print(f"{size:>9} {sent:>9} {service.batches:>8} {seconds:>8.3f} {sent / seconds:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import argparse
+import gc
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+from bench_memory import write_teams
+
+# Multi-tournament host: memory per loaded tournament, requests per second
+# from several client threads spread over all tournaments, and what eviction
+# to a snapshot and mapping back in cost per tournament.
+
+def client(port, paths, results):
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    for method, path, body in paths:
+        connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        done += response.status < 400
+    connection.close()
+    results.append(done)
+
+def hammer(port, paths, threads):
+    results = []
+    workers = [threading.Thread(target=client, args=(port, paths[t::threads], results))
+               for t in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return sum(results), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-tournament server throughput and memory")
+    parser.add_argument("--tournaments", type=int, default=32)
+    parser.add_argument("--teams", type=int, default=4096, help="teams per tournament")
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--object", action="store_true",
+                        help="Team/Match objects instead of compact storage")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Requests can only name teams files inside the host directory
+        teams = "teams.txt"
+        host = server.TournamentHost(directory, max_active=args.tournaments, workers=1)
+        write_teams(os.path.join(directory, teams), args.teams)
+        httpd = server.make_server(host, port=0)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        port = httpd.server_address[1]
+
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        ids = [host.create({"teams": teams, "seed": t, "compact": not args.object}).id
+               for t in range(args.tournaments)]
+        for tournament_id in ids:
+            host.play(tournament_id, rounds=1)
+        create_s = time.perf_counter() - start
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{args.tournaments} tournaments x {args.teams} teams: created and Round 1 played "
+              f"in {create_s:.3f}s, {current / args.tournaments / 1024:.0f} KiB each")
+
+        workloads = {
+            "status": [("GET", f"/tournaments/{ids[n % len(ids)]}", None)
+                       for n in range(args.requests)],
+            "round page": [("GET", f"/tournaments/{ids[n % len(ids)]}/rounds/Round%201?limit=50", None)
+                           for n in range(args.requests)],
+            "play 1 round": [("POST", f"/tournaments/{ids[n % len(ids)]}/play", json.dumps({"rounds": 1}))
+                             for n in range(len(ids) * 4)],
+        }
+        print(f"{'workload':<14} {'requests':>9} {'seconds':>8} {'req/s':>9}")
+        for name, paths in workloads.items():
+            done, seconds = hammer(port, paths, args.threads)
+            print(f"{name:<14} {done:>9} {seconds:>8.3f} {done / seconds:>9.0f}")
+
+        start = time.perf_counter()
+        for tournament_id in ids:
+            host.evict(tournament_id)
+        evict_s = time.perf_counter() - start
+        start = time.perf_counter()
+        for tournament_id in ids:
+            host.status(tournament_id)
+        restore_s = time.perf_counter() - start
+        print(f"evict {evict_s / len(ids) * 1000:.2f} ms, restore {restore_s / len(ids) * 1000:.2f} ms "
+              f"per tournament; {host.stats()}")
+        httpd.shutdown()
+        httpd.server_close()
+        host.close(save=False)
+
+if __name__ == "__main__":
+    main()
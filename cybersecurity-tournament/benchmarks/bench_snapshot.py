@@ -0,0 +1,52 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import snapshot
+from bench_memory import write_teams
+from scheduler import Scheduler
+
+# Saves a tournament halfway through (Round 1 played) and times reloading it
+# from the memory-mapped snapshot versus rebuilding Team/Match objects.
+
+def half_played(path, compact):
+    scheduler = Scheduler(compact=compact, seed=0)
+    scheduler.load_teams(path)
+    scheduler.divide_groups()
+    scheduler.build_bracket(random_draw=True)
+    first = scheduler.round_names[0]
+    scheduler.schedule_round(first)
+    scheduler.complete_round(first)
+    return scheduler
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot save and reload time")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 1 << 16, 1 << 20])
+    parser.add_argument("--compact", action="store_true", help="save from compact storage")
+    args = parser.parse_args()
+
+    print(f"{'teams':>9} {'MiB':>7} {'save s':>8} {'mmap s':>8} {'objects s':>10}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            teams_path = os.path.join(directory, f"teams-{size}.txt")
+            snapshot_path = os.path.join(directory, f"teams-{size}.snap")
+            write_teams(teams_path, size)
+            scheduler = half_played(teams_path, args.compact)
+            _, save_s = timed(snapshot.save, scheduler, snapshot_path)
+            del scheduler
+            _, mapped_s = timed(snapshot.load, snapshot_path, True)
+            _, objects_s = timed(snapshot.load, snapshot_path, False)
+            mib = os.path.getsize(snapshot_path) / (1 << 20)
+            print(f"{size:>9} {mib:>7.1f} {save_s:>8.3f} {mapped_s:>8.3f} {objects_s:>10.3f}")
+
+if __name__ == "__main__":
+    main()
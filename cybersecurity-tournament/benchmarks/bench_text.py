@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk
+
+import formatting
+from gui import SectionedText
+from scheduler import Match, Team
+
+# Text.insert cost against match count: one insert per line (the old way),
+# one insert for the whole round, and the first page of a SectionedText.
+# Needs a display (run under Xvfb on servers).
+
+def make_matches(count):
+    teams = [Team(f"Team {i}", ["A", "B"], i + 1) for i in range(2 * count)]
+    matches = [Match(teams[2 * i], teams[2 * i + 1], "Round 1") for i in range(count)]
+    for match in matches:
+        match.complete()
+    return matches
+
+def timed(root, text, action):
+    text.config(state="normal")
+    text.delete("1.0", "end")
+    start = time.perf_counter()
+    action()
+    root.update_idletasks()
+    return time.perf_counter() - start
+
+def per_line(text, matches):
+    for i, match in enumerate(matches, 1):
+        text.insert(tk.END, f"Match {i}: {match.team1.name} vs {match.team2.name}\n")
+        text.insert(tk.END, f"Winner: {match.winner.name}\n\n")
+
+def main():
+    parser = argparse.ArgumentParser(description="Text insert time (ms) against match count")
+    parser.add_argument("counts", nargs="*", type=int, default=[8, 64, 512, 4096, 32768, 262144])
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"needs a display: {e}")
+    text = tk.Text(root, height=15, width=80)
+    text.pack()
+    sections = SectionedText(text)
+
+    print(f"{'matches':>8} {'per line':>10} {'one insert':>11} {'first page':>11}")
+    for count in args.counts:
+        matches = make_matches(count)
+        line_s = timed(root, text, lambda: per_line(text, matches))
+        single_s = timed(root, text, lambda: text.insert(tk.END, formatting.results_text(matches)))
+        paged_s = timed(root, text, lambda: sections.show(
+            [("Round 1", count, lambda start, stop: formatting.results_text(matches, start, stop))],
+            collapsible=False, expanded=[0]))
+        print(f"{count:>8} {line_s * 1000:>10.1f} {single_s * 1000:>11.1f} {paged_s * 1000:>11.1f}")
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import formatting
+import timetable
+from bench_memory import write_teams
+from scheduler import Scheduler
+
+# Plays whole tournaments with a timetable attached and reports how long slot
+# and room allocation takes next to the rest of the run, plus the makespan and
+# utilization the allocator reaches for the given rooms.
+
+def play(path, rooms, rest, compact):
+    scheduler = Scheduler(compact=compact, seed=1)
+    scheduler.load_teams(path)
+    scheduler.divide_groups()
+    scheduler.build_bracket(random_draw=True)
+    start = time.perf_counter()
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+    plain_s = time.perf_counter() - start
+
+    scheduler.build_bracket(random_draw=True)
+    scheduler.start_timetable(rooms, rest=rest)
+    start = time.perf_counter()
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+    timed_s = time.perf_counter() - start
+    return scheduler.timetable, plain_s, timed_s
+
+def main():
+    parser = argparse.ArgumentParser(description="Time slot and room allocation cost")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 1 << 16, 1 << 20])
+    parser.add_argument("--rooms", default="Hall:512,Lab A:256,Lab B:256",
+                        help="room spec, see cli.py --rooms")
+    parser.add_argument("--rest", type=int, default=1)
+    parser.add_argument("--compact", action="store_true", help="compact column storage")
+    args = parser.parse_args()
+    rooms = timetable.parse_rooms(args.rooms)
+
+    print(f"{'teams':>9} {'matches':>9} {'tables':>7} {'makespan':>9} {'util':>6} "
+          f"{'play s':>8} {'+slots s':>9} {'us/match':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            path = os.path.join(directory, f"teams-{size}.txt")
+            write_teams(path, size)
+            slots, plain_s, timed_s = play(path, rooms, args.rest, args.compact)
+            extra = max(timed_s - plain_s, 0.0)
+            print(f"{size:>9} {slots.matches:>9} {len(slots.room_of):>7} {slots.makespan:>9} "
+                  f"{slots.utilization:>6.1%} {plain_s:>8.3f} {extra:>9.3f} "
+                  f"{extra / max(slots.matches, 1) * 1e6:>9.2f}")
+    print()
+    print(formatting.timetable_text(slots.summary()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tkinter as tk
+from tkinter import ttk
+
+from gui import ModernTournamentGUI, VirtualTreeview
+from scheduler import Team
+
+# Frame times of the team list: a plain Treeview holding every row vs the
+# VirtualTreeview pool. Needs a display (run under Xvfb on servers).
+
+def make_teams(count, seed=0):
+    rng = random.Random(seed)
+    return [Team(f"Team {i}", [f"Member{rng.randrange(count)}", f"Member{rng.randrange(count)}"], i + 1)
+            for i in range(count)]
+
+def frame(root, action):
+    start = time.perf_counter()
+    action()
+    root.update()
+    return time.perf_counter() - start
+
+def bench_plain(root, parent, teams, scrolls):
+    tree = ttk.Treeview(parent, columns=("Rank", "Name", "Members"), show="headings",
+                        style='Custom.Treeview')
+    tree.pack(fill="both", expand=True)
+
+    def load():
+        tree.delete(*tree.get_children())
+        for team in teams:
+            tree.insert("", "end", values=(team.rank, team.name, ", ".join(team.members)))
+
+    load_s = frame(root, load)
+    scroll_s = [frame(root, lambda f=random.random(): tree.yview_moveto(f)) for _ in range(scrolls)]
+    reload_s = frame(root, load)
+    tree.destroy()
+    return load_s, scroll_s, reload_s
+
+def bench_virtual(root, parent, teams, scrolls):
+    tree = VirtualTreeview(parent, columns=("Rank", "Name", "Members"),
+                           row_values=lambda team: (team.rank, team.name, ", ".join(team.members)),
+                           style='Custom.Treeview')
+    tree.pack(fill="both", expand=True)
+    root.update()
+    load_s = frame(root, lambda: tree.set_items(teams))
+    scroll_s = [frame(root, lambda f=random.random(): tree.yview("moveto", f)) for _ in range(scrolls)]
+    reload_s = frame(root, lambda: tree.set_items(teams))
+    tree.destroy()
+    return load_s, scroll_s, reload_s
+
+def report(label, count, load_s, scroll_s, reload_s):
+    scroll_s = sorted(scroll_s)
+    p95 = scroll_s[int(len(scroll_s) * 0.95) - 1] if scroll_s else 0.0
+    print(f"{count:>8} {label:>8} {load_s * 1000:>10.1f} {reload_s * 1000:>10.1f} "
+          f"{statistics.median(scroll_s) * 1000:>10.2f} {p95 * 1000:>10.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Team list frame times (ms)")
+    parser.add_argument("sizes", nargs="*", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--scrolls", type=int, default=200)
+    parser.add_argument("--skip-plain", action="store_true",
+                        help="don't time the plain Treeview (slow at 100k)")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"needs a display: {e}")
+    ModernTournamentGUI(root)
+    parent = ttk.Frame(root, style='Custom.TFrame')
+    parent.pack(fill="both", expand=True)
+
+    print(f"{'teams':>8} {'mode':>8} {'load ms':>10} {'reload ms':>10} {'scroll p50':>10} {'scroll p95':>10}")
+    for count in args.sizes:
+        teams = make_teams(count)
+        if not args.skip_plain:
+            report("plain", count, *bench_plain(root, parent, teams, args.scrolls))
+        report("virtual", count, *bench_virtual(root, parent, teams, args.scrolls))
+    root.destroy()
+
+if __name__ == "__main__":
+    main()
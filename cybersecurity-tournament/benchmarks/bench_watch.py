@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memory import write_teams
+from scheduler import Scheduler
+from watch import TeamsWatcher
+
+# Late registrations: a few lines appended to (or edited in) a big teams.txt,
+# picked up by the watcher and merged into the teams and groups, against
+# pressing LOAD TEAMS again (full parse, sort and new groups).
+
+def touch(path):
+    # Edits within one mtime tick still have to look like a change
+    now = time.time_ns()
+    os.utime(path, ns=(now, now))
+
+def full_reload(path, groups):
+    start = time.perf_counter()
+    scheduler = Scheduler(seed=1)
+    scheduler.load_teams(path)
+    scheduler.divide_groups(groups)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="teams.txt watch mode vs full reload")
+    parser.add_argument("--teams", type=int, default=100000)
+    parser.add_argument("--lines", type=int, default=10, help="lines appended or edited per change")
+    parser.add_argument("--groups", type=int, default=2)
+    parser.add_argument("--changes", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "teams.txt")
+        write_teams(path, args.teams)
+        scheduler = Scheduler(seed=1)
+        scheduler.load_teams(path)
+        scheduler.divide_groups(args.groups)
+        start = time.perf_counter()
+        watcher = TeamsWatcher(scheduler, path)
+        baseline = time.perf_counter() - start
+        print(f"{args.teams:,} teams, {args.lines} lines per change, "
+              f"baseline {baseline * 1000:.1f} ms")
+        print(f"{'change':<8} {'watch ms':>9} {'reload ms':>10} {'speedup':>8} {'teams':>8}")
+
+        late = 0
+        for kind in ("append", "edit"):
+            watched = reloaded = 0.0
+            for _ in range(args.changes):
+                if kind == "append":
+                    with open(path, "a") as file:
+                        for _ in range(args.lines):
+                            late += 1
+                            file.write(f"Late {late};Someone,Else;{late * 7 % args.teams + 1}\n")
+                else:
+                    # New ranks for lines spread over the file: the prefix
+                    # check fails and every line is compared
+                    with open(path) as file:
+                        lines = file.readlines()
+                    step = len(lines) // args.lines
+                    for i in range(0, step * args.lines, step):
+                        name, members, rank = lines[i].rstrip("\n").split(";")
+                        lines[i] = f"{name};{members};{int(rank) % args.teams + 1}\n"
+                    with open(path, "w") as file:
+                        file.writelines(lines)
+                touch(path)
+                start = time.perf_counter()
+                changes = watcher.poll()
+                watched += time.perf_counter() - start
+                assert changes and changes.refused is None, changes
+                reloaded += full_reload(path, args.groups)
+            watched /= args.changes
+            reloaded /= args.changes
+            print(f"{kind:<8} {watched * 1000:>9.1f} {reloaded * 1000:>10.1f} "
+                  f"{reloaded / watched:>7.1f}x {len(scheduler.teams):>8,}")
+
+        # Same teams in the same order as loading the file from scratch,
+        # apart from ties between equal ranks, which keep arrival order
+        check = Scheduler(seed=1)
+        check.load_teams(path)
+        assert sorted((t.rank, t.name) for t in check.teams) == \
+            sorted((t.rank, t.name) for t in scheduler.teams)
+        assert [t.rank for t in scheduler.teams] == sorted(t.rank for t in scheduler.teams)
+        assert sum(len(group) for group in scheduler.groups) == len(scheduler.teams)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scheduler import Scheduler
+
+# Reproducible benchmark suite for the scheduling core and the GUI screens.
+#
+#   python benchmarks/suite.py run                       # quick profile
+#   python benchmarks/suite.py run --profile full --out results.json
+#   python benchmarks/suite.py compare                   # against the stored baseline
+#   python benchmarks/suite.py run --save-baseline       # replace the stored baseline
+#   python benchmarks/suite.py generate teams.txt 100000 --orgs 50 --ties 0.1
+#
+# Every case works on a synthetic teams.txt written from a fixed seed, and is
+# timed as the best of --repeat runs so one slow run doesn't count. Results
+# are JSON ({case: {"seconds": best, "runs": [...]}}) together with the
+# machine they came from; compare flags the cases that got slower than the
+# baseline by more than --threshold and exits with status 1.
+#
+# GUI cases need a display. Without DISPLAY the suite starts Xvfb itself
+# when it is installed, and skips them otherwise.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+FORMAT_VERSION = 1
+THRESHOLD = 0.15        # 15% slower than the baseline is a regression
+MIN_SECONDS = 0.002     # Faster cases are too noisy to compare
+XVFB_DISPLAY = ":99"
+
+PROFILES = {
+    "quick": {
+        "load": [1000, 10000, 100000],
+        "divide": [10000, 100000],
+        "bracket": [16, 1 << 10, 1 << 14, 1 << 16],
+        "full": [1 << 12, 1 << 16],
+        "gui": [1000, 1 << 16],
+    },
+    "full": {
+        "load": [1000, 10000, 100000, 1000000],
+        "divide": [10000, 100000, 1000000],
+        "bracket": [16, 1 << 10, 1 << 14, 1 << 16, 1 << 18, 1 << 20],
+        "full": [1 << 12, 1 << 16, 1 << 20],
+        "gui": [1000, 1 << 16, 1 << 20],
+    },
+}
+
+# ---------------------------- TEAM FILES ---------------------------- #
+def generate(path, count, seed=0, orgs=0, ties=0.0, malformed=0.0):
+    # teams.txt with `count` rows. orgs > 0 prefixes names with one of that
+    # many organizations (for --separate-by), ties is the share of rows that
+    # reuse an earlier rank and malformed the share of broken rows.
+    rng = random.Random(seed)
+    ranks = list(range(1, count + 1))
+    rng.shuffle(ranks)
+    with open(path, "w", encoding="utf-8") as file:
+        for i, rank in enumerate(ranks):
+            if malformed and rng.random() < malformed:
+                file.write(f"Broken {i};no rank\n")
+                continue
+            if ties and i and rng.random() < ties:
+                rank = ranks[rng.randrange(i)]
+            name = f"Org{rng.randrange(orgs)} Team {i}" if orgs else f"Team {i}"
+            file.write(f"{name};Member{rng.randrange(count)},Member{rng.randrange(count)};{rank}\n")
+    return path
+
+class TeamFiles:
+    # One generated file per (count, options), shared by every case
+    def __init__(self, directory):
+        self.directory = directory
+        self.paths = {}
+
+    def get(self, count, **options):
+        key = (count, tuple(sorted(options.items())))
+        if key not in self.paths:
+            name = "-".join([f"teams-{count}"] + [f"{k}{v}" for k, v in key[1]]) + ".txt"
+            self.paths[key] = generate(os.path.join(self.directory, name), count, **options)
+        return self.paths[key]
+
+# ---------------------------- TIMING ---------------------------- #
+def best_of(repeat, setup, action):
+    # Best of `repeat` runs of action(state), with setup() outside the clock
+    runs = []
+    for _ in range(repeat):
+        state = setup()
+        gc.collect()
+        start = time.perf_counter()
+        action(state)
+        runs.append(time.perf_counter() - start)
+        del state
+    return {"seconds": min(runs), "runs": runs}
+
+def loaded(path, compact=False):
+    scheduler = Scheduler(compact=compact, seed=1)
+    scheduler.load_teams(path)
+    return scheduler
+
+def play_all(scheduler):
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+
+def repeats(size, repeat):
+    # Big cases take seconds each, fewer runs are enough
+    return repeat if size <= 1 << 16 else max(1, repeat // 3)
+
+# ---------------------------- CASES ---------------------------- #
+def bench_load(files, sizes, repeat):
+    for size in sizes:
+        path = files.get(size)
+        for mode, compact in (("objects", False), ("compact", True)):
+            yield (f"load_teams/{mode}/{size}",
+                   best_of(repeats(size, repeat), lambda: None,
+                           lambda _: loaded(path, compact)))
+        path = files.get(size, ties=0.1, malformed=0.01)
+        yield (f"load_teams/ties+malformed/{size}",
+               best_of(repeats(size, repeat), lambda: None, lambda _: loaded(path)))
+
+def bench_divide(files, sizes, repeat):
+    for size in sizes:
+        scheduler = loaded(files.get(size, orgs=max(2, size // 100)))
+        organization = lambda team: team.name.split(" ", 1)[0]
+        for label, args in (("2/pots", (2, "pots")),
+                            ("64/snake", (64, "snake")),
+                            ("64/random", (64, "random")),
+                            ("64/snake+orgs", (64, "snake", organization))):
+            yield (f"divide_groups/{label}/{size}",
+                   best_of(repeats(size, repeat), lambda: scheduler,
+                           lambda s: s.divide_groups(*args)))
+
+def bench_bracket(files, sizes, repeat):
+    # Every round of a bracket, schedule_round and complete_round timed apart
+    for size in sizes:
+        path = files.get(size)
+        for mode, compact in (("objects", False), ("compact", True)):
+            def setup():
+                scheduler = loaded(path, compact)
+                scheduler.divide_groups()
+                scheduler.build_bracket()
+                return scheduler
+
+            schedule_runs, complete_runs = [], []
+            for _ in range(repeats(size, repeat)):
+                scheduler = setup()
+                gc.collect()
+                schedule_s = complete_s = 0.0
+                for round_name in scheduler.round_names:
+                    start = time.perf_counter()
+                    scheduler.schedule_round(round_name)
+                    scheduled = time.perf_counter()
+                    scheduler.complete_round(round_name)
+                    schedule_s += scheduled - start
+                    complete_s += time.perf_counter() - scheduled
+                schedule_runs.append(schedule_s)
+                complete_runs.append(complete_s)
+                del scheduler
+            yield f"schedule_round/{mode}/{size}", {"seconds": min(schedule_runs), "runs": schedule_runs}
+            yield f"complete_round/{mode}/{size}", {"seconds": min(complete_runs), "runs": complete_runs}
+
+def bench_full(files, sizes, repeat):
+    # What `tournament run` does: load, divide, draw, play every round
+    for size in sizes:
+        path = files.get(size)
+        for label, compact, double in (("single", False, False),
+                                       ("double", False, True),
+                                       ("compact", True, False)):
+            def run(_):
+                scheduler = loaded(path, compact)
+                scheduler.divide_groups()
+                scheduler.build_bracket(double_elimination=double, random_draw=True)
+                play_all(scheduler)
+
+            yield (f"full_run/{label}/{size}",
+                   best_of(repeats(size, repeat), lambda: None, run))
+
+def bench_gui(files, sizes, repeat):
+    import tkinter as tk
+
+    import gui
+
+    root = tk.Tk()
+    app = gui.ModernTournamentGUI(root)
+    try:
+        root.update()
+
+        def frame(action):
+            action()
+            root.update()
+
+        for size in sizes:
+            app.scheduler = loaded(files.get(size))
+            app.scheduler.divide_groups()
+            app.scheduler.build_bracket()
+
+            # Team list: build the screen, then fill the Treeview from the registry
+            app.show_load_window()
+            root.update()
+            yield (f"gui/team_tree/{size}",
+                   best_of(repeat, lambda: None, lambda _: frame(lambda: app.filter_teams(""))))
+            yield (f"gui/team_search/{size}",
+                   best_of(repeat, lambda: None, lambda _: frame(lambda: app.filter_teams("Member1"))))
+
+            # Round screen: matchups, then results, into the paged Text
+            app.show_round_window("Round 1")
+            root.update()
+            matches = app.scheduler.schedule_round("Round 1")
+            yield (f"gui/matchups_text/{size}",
+                   best_of(repeat, lambda: None,
+                           lambda _: frame(lambda: app.show_matchups("Round 1", matches))))
+            app.scheduler.complete_round("Round 1")
+            yield (f"gui/results_text/{size}",
+                   best_of(repeat, lambda: None,
+                           lambda _: frame(lambda: app.show_results("Round 1"))))
+
+            # Back and forth between screens already built: nothing changed,
+            # so nothing is redrawn
+            yield (f"gui/navigate/{size}",
+                   best_of(repeat, lambda: None,
+                           lambda _: frame(lambda: (app.show_load_window(),
+                                                    app.show_round_window("Round 1")))))
+    finally:
+        app.on_close()
+
+CASES = {
+    "load": bench_load,
+    "divide": bench_divide,
+    "bracket": bench_bracket,
+    "full": bench_full,
+    "gui": bench_gui,
+}
+
+# ---------------------------- DISPLAY ---------------------------- #
+def start_display():
+    # Returns the Xvfb process started for the GUI cases, or None when a
+    # display is already there. Raises RuntimeError when there is neither.
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("no DISPLAY and Xvfb is not installed")
+    process = subprocess.Popen([xvfb, XVFB_DISPLAY, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = XVFB_DISPLAY
+    time.sleep(0.5)
+    if process.poll() is not None:
+        raise RuntimeError(f"Xvfb exited with status {process.returncode}")
+    return process
+
+# ---------------------------- RESULTS ---------------------------- #
+def machine():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+def baseline_path(profile):
+    return os.path.join(BASELINES, f"{profile}.json")
+
+def run(profile, groups, repeat, out=None):
+    sizes = PROFILES[profile]
+    document = {"version": FORMAT_VERSION, "profile": profile, "repeat": repeat,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "machine": machine(),
+                "skipped": {}, "results": {}}
+    display = None
+    with tempfile.TemporaryDirectory() as directory:
+        files = TeamFiles(directory)
+        for group in groups:
+            if group == "gui":
+                try:
+                    display = start_display()
+                except RuntimeError as e:
+                    document["skipped"][group] = str(e)
+                    print(f"{group}: skipped, {e}", file=sys.stderr)
+                    continue
+            try:
+                for name, result in CASES[group](files, sizes[group], repeat):
+                    document["results"][name] = result
+                    print(f"{name:<40} {result['seconds'] * 1000:>11.2f} ms")
+            finally:
+                if display is not None:
+                    display.terminate()
+                    display.wait()
+                    display = None
+    if out is not None:
+        os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+        with open(out, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=1)
+            file.write("\n")
+    return document
+
+def read(path):
+    try:
+        with open(path, encoding="utf-8") as file:
+            document = json.load(file)
+    except FileNotFoundError:
+        sys.exit(f"no results at {path} (record a baseline with: run --save-baseline)")
+    if document.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported results version {document.get('version')}")
+    return document
+
+def compare(baseline, current, threshold=THRESHOLD, min_seconds=MIN_SECONDS):
+    # Rows of (case, baseline s, current s, ratio, verdict) for cases in both
+    rows = []
+    before, after = baseline["results"], current["results"]
+    for name in sorted(before.keys() & after.keys()):
+        old, new = before[name]["seconds"], after[name]["seconds"]
+        ratio = new / old if old else float("inf")
+        if max(old, new) < min_seconds:
+            verdict = "noise"
+        elif ratio > 1 + threshold:
+            verdict = "REGRESSION"
+        elif ratio < 1 / (1 + threshold):
+            verdict = "faster"
+        else:
+            verdict = "ok"
+        rows.append((name, old, new, ratio, verdict))
+    return rows
+
+def report(rows, baseline, current):
+    if baseline["machine"] != current["machine"]:
+        print("note: baseline was recorded on a different machine:", baseline["machine"])
+    print(f"{'case':<40} {'baseline ms':>12} {'current ms':>11} {'ratio':>7}  verdict")
+    for name, old, new, ratio, verdict in rows:
+        print(f"{name:<40} {old * 1000:>12.2f} {new * 1000:>11.2f} {ratio:>7.2f}  {verdict}")
+    missing = sorted(baseline["results"].keys() - current["results"].keys())
+    if missing:
+        print(f"not run this time: {', '.join(missing)}")
+    regressions = sum(verdict == "REGRESSION" for *_, verdict in rows)
+    print(f"{len(rows)} cases compared, {regressions} regressions")
+    return regressions
+
+# ---------------------------- COMMANDS ---------------------------- #
+def cmd_run(args):
+    out = baseline_path(args.profile) if args.save_baseline else args.out
+    current = run(args.profile, args.cases.split(","), args.repeat, out)
+    if out is not None:
+        print(f"results written to {out}")
+    if args.compare:
+        baseline = read(args.compare)
+        return 1 if report(compare(baseline, current, args.threshold), baseline, current) else 0
+    return 0
+
+def cmd_compare(args):
+    current = read(args.current)
+    baseline = read(args.baseline or baseline_path(current["profile"]))
+    return 1 if report(compare(baseline, current, args.threshold, args.min_seconds),
+                       baseline, current) else 0
+
+def cmd_generate(args):
+    generate(args.path, args.count, args.seed, args.orgs, args.ties, args.malformed)
+    print(f"{args.count} teams written to {args.path}")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scheduler and GUI benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    run_parser.add_argument("--cases", default=",".join(CASES),
+                            help=f"comma separated, from {','.join(CASES)}")
+    run_parser.add_argument("--repeat", type=int, default=3, help="runs per case, best one counts")
+    run_parser.add_argument("--out", help="write results as JSON")
+    run_parser.add_argument("--save-baseline", action="store_true",
+                            help="write results as the stored baseline of the profile")
+    run_parser.add_argument("--compare", metavar="BASELINE", help="compare against this results file")
+    run_parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    run_parser.set_defaults(handler=cmd_run)
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two results files")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("baseline", nargs="?",
+                                help="defaults to the stored baseline of the same profile")
+    compare_parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                                help="allowed slowdown, 0.15 = 15%%")
+    compare_parser.add_argument("--min-seconds", type=float, default=MIN_SECONDS,
+                                help="ignore cases faster than this in both runs")
+    compare_parser.set_defaults(handler=cmd_compare)
+
+    generate_parser = commands.add_parser("generate", help="write a synthetic teams.txt")
+    generate_parser.add_argument("path")
+    generate_parser.add_argument("count", type=int)
+    generate_parser.add_argument("--seed", type=int, default=0)
+    generate_parser.add_argument("--orgs", type=int, default=0, help="organizations to spread teams over")
+    generate_parser.add_argument("--ties", type=float, default=0.0, help="share of repeated ranks")
+    generate_parser.add_argument("--malformed", type=float, default=0.0, help="share of broken rows")
+    generate_parser.set_defaults(handler=cmd_generate)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
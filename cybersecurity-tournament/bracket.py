@@ -0,0 +1,305 @@
+import random
+from array import array
+
+# Brackets work on team indices (positions in the rank-sorted Scheduler.teams),
+# never on Team objects, so building and playing a bracket of 2^20 teams is
+# just integer array traffic.
+#
+# A single-elimination bracket is a flat implicit binary tree laid out like a
+# heap: node 1 is the champion, the children of node n are 2n and 2n+1 and the
+# leaves (the entrants) sit at [size, 2 * size). Round r is played by the nodes
+# in [size >> r, size >> (r - 1)), so advancing a winner is one array store.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+EMPTY = -1   # Not decided yet
+BYE = -2     # No opponent, the other side advances for free
+
+# ---------------------------- HELPERS ---------------------------- #
+def bracket_size(team_count):
+    size = 2
+    while size < team_count:
+        size *= 2
+    return size
+
+def round_names(round_count, prefix=""):
+    names = []
+    for r in range(1, round_count + 1):
+        remaining = round_count - r
+        if remaining == 0:
+            name = "Final"
+        elif remaining == 1:
+            name = "Semi Final"
+        elif remaining == 2:
+            name = "Quarter Final"
+        else:
+            name = f"Round {r}"
+        names.append(prefix + name)
+    return names
+
+def seed_order(size):
+    # Standard seeding: seed 1 and 2 can only meet in the final, and round 1
+    # always pairs seed s with seed size + 1 - s
+    order = [1]
+    while len(order) < size:
+        total = 2 * len(order) + 1
+        doubled = [0] * (2 * len(order))
+        doubled[0::2] = order
+        doubled[1::2] = [total - s for s in order]
+        order = doubled
+    return order
+
+def seeded_leaves(team_count, rng=None):
+    # Leaf order for team indices 0..team_count-1 (index 0 = best rank).
+    # Missing seeds become byes, which always land on the top seeds. With an rng
+    # the top half and the bottom half are each drawn at random, the same
+    # "Group A vs Group B" draw the GUI used to do by hand.
+    size = bracket_size(team_count)
+    order = seed_order(size)
+    if rng is not None:
+        half = size // 2
+        top = list(range(half))
+        bottom = list(range(half, size))
+        rng.shuffle(top)
+        rng.shuffle(bottom)
+        drawn = top + bottom
+        order = [drawn[seed - 1] + 1 for seed in order]
+    return array("i", [seed - 1 if seed <= team_count else BYE for seed in order])
+
+def settle(a, b):
+    # Result of a pairing that needs no game: a bye, or not ready yet
+    if a == EMPTY or b == EMPTY:
+        return EMPTY
+    if a == BYE:
+        return b
+    if b == BYE:
+        return a
+    return None
+
+# ---------------------------- SINGLE ELIMINATION ---------------------------- #
+class Bracket:
+    def __init__(self, leaves, prefix=""):
+        size = len(leaves)
+        self._setup(size, prefix)
+        self.slots = array("i", [EMPTY]) * size + array("i", leaves)
+        # Byes only meet real teams in round 1, so settle them up front
+        if BYE in leaves:
+            self.slots[size // 2:size] = array("i", [
+                b if a == BYE else a if b == BYE else EMPTY
+                for a, b in zip(leaves[0::2], leaves[1::2])])
+
+    def _setup(self, size, prefix):
+        if size < 2 or size & (size - 1):
+            raise ValueError("bracket size must be a power of two >= 2")
+        self.size = size
+        self.depth = size.bit_length() - 1
+        self.prefix = prefix
+        self.round_names = round_names(self.depth, prefix)
+        self.round_lookup = {name: r for r, name in enumerate(self.round_names)}
+
+    @classmethod
+    def seeded(cls, team_count, rng=None):
+        return cls(seeded_leaves(team_count, rng))
+
+    @classmethod
+    def from_slots(cls, slots, prefix=""):
+        # Rebuild a bracket in any state from its slot array (see snapshot.py)
+        tree = cls.__new__(cls)
+        tree._setup(len(slots) // 2, prefix)
+        tree.slots = slots
+        return tree
+
+    def round_index(self, round_name):
+        return self.round_lookup[round_name]
+
+    def nodes(self, r):
+        # Nodes played in round r (0-based)
+        return range(self.size >> (r + 1), self.size >> r)
+
+    def pairings(self, r):
+        slots = self.slots
+        nodes = self.nodes(r)
+        lo, hi = nodes.start, nodes.stop
+        return [(node, a, b)
+                for node, a, b, result in zip(nodes, slots[2 * lo:2 * hi:2],
+                                              slots[2 * lo + 1:2 * hi:2], slots[lo:hi])
+                if a >= 0 and b >= 0 and result == EMPTY]
+
+    def record(self, r, node, winner):
+        self.slots[node] = winner
+
+    def loser(self, node):
+        winner = self.slots[node]
+        if winner == EMPTY:
+            return EMPTY
+        a = self.slots[2 * node]
+        b = self.slots[2 * node + 1]
+        if a == BYE or b == BYE:
+            return BYE
+        return b if winner == a else a
+
+    @property
+    def champion(self):
+        return self.slots[1]
+
+    def play_out(self, rng=random):
+        # Fast path: coin flips from one random byte per node, no Match objects.
+        # Untouched rounds are filled a whole level at a time.
+        slots = self.slots
+        flips = rng.randbytes(self.size)
+        for r in range(self.depth):
+            nodes = self.nodes(r)
+            lo, hi = nodes.start, nodes.stop
+            if slots[lo:hi].count(EMPTY) == hi - lo:
+                slots[lo:hi] = array("i", [
+                    a if flip & 1 else b
+                    for a, b, flip in zip(slots[2 * lo:2 * hi:2],
+                                          slots[2 * lo + 1:2 * hi:2],
+                                          flips[lo:hi])])
+                continue
+            for node in nodes:
+                if slots[node] == EMPTY:
+                    slots[node] = slots[2 * node + (flips[node] & 1)]
+        return slots[1]
+
+# ---------------------------- DOUBLE ELIMINATION ---------------------------- #
+class DoubleBracket:
+    # The winners bracket is a regular heap-indexed Bracket. The losers bracket
+    # alternates two kinds of rounds: odd rounds pair up survivors, even rounds
+    # let survivors meet the teams just dropped from the winners bracket. Each
+    # losers round is one flat result array, and every input is found by index
+    # arithmetic, so recording a result is still O(1).
+    def __init__(self, leaves):
+        self._setup(Bracket(leaves, prefix="Winners "))
+
+    def _setup(self, winners):
+        self.winners = winners
+        depth = self.winners.depth
+        size = self.winners.size
+        # Losers round i: odd rounds take the drop-ins from winners round
+        # (i + 1) // 2, even rounds halve the field
+        self.losers = []
+        for i in range(2 * (depth - 1)):
+            shift = (i + 1) // 2 + 1 if i % 2 else i // 2 + 2
+            self.losers.append(array("i", [EMPTY]) * (size >> shift))
+        self.grand_final = EMPTY
+
+        # Play order: (kind, index into that bracket)
+        self.order = [("W", 0)]
+        if self.losers:
+            self.order.append(("L", 0))
+        for j in range(1, depth):
+            self.order.append(("W", j))
+            self.order.append(("L", 2 * j - 1))
+            if 2 * j < len(self.losers):
+                self.order.append(("L", 2 * j))
+        self.order.append(("G", 0))
+
+        self.round_names = []
+        for kind, index in self.order:
+            if kind == "W":
+                self.round_names.append(self.winners.round_names[index])
+            elif kind == "L":
+                self.round_names.append(f"Losers Round {index + 1}")
+            else:
+                self.round_names.append("Grand Final")
+        self.round_lookup = {name: r for r, name in enumerate(self.round_names)}
+
+    @classmethod
+    def seeded(cls, team_count, rng=None):
+        return cls(seeded_leaves(team_count, rng))
+
+    @classmethod
+    def from_state(cls, slots, losers, grand_final):
+        tree = cls.__new__(cls)
+        tree._setup(Bracket.from_slots(slots, prefix="Winners "))
+        if losers is not None:
+            tree.losers = losers
+        tree.grand_final = grand_final
+        return tree
+
+    def round_index(self, round_name):
+        return self.round_lookup[round_name]
+
+    def _dropped(self, wr, m, count):
+        # Teams dropping from winners round wr, reversed on alternate rounds so
+        # teams don't meet the same opponent again straight away
+        if wr % 2 == 0:
+            m = count - 1 - m
+        return self.winners.loser((self.winners.size >> (wr + 1)) + m)
+
+    def _inputs(self, k, m):
+        # The two sides of match m in losers round k (0-based)
+        if k == 0:
+            base = self.winners.size >> 1
+            return self.winners.loser(base + 2 * m), self.winners.loser(base + 2 * m + 1)
+        previous = self.losers[k - 1]
+        if k % 2 == 1:
+            # Drop-in round: survivor vs loser of winners round (k + 1) // 2
+            return previous[m], self._dropped((k + 1) // 2, m, len(self.losers[k]))
+        return previous[2 * m], previous[2 * m + 1]
+
+    def _losers_champion(self):
+        if self.losers:
+            return self.losers[-1][0]
+        return self.winners.loser(1)
+
+    @property
+    def finalists(self):
+        # Winners bracket champion and losers bracket champion (EMPTY until known)
+        return self.winners.champion, self._losers_champion()
+
+    def pairings(self, r):
+        kind, index = self.order[r]
+        if kind == "W":
+            return self.winners.pairings(index)
+        if kind == "L":
+            results = self.losers[index]
+            pairs = []
+            for m in range(len(results)):
+                if results[m] != EMPTY:
+                    continue
+                a, b = self._inputs(index, m)
+                result = settle(a, b)
+                if result is None:
+                    pairs.append((m, a, b))
+                elif result != EMPTY:
+                    results[m] = result
+            return pairs
+        a = self.winners.champion
+        b = self._losers_champion()
+        if self.grand_final != EMPTY:
+            return []
+        result = settle(a, b)
+        if result is None:
+            return [(0, a, b)]
+        self.grand_final = result
+        return []
+
+    def record(self, r, key, winner):
+        kind, index = self.order[r]
+        if kind == "W":
+            self.winners.slots[key] = winner
+        elif kind == "L":
+            self.losers[index][key] = winner
+        else:
+            self.grand_final = winner
+
+    @property
+    def champion(self):
+        return self.grand_final
+
+    def play_out(self, rng=random):
+        for r in range(len(self.order)):
+            for key, a, b in self.pairings(r):
+                self.record(r, key, a if rng.getrandbits(1) else b)
+        return self.champion
+
+# ---------------------------- FACTORY ---------------------------- #
+def build(team_count, double_elimination=False, rng=None, entrants=None):
+    # entrants: team indices in seed order when only some teams take part
+    # (e.g. group stage qualifiers); team_count is then len(entrants)
+    cls = DoubleBracket if double_elimination else Bracket
+    if entrants is None:
+        return cls.seeded(team_count, rng)
+    leaves = seeded_leaves(len(entrants), rng)
+    return cls(array("i", [entrants[seed] if seed >= 0 else seed for seed in leaves]))
@@ -0,0 +1,467 @@
+import itertools
+import math
+import tkinter as tk
+from array import array
+from collections import OrderedDict
+from tkinter import ttk
+
+from PIL import Image, ImageDraw, ImageFont, ImageTk
+
+import bracket
+from export import (BACKGROUND, BOX, BOX_HEIGHT, BOX_WIDTH, COLUMN_GAP, LINE, MARGIN, MUTED,
+                    ROW_GAP, TEXT, WINNER)
+
+# Graphical knockout bracket for the GUI, drawn in the same layout and colors
+# as the exported bracket images (export.py), but for brackets of any size.
+#
+# The canvas never holds one item per match. The bracket is cut into
+# TILE x TILE pixel tiles per zoom level and every visible tile is one Pillow
+# image on the canvas. A tile is drawn in two layers, each kept in one LRU
+# cache of Pillow images:
+#
+#   base   connectors, empty boxes and round titles; depends on the bracket's
+#          shape only, so it is drawn once per tile and zoom level
+#   state  the base plus team names and winners; keyed by the slot values of
+#          the matches on the tile, so an unchanged tile is a cache hit
+#
+# After a round (or a live result) only tiles holding a changed match get a
+# new image, made by copying the tile's last image and drawing just the
+# changed matches over it. Panning only draws tiles that scroll into view.
+# Each zoom level halves the scale and is its own level of detail: names are
+# drawn from TEXT_ZOOM up, below that a box only shows which side won.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+TILE = 256                      # Tile edge, in screen pixels
+ZOOMS = (1.0, 0.5, 0.25, 0.125, 0.0625)
+TEXT_ZOOM = 0.5                 # Smallest zoom with team names
+CACHE_TILES = 200               # Pillow tiles kept, base and state together (192 KiB each)
+PREFETCH = 1                    # Tiles drawn beyond the visible ones on each side
+GRAND_FINAL = 0                 # Node number of the double elimination grand final box
+
+_generations = itertools.count()
+
+# ---------------------------- TILES ---------------------------- #
+class BracketTiles:
+    # The Pillow side: layout and tile images, no Tk
+    def __init__(self, scheduler, cache_tiles=CACHE_TILES):
+        self.cache = OrderedDict()      # key -> Image, least recently used first
+        self.cache_tiles = cache_tiles
+        self.hits = 0
+        self.misses = 0
+        self.fonts = {}
+        self.bind(scheduler)
+
+    def bind(self, scheduler):
+        # A new bracket (or new teams) gets a new generation, so no cached
+        # tile of the old one is ever used again
+        tree = scheduler.bracket
+        if tree is None:
+            raise ValueError("no knockout bracket to draw yet")
+        self.tree = tree
+        self.winners = tree.winners if isinstance(tree, bracket.DoubleBracket) else tree
+        self.teams = scheduler.teams
+        self.generation = next(_generations)
+        self.size = self.winners.size
+        self.columns = self.winners.depth + (self.winners is not tree)
+        self.height = (self.size >> 1) * (BOX_HEIGHT + ROW_GAP)
+        self.world_width = 2 * MARGIN + self.columns * (BOX_WIDTH + COLUMN_GAP) - COLUMN_GAP
+        self.world_height = self.height + 2 * MARGIN
+
+    def state(self):
+        # Every slot a box shows: the winners bracket, and the grand final
+        state = array("i", self.winners.slots)
+        if self.winners is not self.tree:
+            state.extend(self.tree.finalists)
+            state.append(self.tree.grand_final)
+        return state
+
+    # ---------------------------- LAYOUT ---------------------------- #
+    def column_x(self, column):
+        return MARGIN + column * (BOX_WIDTH + COLUMN_GAP)
+
+    def step(self, column):
+        # Vertical distance between two boxes of a column
+        if column >= self.winners.depth:
+            return self.height
+        return self.height / (self.size >> (column + 1))
+
+    def center_y(self, column, p):
+        return MARGIN + (p + 0.5) * self.step(column)
+
+    def node(self, column, p):
+        if column >= self.winners.depth:
+            return GRAND_FINAL
+        return (self.size >> (column + 1)) + p
+
+    def place(self, node):
+        # (column, position) of a node's box
+        if node == GRAND_FINAL:
+            return self.winners.depth, 0
+        column = self.winners.depth - node.bit_length()
+        return column, node - (self.size >> (column + 1))
+
+    def positions(self, column, y0, y1, half):
+        # Positions in a column whose [center - half, center + half] meets [y0, y1)
+        step = self.step(column)
+        count = max(1, round(self.height / step))
+        lo = math.floor((y0 - MARGIN - half) / step - 0.5)
+        hi = math.ceil((y1 - MARGIN + half) / step - 0.5) + 1
+        return range(max(0, lo), min(count, hi))
+
+    def tile_bounds(self, level, tx, ty):
+        # World rectangle (x0, y0, x1, y1) of a tile
+        span = TILE / ZOOMS[level]
+        return tx * span, ty * span, (tx + 1) * span, (ty + 1) * span
+
+    def tile_columns(self, x0, x1):
+        # Columns whose boxes or incoming connectors reach into [x0, x1)
+        pitch = BOX_WIDTH + COLUMN_GAP
+        lo = max(0, math.floor((x0 - MARGIN - BOX_WIDTH) / pitch))
+        hi = min(self.columns, math.floor((x1 - MARGIN + COLUMN_GAP) / pitch) + 1)
+        return range(lo, hi)
+
+    def tiles(self, level):
+        # Number of tiles across and down at a zoom level
+        scale = ZOOMS[level]
+        return (math.ceil(self.world_width * scale / TILE),
+                math.ceil(self.world_height * scale / TILE))
+
+    def tile_nodes(self, level, tx, ty):
+        # Nodes whose boxes lie on a tile
+        x0, y0, x1, y1 = self.tile_bounds(level, tx, ty)
+        nodes = []
+        for column in self.tile_columns(x0, x1):
+            x = self.column_x(column)
+            if x < x1 and x + BOX_WIDTH > x0:
+                nodes.extend(self.node(column, p)
+                             for p in self.positions(column, y0, y1, BOX_HEIGHT / 2))
+        return nodes
+
+    def tile_key(self, level, tx, ty, state):
+        # Cache key of a tile's state layer: the slots its boxes show
+        x0, y0, x1, y1 = self.tile_bounds(level, tx, ty)
+        parts = []
+        size = self.size
+        for column in self.tile_columns(x0, x1):
+            x = self.column_x(column)
+            if x >= x1 or x + BOX_WIDTH <= x0:
+                continue
+            if column >= self.winners.depth:
+                parts.append(state[2 * size:].tobytes())
+                continue
+            positions = self.positions(column, y0, y1, BOX_HEIGHT / 2)
+            if not positions:
+                continue
+            lo = (size >> (column + 1)) + positions.start
+            hi = lo + len(positions)
+            parts.append(state[lo:hi].tobytes())
+            parts.append(state[2 * lo:2 * hi].tobytes())
+        return (self.generation, level, tx, ty, b"|".join(parts))
+
+    # ---------------------------- CACHE ---------------------------- #
+    def _cached(self, key):
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+        return image
+
+    def _store(self, key, image):
+        self.cache[key] = image
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_tiles:
+            self.cache.popitem(last=False)
+        return image
+
+    def base(self, level, tx, ty):
+        key = (self.generation, level, tx, ty)
+        image = self._cached(key)
+        if image is None:
+            self.misses += 1
+            image = self._store(key, self.draw_base(level, tx, ty))
+        return image
+
+    def tile(self, level, tx, ty, state, previous=None, changed=None):
+        # (key, image) of a tile. previous is the key of the image the tile
+        # showed before and changed the nodes that differ since; if that
+        # image is still cached, only those boxes are drawn again.
+        key = self.tile_key(level, tx, ty, state)
+        image = self._cached(key)
+        if image is not None:
+            return key, image
+        self.misses += 1
+        old = self.cache.get(previous) if previous is not None else None
+        base = self.base(level, tx, ty)
+        if old is not None and changed is not None:
+            image = old.copy()
+            nodes = [node for node in self.tile_nodes(level, tx, ty) if node in changed]
+            self.draw_boxes(image, base, level, tx, ty, nodes, state, clean=True)
+        else:
+            image = base.copy()
+            self.draw_boxes(image, base, level, tx, ty, self.tile_nodes(level, tx, ty), state)
+        return key, self._store(key, image)
+
+    # ---------------------------- DRAWING ---------------------------- #
+    def font(self, scale):
+        size = max(8, round(12 * scale))
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = ImageFont.load_default(size)
+        return font
+
+    def draw_base(self, level, tx, ty):
+        scale = ZOOMS[level]
+        x0, y0, x1, y1 = self.tile_bounds(level, tx, ty)
+        image = Image.new("RGB", (TILE, TILE), BACKGROUND)
+        draw = ImageDraw.Draw(image)
+
+        def at(x, y):
+            return (x - x0) * scale, (y - y0) * scale
+
+        width = max(1, round(2 * scale))
+        for column in self.tile_columns(x0, x1):
+            x = self.column_x(column)
+            if column > 0:
+                # Elbows from the two boxes feeding each box of this column
+                child_x = self.column_x(column - 1) + BOX_WIDTH
+                middle = (child_x + x) / 2
+                half = self.step(column - 1)
+                for p in self.positions(column, y0, y1, half):
+                    y = self.center_y(column, p)
+                    if column >= self.winners.depth:
+                        ends = (self.center_y(column - 1, 0),)
+                    else:
+                        ends = (self.center_y(column - 1, 2 * p), self.center_y(column - 1, 2 * p + 1))
+                    for child_y in ends:
+                        draw.line([at(child_x, child_y), at(middle, child_y), at(middle, y), at(x, y)],
+                                  fill=LINE, width=width)
+            if x >= x1 or x + BOX_WIDTH <= x0:
+                continue
+            if scale >= TEXT_ZOOM and y0 < MARGIN:
+                title = ("Grand Final" if column >= self.winners.depth
+                         else self.winners.round_names[column])
+                draw.text(at(x, MARGIN / 2 - 8), title, fill=WINNER, font=self.font(scale))
+            for p in self.positions(column, y0, y1, BOX_HEIGHT / 2):
+                top = self.center_y(column, p) - BOX_HEIGHT / 2
+                draw.rectangle((*at(x, top), *at(x + BOX_WIDTH, top + BOX_HEIGHT)),
+                               fill=BOX, outline=LINE)
+        return image
+
+    def sides(self, node, state):
+        # (top team, bottom team, winner) slots of a box
+        if node == GRAND_FINAL:
+            a, b, won = state[2 * self.size:]
+            return a, b, won
+        return state[2 * node], state[2 * node + 1], state[node]
+
+    def name(self, index):
+        if index >= 0:
+            return self.teams[index].name
+        return "bye" if index == bracket.BYE else "TBD"
+
+    def draw_boxes(self, image, base, level, tx, ty, nodes, state, clean=False):
+        # Team names and winners of the given boxes; clean first puts back
+        # each box's base area, for boxes drawn before
+        scale = ZOOMS[level]
+        x0, y0, _, _ = self.tile_bounds(level, tx, ty)
+        draw = ImageDraw.Draw(image)
+        font = self.font(scale) if scale >= TEXT_ZOOM else None
+        width, height = BOX_WIDTH * scale, BOX_HEIGHT * scale
+        for node in nodes:
+            column, p = self.place(node)
+            left = (self.column_x(column) - x0) * scale
+            top = (self.center_y(column, p) - BOX_HEIGHT / 2 - y0) * scale
+            area = (max(0, math.floor(left)), max(0, math.floor(top)),
+                    min(TILE, math.ceil(left + width) + 1), min(TILE, math.ceil(top + height) + 1))
+            if area[0] >= area[2] or area[1] >= area[3]:
+                continue
+            if clean:
+                image.paste(base.crop(area), area[:2])
+            a, b, won = self.sides(node, state)
+            side = None if won < 0 else (0 if won == a else 1)
+            if font is None:
+                # Too small for names: a bar on the side that went through
+                if side is not None:
+                    bar = top + side * height / 2
+                    draw.rectangle((left + 1, bar + 1, left + max(2, width / 6), bar + height / 2 - 1),
+                                   fill=WINNER)
+                continue
+            for line, text in enumerate((self.name(a), self.name(b))):
+                color = WINNER if side == line else (MUTED if side is not None else TEXT)
+                draw.text((left + 8 * scale, top + (4 + line * BOX_HEIGHT / 2) * scale),
+                          text[:30], fill=color, font=font)
+
+def changed_nodes(old, new, size):
+    # Boxes that look different between two BracketTiles.state() arrays: a
+    # new winner in node n shows in box n and in box n // 2 (one of its teams)
+    if old is None or len(old) != len(new):
+        return None
+    changed = set()
+    if old[2 * size:] != new[2 * size:]:
+        changed.add(GRAND_FINAL)
+        changed.add(1)
+    # Whole rounds compared at once; only rounds that differ are walked
+    lo, hi = size >> 1, size
+    while lo >= 1:
+        if old[lo:hi] != new[lo:hi]:
+            for node in range(lo, hi):
+                if old[node] != new[node]:
+                    changed.add(node)
+                    if node > 1:
+                        changed.add(node >> 1)
+                    else:
+                        changed.add(GRAND_FINAL)
+        lo, hi = lo >> 1, lo
+    return changed
+
+# ---------------------------- CANVAS ---------------------------- #
+class BracketCanvas(ttk.Frame):
+    # Scrollable, zoomable bracket: drag to pan, wheel to scroll, Ctrl+wheel
+    # (or +/-) to zoom. refresh() after results redraws only what changed.
+    def __init__(self, parent, scheduler, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.scheduler = scheduler
+        self.tiles = BracketTiles(scheduler)
+        self.level = 0
+        self.placed = {}            # (tx, ty) -> [cache key, PhotoImage, canvas item]
+        self.shown = None           # State the placed tiles were drawn from
+        self.pending = None
+        self.canvas = tk.Canvas(self, bg=BACKGROUND, highlightthickness=0)
+        self.x_scroll = ttk.Scrollbar(self, orient="horizontal", command=self.xview)
+        self.y_scroll = ttk.Scrollbar(self, orient="vertical", command=self.yview)
+        self.canvas.configure(xscrollcommand=self.x_scroll.set, yscrollcommand=self.y_scroll.set)
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.y_scroll.grid(row=0, column=1, sticky="ns")
+        self.x_scroll.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        canvas = self.canvas
+        canvas.bind("<Configure>", lambda event: self.schedule_draw())
+        canvas.bind("<ButtonPress-1>", lambda event: canvas.scan_mark(event.x, event.y))
+        canvas.bind("<B1-Motion>", self.on_drag)
+        canvas.bind("<MouseWheel>", self.on_mousewheel)
+        canvas.bind("<Control-MouseWheel>", self.on_zoom_wheel)
+        canvas.bind("<Button-4>", lambda event: self.scroll_or_zoom(event, -1))
+        canvas.bind("<Button-5>", lambda event: self.scroll_or_zoom(event, 1))
+        canvas.bind("<plus>", lambda event: self.zoom(-1))
+        canvas.bind("<equal>", lambda event: self.zoom(-1))
+        canvas.bind("<minus>", lambda event: self.zoom(1))
+        canvas.bind("<Enter>", lambda event: canvas.focus_set())
+        self.set_scrollregion()
+
+    # ---------------------------- VIEW ---------------------------- #
+    def set_scrollregion(self):
+        scale = ZOOMS[self.level]
+        self.canvas.configure(scrollregion=(0, 0, self.tiles.world_width * scale,
+                                            self.tiles.world_height * scale))
+
+    def xview(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_draw()
+
+    def yview(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_draw()
+
+    def on_drag(self, event):
+        self.canvas.scan_dragto(event.x, event.y, gain=1)
+        self.schedule_draw()
+
+    def on_mousewheel(self, event):
+        self.yview("scroll", int(-event.delta / 120) or (-1 if event.delta > 0 else 1), "units")
+
+    def on_zoom_wheel(self, event):
+        self.zoom(-1 if event.delta > 0 else 1, event.x, event.y)
+
+    def scroll_or_zoom(self, event, direction):
+        if event.state & 0x4:
+            self.zoom(direction, event.x, event.y)
+        else:
+            self.yview("scroll", direction, "units")
+
+    def zoom(self, direction, x=None, y=None):
+        # One level in (-1) or out (+1), keeping the point under (x, y) put
+        level = min(len(ZOOMS) - 1, max(0, self.level + direction))
+        if level == self.level:
+            return
+        canvas = self.canvas
+        if x is None:
+            x, y = canvas.winfo_width() / 2, canvas.winfo_height() / 2
+        factor = ZOOMS[level] / ZOOMS[self.level]
+        world_x, world_y = canvas.canvasx(x) * factor, canvas.canvasy(y) * factor
+        self.level = level
+        self.clear()
+        self.set_scrollregion()
+        scale = ZOOMS[level]
+        width, height = self.tiles.world_width * scale, self.tiles.world_height * scale
+        canvas.xview_moveto(max(0.0, (world_x - x) / width))
+        canvas.yview_moveto(max(0.0, (world_y - y) / height))
+        self.schedule_draw()
+
+    def clear(self):
+        self.canvas.delete("tile")
+        self.placed = {}
+
+    def rebind(self, scheduler=None):
+        # A different bracket (e.g. after a new draw): start over
+        self.scheduler = scheduler or self.scheduler
+        self.tiles.bind(self.scheduler)
+        self.shown = None
+        self.clear()
+        self.set_scrollregion()
+        self.schedule_draw()
+
+    # ---------------------------- DRAWING ---------------------------- #
+    def schedule_draw(self):
+        # Many scroll events per frame end up as one draw
+        if self.pending is None:
+            self.pending = self.after_idle(self.draw)
+
+    def refresh(self, scheduler=None):
+        # After results: tiles showing changed matches get new images, made
+        # from their current ones with only those matches drawn again
+        scheduler = scheduler or self.scheduler
+        if scheduler is not self.scheduler or scheduler.bracket is not self.tiles.tree:
+            self.rebind(scheduler)
+            return
+        self.draw()
+
+    def visible_tiles(self, margin):
+        canvas = self.canvas
+        x0, y0 = canvas.canvasx(0), canvas.canvasy(0)
+        x1, y1 = x0 + canvas.winfo_width(), y0 + canvas.winfo_height()
+        across, down = self.tiles.tiles(self.level)
+        return (range(max(0, int(x0 // TILE) - margin), min(across, int(x1 // TILE) + 1 + margin)),
+                range(max(0, int(y0 // TILE) - margin), min(down, int(y1 // TILE) + 1 + margin)))
+
+    def draw(self):
+        self.pending = None
+        if not self.canvas.winfo_exists():
+            return
+        tiles, level, canvas = self.tiles, self.level, self.canvas
+        state = tiles.state()
+        changed = changed_nodes(self.shown, state, tiles.size)
+        columns, rows = self.visible_tiles(PREFETCH)
+        for tx in columns:
+            for ty in rows:
+                placed = self.placed.get((tx, ty))
+                previous = placed[0] if placed is not None else None
+                key = tiles.tile_key(level, tx, ty, state)
+                if key == previous:
+                    continue
+                key, image = tiles.tile(level, tx, ty, state, previous, changed)
+                photo = ImageTk.PhotoImage(image)
+                if placed is None:
+                    item = canvas.create_image(tx * TILE, ty * TILE, image=photo, anchor="nw",
+                                               tags="tile")
+                    self.placed[(tx, ty)] = [key, photo, item]
+                else:
+                    canvas.itemconfigure(placed[2], image=photo)
+                    placed[0], placed[1] = key, photo
+        # Tiles out of view give back their PhotoImages (their Pillow images
+        # stay cached), so every placed tile shows self.shown
+        for spot in [spot for spot in self.placed
+                     if spot[0] not in columns or spot[1] not in rows]:
+            canvas.delete(self.placed.pop(spot)[2])
+        self.shown = state
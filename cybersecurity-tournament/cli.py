@@ -0,0 +1,527 @@
+import argparse
+import json
+import re
+import sys
+import time
+
+import formatting
+import profiling
+from scheduler import Scheduler
+
+# Headless entry point: python -m tournament run teams.txt --seed 7 --format json
+# Imports only the core scheduling modules; NumPy is only pulled in for
+# rank-based win models and the simulate command, SQLite for --db and
+# --resume-db, snapshots for --save and --resume, timetables for --rooms.
+
+# ---------------------------- HELPERS ---------------------------- #
+def win_model(name, scale, scheduler=None):
+    if name == "rating":
+        if scheduler is None or scheduler.ratings is None:
+            raise ValueError("--model rating needs --ratings")
+        return scheduler.ratings.model()
+    if name == "coin":
+        return None
+    import simulation
+    if name == "logistic":
+        return simulation.RankLogistic(scale)
+    return simulation.MODELS[name]()
+
+def team_json(team):
+    if team is None:
+        return None
+    return {"name": team.name, "rank": team.rank, "members": list(team.members)}
+
+def org_key(pattern):
+    # --separate-by REGEX: the organization is the first group (or the whole
+    # match) of the pattern in the team name; unmatched names stand alone
+    regex = re.compile(pattern)
+
+    def key(team):
+        found = regex.search(team.name)
+        if found is None:
+            return team.name
+        return found.group(1) if regex.groups else found.group(0)
+    return key
+
+def group_lines(scheduler, limit=20):
+    lines = []
+    for g, group in enumerate(scheduler.groups[:limit], 1):
+        mean = sum(team.rank for team in group) / len(group) if len(group) else 0
+        lines.append(f"Group {g}: {len(group)} teams, mean rank {mean:.1f}\n")
+    if len(scheduler.groups) > limit:
+        lines.append(f"... {len(scheduler.groups) - limit} more groups\n")
+    return "".join(lines)
+
+def standings_lines(scheduler, limit=20):
+    stage = scheduler.group_stage
+    parts = []
+    for g in range(min(len(stage.groups), limit)):
+        parts.append(f"Group {g + 1}:\n")
+        parts.append(formatting.standings_text(stage.standings(g), scheduler.teams))
+        parts.append("\n")
+    if len(stage.groups) > limit:
+        parts.append(f"... {len(stage.groups) - limit} more groups\n\n")
+    return "".join(parts)
+
+def start_minute(text):
+    # --start HH:MM
+    hours, _, minutes = text.partition(":")
+    try:
+        value = int(hours) * 60 + int(minutes or 0)
+    except ValueError:
+        value = -1
+    if not 0 <= value < 24 * 60:
+        raise ValueError(f"bad start time {text!r}, expected HH:MM")
+    return value
+
+def write_json(scheduler, out, seconds):
+    # Written round by round so big brackets never become one giant string
+    report = scheduler.load_report
+    header = {
+        "teams": len(scheduler.teams),
+        "malformed_rows": report.malformed if report else 0,
+        "errors": ([{"line": line_no, "message": message} for line_no, message in report.errors]
+                   if report else []),
+        "winner": team_json(scheduler.winner),
+        "seconds": round(seconds, 6),
+        "groups": [[team.name for team in group] for group in scheduler.groups],
+    }
+    stage = scheduler.group_stage
+    if stage is not None:
+        teams = scheduler.teams
+        header["standings"] = [
+            [{"name": teams[team].name, "played": played, "wins": wins,
+              "losses": losses, "points": points}
+             for team, played, wins, losses, points in stage.standings(g)]
+            for g in range(len(stage.groups))]
+    slots = scheduler.timetable
+    if slots is not None:
+        header["timetable"] = slots.summary()
+    out.write(json.dumps(header)[:-1])
+    out.write(', "rounds": [')
+    for r, (round_name, matches) in enumerate(scheduler.rounds.items()):
+        if r:
+            out.write(", ")
+        out.write(f'{{"name": {json.dumps(round_name)}, "matches": [')
+        timed = slots is not None and round_name in slots.starts
+        for i, match in enumerate(matches):
+            if i:
+                out.write(", ")
+            entry = {
+                "team1": match.team1.name,
+                "team2": match.team2.name,
+                "winner": match.winner.name if match.winner is not None else None,
+            }
+            if timed:
+                slot, room = slots.slot_of(round_name, i)
+                entry["slot"] = slot
+                entry["room"] = room.name
+            out.write(json.dumps(entry))
+        out.write("]}")
+    out.write("]}\n")
+
+def write_text(scheduler, out, seconds, start=9 * 60, slot_minutes=30):
+    report = scheduler.load_report
+    if report is not None:
+        out.write(f"Loaded {report.rows} teams ({report.malformed} malformed rows skipped)\n")
+        for line_no, message in report.errors[:10]:
+            out.write(f"  line {line_no}: {message}\n")
+    else:
+        out.write(f"Resumed {len(scheduler.teams)} teams from snapshot\n")
+    if scheduler.group_stage is not None:
+        out.write("\nGroup Standings:\n\n" + standings_lines(scheduler))
+    elif len(scheduler.groups) > 2:
+        out.write("\n" + group_lines(scheduler))
+    out.write("\nMatch Results:\n\n")
+    for round_name, matches in scheduler.rounds.items():
+        out.write(f"{round_name}:\n")
+        out.write(formatting.summary_text(matches))
+        out.write("\n")
+    if scheduler.timetable is not None:
+        out.write("Timetable:\n\n")
+        out.write(formatting.timetable_text(scheduler.timetable.summary(), start, slot_minutes))
+        out.write("\n")
+    winner = scheduler.winner
+    if winner is not None:
+        out.write(f"Champion: {winner.name} ({', '.join(winner.members)})\n")
+    out.write(f"Finished in {seconds:.3f}s\n")
+
+# ---------------------------- COMMANDS ---------------------------- #
+def play_rounds(scheduler, model):
+    for round_name in scheduler.round_names:
+        if round_name not in scheduler.round_pairings:
+            scheduler.schedule_round(round_name)
+        if any(match.winner is None for match in scheduler.rounds[round_name]):
+            scheduler.complete_round(round_name, model)
+
+def open_store(args):
+    if args.db is None:
+        if args.resume_db is not None:
+            raise ValueError("--resume-db needs --db")
+        return None
+    import database
+    return database.TournamentStore(args.db)
+
+def open_ratings(args, store=None):
+    # The --ratings table, brought up to date with everything stored since
+    # it was last saved; a fresh one without a database
+    if args.ratings is None:
+        return None
+    if store is None:
+        import ratings
+        return ratings.RatingTable(args.ratings)
+    table = store.load_ratings(args.ratings)
+    table.catch_up(store)
+    return table
+
+def save_ratings(scheduler, store, table):
+    if store is not None and table is not None:
+        recorder = scheduler.store
+        store.save_ratings(table, recorder.tournament_id if recorder is not None else None)
+
+def set_up(args, store=None, table=None):
+    if args.resume_db is not None:
+        # Pick up a stored tournament; it keeps being written as it is played
+        scheduler = store.resume(args.resume_db, compact=args.compact)
+        if table is not None:
+            scheduler.attach_ratings(table)
+    elif args.resume:
+        # Pick up a checkpoint: play whatever rounds are still open
+        scheduler = Scheduler.restore(args.resume, compact=args.compact)
+        if table is not None:
+            scheduler.attach_ratings(table)
+        if store is not None:
+            scheduler.attach_store(store, args.name)
+    else:
+        scheduler = Scheduler(compact=args.compact, seed=args.seed)
+        scheduler.load_teams(args.teams, top_k=args.top_k, ratings=table)
+        if store is not None:
+            scheduler.attach_store(store, args.name)
+        separate = org_key(args.separate_by) if args.separate_by else None
+        scheduler.divide_groups(args.groups, args.seeding, separate)
+        if args.group_stage:
+            scheduler.start_group_stage(advance=args.group_stage)
+        else:
+            scheduler.build_bracket(args.double, random_draw=args.draw == "random")
+    if args.rooms:
+        import timetable
+        scheduler.start_timetable(timetable.parse_rooms(args.rooms), args.duration, args.rest)
+    return scheduler
+
+def run_tournament(args, store=None, table=None):
+    scheduler = set_up(args, store, table)
+    model = win_model(args.model, args.scale, scheduler)
+    play_rounds(scheduler, model)
+    if scheduler.group_stage is not None and scheduler.bracket is None:
+        scheduler.start_knockout(args.double, random_draw=args.draw == "random")
+        play_rounds(scheduler, model)
+    if args.save:
+        with profiling.span("save", path=args.save):
+            scheduler.save(args.save)
+    if args.export or args.export_teams:
+        import export
+        for path in args.export:
+            with profiling.span("export", path=path):
+                export.export(scheduler, path)
+        for path in args.export_teams:
+            with profiling.span("export", path=path):
+                export.export(scheduler, path, teams=True)
+    return scheduler
+
+def cmd_run(args):
+    if args.trace:
+        profiling.enable(memory=args.trace_memory)
+    start = time.perf_counter()
+    store = open_store(args)
+    try:
+        table = open_ratings(args, store)
+        scheduler = run_tournament(args, store, table)
+        save_ratings(scheduler, store, table)
+    finally:
+        tracer = profiling.disable()
+        if store is not None:
+            store.close()
+    seconds = time.perf_counter() - start
+    if tracer is not None:
+        tracer.write_chrome_trace(args.trace)
+        sys.stderr.write(profiling.breakdown_text(tracer.breakdown(), tracer.counters))
+    if args.format == "json":
+        write_json(scheduler, sys.stdout, seconds)
+    else:
+        write_text(scheduler, sys.stdout, seconds, start_minute(args.start), args.slot_minutes)
+    return 0
+
+def cmd_scores(args):
+    import asyncio
+    import scoring
+    store = open_store(args)
+    table = open_ratings(args, store)
+    scheduler = set_up(args, store, table)
+    service = scoring.ScoreService(scheduler, args.host, args.port,
+                                   knockout=(args.double, args.draw == "random"))
+
+    def progress(changed, scheduled):
+        for round_name in scheduled:
+            print(f"Scheduled {round_name} ({len(scheduler.rounds[round_name])} matches)", flush=True)
+        if scheduler.winner is not None and changed:
+            print(f"Champion: {scheduler.winner.name}", flush=True)
+            if args.save:
+                scheduler.save(args.save)
+
+    service.listeners.append(progress)
+
+    async def serve():
+        await service.start()
+        print(f"Taking scores on {service.host}:{service.port}", flush=True)
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"{service.applied} results applied, {service.rejected} rejected", flush=True)
+        if args.save:
+            scheduler.save(args.save)
+        if store is not None:
+            scheduler.store.flush(scheduler)
+            save_ratings(scheduler, store, table)
+            store.close()
+    return 0
+
+def cmd_serve(args):
+    import server
+    host = server.TournamentHost(args.directory, args.idle, args.max_active, args.workers)
+    httpd = server.make_server(host, args.host, args.port)
+    host.start_sweeper()
+    print(f"Hosting tournaments on http://{args.host}:{httpd.server_address[1]} "
+          f"(snapshots in {args.directory})", flush=True)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        host.close()
+    return 0
+
+def cmd_simulate(args):
+    store = open_store(args)
+    try:
+        table = open_ratings(args, store)
+    finally:
+        if store is not None:
+            store.close()
+    scheduler = Scheduler()
+    scheduler.load_teams(args.teams, top_k=args.top_k, ratings=table)
+    model = win_model(args.model, args.scale, scheduler)
+    start = time.perf_counter()
+    result = scheduler.simulate(args.runs, model, args.seed, args.processes)
+    seconds = time.perf_counter() - start
+    if args.format == "json":
+        probabilities = result.probabilities
+        json.dump({
+            "runs": result.runs,
+            "seconds": round(seconds, 6),
+            "rounds": result.round_names,
+            "teams": [dict(team_json(team), reach=[round(float(p), 6) for p in probabilities[i]])
+                      for i, team in enumerate(scheduler.teams)],
+        }, sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        print(f"{result.runs:,} tournaments in {seconds:.3f}s\n")
+        print(result.table(scheduler.teams, limit=args.limit))
+    return 0
+
+def cmd_history(args):
+    import database
+    store = database.TournamentStore(args.db)
+    try:
+        if args.team and args.against:
+            rows = store.head_to_head(args.team, args.against, args.limit)
+            fields = ("tournament", "round", "winner")
+            text = "".join(f"- #{tournament_id} {round_name}: {winner or 'not played yet'}\n"
+                           for tournament_id, round_name, winner in rows)
+        elif args.team:
+            rows = store.team_history(args.team, args.limit)
+            fields = ("tournament", "name", "rank", "played", "won", "last_round", "champion")
+            text = formatting.history_text(rows)
+        else:
+            rows = store.tournaments(args.limit)
+            fields = ("tournament", "name", "created", "finished", "teams", "champion")
+            text = formatting.tournaments_text(rows)
+    finally:
+        store.close()
+    if args.format == "json":
+        json.dump([dict(zip(fields, row)) for row in rows], sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(text or "Nothing stored yet.\n")
+    return 0
+
+def cmd_ratings(args):
+    import database
+    import ratings
+    store = database.TournamentStore(args.db)
+    try:
+        if args.recompute:
+            # From scratch, over every finished tournament stored
+            table = ratings.RatingTable(args.system)
+            start = time.perf_counter()
+            count = table.catch_up(store)
+            store.save_ratings(table)
+            sys.stderr.write(f"{count} tournaments replayed in {time.perf_counter() - start:.3f}s\n")
+        else:
+            table = store.load_ratings(args.system)
+            if table.catch_up(store):
+                store.save_ratings(table)
+        rows = table.top(args.limit)
+    finally:
+        store.close()
+    if args.format == "json":
+        json.dump([dict(zip(("name", "rating", "rd", "games", "wins"), row)) for row in rows],
+                  sys.stdout)
+        sys.stdout.write("\n")
+    else:
+        sys.stdout.write(formatting.ratings_text(rows, args.system == "glicko")
+                         or "No rated teams yet.\n")
+    return 0
+
+# ---------------------------- ARGUMENTS ---------------------------- #
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m tournament",
+                                     description="Cybersecurity Hackathon Scheduler (headless)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def common(command):
+        command.add_argument("teams", nargs="?", default="teams.txt", help="teams file")
+        command.add_argument("--seed", type=int, default=None, help="random seed")
+        command.add_argument("--format", choices=("text", "json"), default="text")
+        command.add_argument("--top-k", type=int, default=None,
+                             help="only use the K best-ranked teams")
+        command.add_argument("--model", choices=("coin", "logistic", "power", "rating"),
+                             default="coin",
+                             help="win probability model (logistic/power need NumPy; "
+                                  "rating uses --ratings)")
+        command.add_argument("--scale", type=float, default=4.0,
+                             help="rank scale of the logistic model")
+
+    def tournament_options(command):
+        command.add_argument("--double", action="store_true", help="double elimination")
+        command.add_argument("--draw", choices=("random", "seeded"), default="random",
+                             help="random Group A vs Group B draw, or standard 1 vs N seeding")
+        command.add_argument("--compact", action="store_true", help="compact column storage")
+        command.add_argument("--groups", type=int, default=2, help="number of groups")
+        command.add_argument("--seeding", choices=("pots", "snake", "random"), default="pots",
+                             help="how teams are spread over the groups")
+        command.add_argument("--group-stage", type=int, metavar="N", default=0,
+                             help="play a round robin in every group first; the top N of each "
+                                  "group go through to the knockout")
+        command.add_argument("--separate-by", metavar="REGEX",
+                             help="keep teams whose names share this pattern's match apart "
+                                  "(e.g. '^(\\w+)' for the first word), needs snake or random seeding")
+        command.add_argument("--rooms", metavar="SPEC",
+                             help="give every match a time slot and room, e.g. 'Hall:8,Lab 1:4' "
+                                  "(room name and how many matches it hosts at once)")
+        command.add_argument("--duration", type=int, default=1, help="slots per match")
+        command.add_argument("--rest", type=int, default=0,
+                             help="slots a team sits out between two of its matches")
+        command.add_argument("--save", metavar="SNAPSHOT", help="write a binary snapshot when done")
+        command.add_argument("--resume", metavar="SNAPSHOT",
+                             help="continue from a snapshot instead of loading the teams file")
+        command.add_argument("--db", metavar="DATABASE",
+                             help="keep the tournament in this SQLite database as it is played")
+        command.add_argument("--name", help="tournament name in the database")
+        command.add_argument("--resume-db", metavar="ID", type=int,
+                             help="continue tournament ID from the --db database")
+        ratings_option(command)
+
+    def ratings_option(command):
+        command.add_argument("--ratings", choices=("elo", "glicko"),
+                             help="seed the teams by the ratings kept in --db and update them "
+                                  "with every result")
+
+    run = commands.add_parser("run", help="play one full tournament")
+    common(run)
+    tournament_options(run)
+    run.add_argument("--export", metavar="FILE", action="append", default=[],
+                     help="write the results to FILE: .csv or .jsonl for every match, "
+                          ".png, .pdf or .svg for a bracket drawing (Pillow); repeatable")
+    run.add_argument("--export-teams", metavar="FILE", action="append", default=[],
+                     help="write the teams (rank, members, group) to a .csv or .jsonl FILE")
+    run.add_argument("--slot-minutes", type=int, default=30, help="length of a slot")
+    run.add_argument("--start", default="09:00", help="clock time of the first slot (HH:MM)")
+    run.add_argument("--trace", metavar="FILE",
+                     help="record timing spans into a Chrome trace (chrome://tracing, Perfetto) "
+                          "and print the breakdown to stderr")
+    run.add_argument("--trace-memory", action="store_true",
+                     help="with --trace, also track allocations per span (slower)")
+    run.set_defaults(func=cmd_run)
+
+    scores = commands.add_parser("scores", help="take live results from judges over a local "
+                                                "socket (JSON Lines, see scoring.py)")
+    common(scores)
+    tournament_options(scores)
+    scores.add_argument("--host", default="127.0.0.1")
+    scores.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    scores.set_defaults(func=cmd_scores)
+
+    serve = commands.add_parser("serve", help="host many tournaments behind a JSON HTTP API "
+                                              "(see server.py)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--directory", default="tournaments",
+                       help="where idle tournaments are snapshotted; teams files "
+                            "named in requests are read from here too")
+    serve.add_argument("--idle", type=float, default=300,
+                       help="seconds without requests before a tournament is snapshotted")
+    serve.add_argument("--max-active", type=int, default=64,
+                       help="tournaments kept in memory at most")
+    serve.add_argument("--workers", type=int, default=None,
+                       help="simulation worker processes (default: one per CPU)")
+    serve.set_defaults(func=cmd_serve)
+
+    history = commands.add_parser("history", help="past tournaments kept with --db")
+    history.add_argument("--db", default="tournaments.db", help="SQLite database")
+    history.add_argument("--team", help="one team's results in every tournament")
+    history.add_argument("--against", metavar="TEAM", help="with --team: their matches against TEAM")
+    history.add_argument("--limit", type=int, default=50)
+    history.add_argument("--format", choices=("text", "json"), default="text")
+    history.set_defaults(func=cmd_history)
+
+    simulate = commands.add_parser("simulate", help="Monte Carlo odds for every team (NumPy)")
+    common(simulate)
+    simulate.add_argument("--runs", type=int, default=100000)
+    simulate.add_argument("--processes", type=int, default=1)
+    simulate.add_argument("--limit", type=int, default=20, help="rows in the text table")
+    simulate.add_argument("--db", metavar="DATABASE", help="SQLite database holding --ratings")
+    ratings_option(simulate)
+    simulate.set_defaults(func=cmd_simulate, resume_db=None)
+
+    ratings = commands.add_parser("ratings", help="team ratings kept with --db --ratings")
+    ratings.add_argument("--db", default="tournaments.db", help="SQLite database")
+    ratings.add_argument("--system", choices=("elo", "glicko"), default="elo")
+    ratings.add_argument("--recompute", action="store_true",
+                         help="rebuild the ratings from every stored tournament (NumPy)")
+    ratings.add_argument("--limit", type=int, default=20)
+    ratings.add_argument("--format", choices=("text", "json"), default="text")
+    ratings.set_defaults(func=cmd_ratings)
+    return parser
+
+def user_errors():
+    # Reported as "error: ..." instead of a traceback. Snapshot errors are
+    # ValueErrors; SQLite's only exist once a command imported it.
+    errors = (OSError, ImportError, ValueError, KeyError, re.error)
+    if "sqlite3" in sys.modules:
+        errors += (sys.modules["sqlite3"].Error,)
+    return errors
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except Exception as e:
+        if not isinstance(e, user_errors()):
+            raise
+        print(f"error: {e}", file=sys.stderr)
+        return 1
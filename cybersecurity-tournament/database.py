@@ -0,0 +1,545 @@
+import sqlite3
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+import registry
+import storage
+from scheduler import Scheduler, Team
+
+# Tournaments kept in a local SQLite database: teams, groups, rounds, matches
+# and results, one row each, for as many tournaments as get played.
+#
+#   store = database.TournamentStore("tournaments.db")
+#   scheduler.attach_store(store, "Spring qualifier")   # writes what is there so far
+#   ... play; every change is written as it happens ...
+#   store.team_history("Team Alpha")                     # across every tournament
+#   scheduler = store.load(tournament_id)                # back into a Scheduler
+#   table = store.load_ratings("elo")                    # ratings.RatingTable
+#
+# Writes go through one connection, in one transaction per Scheduler step
+# (a whole load, division or round is a single executemany), so a million
+# teams cost one commit, not a million. Single results entered from outside
+# (record_result, live scoring) are queued and written BATCH_SIZE at a time,
+# or when flush() is called. The database runs in WAL mode and every thread
+# reads through its own connection, so the GUI can query history while a
+# worker thread is writing a round.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+DATABASE = "tournaments.db"
+SCHEMA_VERSION = 2           # 2: ratings tables
+BATCH_SIZE = 1000           # Queued single results written per transaction
+BUSY_TIMEOUT = 10.0         # Seconds a connection waits for a lock
+HISTORY_LIMIT = 50
+CACHE_KIB = 64 * 1024       # Page cache per connection; big rounds touch a lot of index pages
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tournaments (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    created REAL NOT NULL,
+    finished REAL,
+    seed TEXT NOT NULL,
+    team_count INTEGER NOT NULL,
+    double_elimination INTEGER NOT NULL DEFAULT 0,
+    random_draw INTEGER NOT NULL DEFAULT 0,
+    entrants BLOB,
+    group_advance INTEGER,
+    win_points INTEGER,
+    loss_points INTEGER,
+    winner INTEGER
+);
+CREATE TABLE IF NOT EXISTS teams (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    idx INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    members TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, idx)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS teams_rank ON teams (tournament_id, rank);
+CREATE INDEX IF NOT EXISTS teams_name ON teams (name);
+CREATE TABLE IF NOT EXISTS groups (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    team INTEGER NOT NULL,
+    grp INTEGER NOT NULL,
+    PRIMARY KEY (tournament_id, team)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rounds (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    round_no INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    PRIMARY KEY (tournament_id, round_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rounds_name ON rounds (name, tournament_id);
+CREATE TABLE IF NOT EXISTS matches (
+    tournament_id INTEGER NOT NULL REFERENCES tournaments(id) ON DELETE CASCADE,
+    round_no INTEGER NOT NULL,
+    match_no INTEGER NOT NULL,
+    team1 INTEGER NOT NULL,
+    team2 INTEGER NOT NULL,
+    winner INTEGER,
+    PRIMARY KEY (tournament_id, round_no, match_no)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS matches_team1 ON matches (tournament_id, team1);
+CREATE INDEX IF NOT EXISTS matches_team2 ON matches (tournament_id, team2);
+CREATE TABLE IF NOT EXISTS ratings (
+    system TEXT NOT NULL,
+    name TEXT NOT NULL,
+    rating REAL NOT NULL,
+    rd REAL NOT NULL,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (system, name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ratings_rating ON ratings (system, rating);
+CREATE TABLE IF NOT EXISTS rating_systems (
+    system TEXT PRIMARY KEY,
+    last_tournament INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# ---------------------------- STORE ---------------------------- #
+class TournamentStore:
+    def __init__(self, path=DATABASE, timeout=BUSY_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self.lock = threading.RLock()
+        self.connection = self._connect()
+        self._readers = threading.local()
+        self._reader_connections = []
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"{path} was written by a newer version (schema {version})")
+        if version < SCHEMA_VERSION:
+            self.connection.executescript(f"BEGIN IMMEDIATE; {SCHEMA} "
+                                          f"PRAGMA user_version = {SCHEMA_VERSION}; COMMIT;")
+
+    def _connect(self):
+        # Autocommit mode: transactions are opened explicitly by transaction()
+        connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                     check_same_thread=False)
+        connection.execute("PRAGMA journal_mode = WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.execute(f"PRAGMA cache_size = -{CACHE_KIB}")
+        return connection
+
+    @contextmanager
+    def transaction(self):
+        with self.lock:
+            db = self.connection
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+            db.execute("COMMIT")
+
+    def reader(self):
+        # This thread's read connection; WAL readers never wait for the writer
+        connection = getattr(self._readers, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                         check_same_thread=False)
+            connection.execute("PRAGMA query_only = ON")
+            self._readers.connection = connection
+            with self.lock:
+                self._reader_connections.append(connection)
+        return connection
+
+    def close(self):
+        with self.lock:
+            for connection in self._reader_connections:
+                connection.close()
+            self._reader_connections = []
+            self.connection.close()
+
+    # ---------------------------- WRITING ---------------------------- #
+    def create(self, scheduler, name=None):
+        # New tournament holding everything the Scheduler has so far
+        recorder = Recorder(self, None, name)
+        recorder.start(scheduler)
+        return recorder
+
+    def resume(self, tournament_id, compact=False):
+        # load() with the Scheduler still writing into the same tournament
+        scheduler = self.load(tournament_id, compact)
+        scheduler.store = Recorder(self, tournament_id)
+        return scheduler
+
+    def delete(self, tournament_id):
+        with self.transaction() as db:
+            db.execute("DELETE FROM tournaments WHERE id = ?", (tournament_id,))
+
+    # ---------------------------- QUERIES ---------------------------- #
+    def tournaments(self, limit=HISTORY_LIMIT, offset=0):
+        # Newest first: (id, name, created, finished, teams, champion name or None)
+        return self.reader().execute(
+            "SELECT t.id, t.name, t.created, t.finished, t.team_count, w.name "
+            "FROM tournaments t LEFT JOIN teams w ON w.tournament_id = t.id AND w.idx = t.winner "
+            "ORDER BY t.id DESC LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+
+    def team_history(self, name, limit=HISTORY_LIMIT):
+        # Every tournament a team (by exact name) took part in, newest first:
+        # (tournament id, tournament name, rank, played, won, last round, champion)
+        db = self.reader()
+        history = []
+        for tournament_id, title, index, rank, winner in db.execute(
+                "SELECT t.id, t.name, tm.idx, tm.rank, t.winner FROM teams tm "
+                "JOIN tournaments t ON t.id = tm.tournament_id "
+                "WHERE tm.name = ? ORDER BY t.id DESC LIMIT ?", (name, limit)).fetchall():
+            # Both team columns are indexed, so this is two short range scans
+            played, won, last = db.execute(
+                "SELECT COUNT(winner), COALESCE(SUM(winner = ?), 0), MAX(round_no) FROM ("
+                "  SELECT winner, round_no FROM matches INDEXED BY matches_team1 "
+                "  WHERE tournament_id = ? AND team1 = ? "
+                "  UNION ALL "
+                "  SELECT winner, round_no FROM matches INDEXED BY matches_team2 "
+                "  WHERE tournament_id = ? AND team2 = ?)",
+                (index, tournament_id, index, tournament_id, index)).fetchone()
+            round_name = None
+            if last is not None:
+                round_name = db.execute("SELECT name FROM rounds WHERE tournament_id = ? "
+                                        "AND round_no = ?", (tournament_id, last)).fetchone()[0]
+            history.append((tournament_id, title, rank, played, won, round_name, winner == index))
+        return history
+
+    def head_to_head(self, first, second, limit=HISTORY_LIMIT):
+        # Matches between two teams (by name) over every tournament, newest
+        # first: (tournament id, round name, winner name)
+        return self.reader().execute(
+            "SELECT m.tournament_id, r.name, w.name FROM ("
+            "  SELECT a.tournament_id, a.idx AS one, b.idx AS other FROM teams a "
+            "  JOIN teams b ON b.tournament_id = a.tournament_id AND b.name = ? "
+            "  WHERE a.name = ?) pair "
+            "JOIN matches m INDEXED BY matches_team1 ON m.tournament_id = pair.tournament_id "
+            "  AND m.team1 IN (pair.one, pair.other) "
+            "  AND m.team2 = (CASE m.team1 WHEN pair.one THEN pair.other ELSE pair.one END) "
+            "JOIN rounds r ON r.tournament_id = m.tournament_id AND r.round_no = m.round_no "
+            "LEFT JOIN teams w ON w.tournament_id = m.tournament_id AND w.idx = m.winner "
+            "ORDER BY m.tournament_id DESC, m.round_no LIMIT ?",
+            (second, first, limit)).fetchall()
+
+    def champions(self, limit=HISTORY_LIMIT):
+        # Team names by titles won: (name, titles). CROSS JOIN keeps SQLite
+        # from scanning every stored team for the GROUP BY
+        return self.reader().execute(
+            "SELECT w.name, COUNT(*) FROM tournaments t "
+            "CROSS JOIN teams w ON w.tournament_id = t.id AND w.idx = t.winner "
+            "GROUP BY w.name ORDER BY COUNT(*) DESC, w.name LIMIT ?", (limit,)).fetchall()
+
+    def round_matches(self, tournament_id, round_name, start=0, stop=None):
+        # One page of a stored round: (match number, team1, team2, winner or None)
+        db = self.reader()
+        row = db.execute("SELECT round_no FROM rounds WHERE tournament_id = ? AND name = ?",
+                         (tournament_id, round_name)).fetchone()
+        if row is None:
+            raise KeyError(f"tournament {tournament_id} has no {round_name}")
+        # A range on the primary key instead of OFFSET, so late pages cost the same
+        return db.execute(
+            "SELECT m.match_no + 1, a.name, b.name, w.name FROM matches m "
+            "JOIN teams a ON a.tournament_id = m.tournament_id AND a.idx = m.team1 "
+            "JOIN teams b ON b.tournament_id = m.tournament_id AND b.idx = m.team2 "
+            "LEFT JOIN teams w ON w.tournament_id = m.tournament_id AND w.idx = m.winner "
+            "WHERE m.tournament_id = ? AND m.round_no = ? AND m.match_no >= ? AND m.match_no < ? "
+            "ORDER BY m.match_no",
+            (tournament_id, row[0], start, (1 << 62) if stop is None else stop)).fetchall()
+
+    def match_history(self, after=0):
+        # Finished tournaments with an id above after, oldest first, for
+        # ratings.RatingTable.recompute(): (id, team names by index,
+        # [(winner indices, loser indices) per round])
+        db = self.reader()
+        for (tournament_id,) in db.execute("SELECT id FROM tournaments WHERE id > ? "
+                                           "AND finished IS NOT NULL ORDER BY id",
+                                           (after,)).fetchall():
+            names = [name for (name,) in db.execute(
+                "SELECT name FROM teams WHERE tournament_id = ? ORDER BY idx", (tournament_id,))]
+            rounds = {}
+            for round_no, team1, team2, winner in db.execute(
+                    "SELECT round_no, team1, team2, winner FROM matches "
+                    "WHERE tournament_id = ? AND winner IS NOT NULL ORDER BY round_no, match_no",
+                    (tournament_id,)):
+                sides = rounds.get(round_no)
+                if sides is None:
+                    sides = rounds[round_no] = (array("i"), array("i"))
+                sides[0].append(winner)
+                sides[1].append(team2 if winner == team1 else team1)
+            yield tournament_id, names, [rounds[r] for r in sorted(rounds)]
+
+    # ---------------------------- RATINGS ---------------------------- #
+    def load_ratings(self, system="elo"):
+        # The saved ratings.RatingTable of a system; empty if none was saved
+        import ratings
+        table = ratings.RatingTable(system)
+        db = self.reader()
+        for name, rating, rd, games, wins in db.execute(
+                "SELECT name, rating, rd, games, wins FROM ratings WHERE system = ? "
+                "ORDER BY rating DESC", (table.system.name,)):
+            row = table.row(name)
+            table.rating[row] = rating
+            table.rd[row] = rd
+            table.games[row] = games
+            table.wins[row] = wins
+        row = db.execute("SELECT last_tournament FROM rating_systems WHERE system = ?",
+                         (table.system.name,)).fetchone()
+        if row is not None:
+            table.last_tournament = row[0]
+        return table
+
+    def save_ratings(self, table, last_tournament=None):
+        # Writes the whole table; last_tournament is the newest tournament
+        # already counted in it (the one just played, say)
+        if last_tournament is not None:
+            table.last_tournament = max(table.last_tournament, last_tournament)
+        system = table.system.name
+        with self.transaction() as db:
+            db.executemany("INSERT OR REPLACE INTO ratings (system, name, rating, rd, games, wins) "
+                           "VALUES (?, ?, ?, ?, ?, ?)",
+                           zip([system] * len(table), table.names, table.rating, table.rd,
+                               table.games, table.wins))
+            db.execute("INSERT OR REPLACE INTO rating_systems (system, last_tournament) "
+                       "VALUES (?, ?)", (system, table.last_tournament))
+
+    def top_ratings(self, system="elo", limit=HISTORY_LIMIT):
+        # (name, rating, rd, games, wins), best first
+        return self.reader().execute(
+            "SELECT name, rating, rd, games, wins FROM ratings WHERE system = ? "
+            "ORDER BY rating DESC LIMIT ?", (system, limit)).fetchall()
+
+    # ---------------------------- RESTORE ---------------------------- #
+    def load(self, tournament_id, compact=False):
+        # Rebuilds the Scheduler by setting it up with the stored options and
+        # entering every stored result again, so the bracket, group standings
+        # and winner come out exactly as they were. Results go into the event
+        # log without their original draws (NaN, as for judges' results).
+        db = self.reader()
+        row = db.execute("SELECT seed, double_elimination, random_draw, entrants, group_advance, "
+                         "win_points, loss_points FROM tournaments WHERE id = ?",
+                         (tournament_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"no tournament {tournament_id} in {self.path}")
+        seed, double, random_draw, entrants, advance, win_points, loss_points = row
+
+        scheduler = Scheduler(compact=compact, seed=int(seed))
+        rows = db.execute("SELECT rank, idx, name, members FROM teams "
+                          "WHERE tournament_id = ? ORDER BY idx", (tournament_id,))
+        if compact:
+            scheduler.teams = storage.TeamTable.from_rows(
+                (rank, idx, name, members.split(",") if members else [])
+                for rank, idx, name, members in rows)
+            scheduler.match_table = storage.MatchTable(scheduler.teams)
+        else:
+            scheduler.teams = [Team(name, members.split(",") if members else [], rank)
+                               for rank, _, name, members in rows]
+
+        groups = {}
+        for team, grp in db.execute("SELECT team, grp FROM groups WHERE tournament_id = ? "
+                                    "ORDER BY grp, team", (tournament_id,)):
+            groups.setdefault(grp, array("i")).append(team)
+        if groups:
+            teams = scheduler.teams
+            scheduler.groups = [registry.TeamView(teams, groups[g]) for g in sorted(groups)]
+            scheduler.group_A = scheduler.groups[0]
+            scheduler.group_B = scheduler.groups[1] if len(groups) > 1 else []
+
+        rounds = db.execute("SELECT round_no, name, kind FROM rounds WHERE tournament_id = ? "
+                            "ORDER BY round_no", (tournament_id,)).fetchall()
+        if advance is not None:
+            scheduler.start_group_stage(advance, win_points, loss_points)
+        elif scheduler.teams:
+            scheduler.build_bracket(bool(double), bool(random_draw))
+        for round_no, round_name, kind in rounds:
+            if kind == "knockout" and scheduler.bracket is None:
+                scheduler.build_bracket(bool(double), bool(random_draw),
+                                        array("i", entrants) if entrants is not None else None)
+            if round_name not in scheduler.rounds:
+                raise ValueError(f"stored round {round_name!r} doesn't fit the tournament's set-up")
+            scheduler.schedule_round(round_name)
+            stored = db.execute("SELECT team1, team2, winner FROM matches "
+                                "WHERE tournament_id = ? AND round_no = ? ORDER BY match_no",
+                                (tournament_id, round_no)).fetchall()
+            sides = scheduler.round_sides(round_name)
+            if [(a, b) for a, b, _ in stored] != list(sides):
+                raise ValueError(f"stored {round_name} doesn't match the replayed draw")
+            teams = scheduler.teams
+            for i, (_, _, winner) in enumerate(stored):
+                if winner is not None:
+                    scheduler.record_result(round_name, i, teams[winner])
+        return scheduler
+
+# ---------------------------- RECORDER ---------------------------- #
+class Recorder:
+    # Writes one tournament's changes as its Scheduler makes them; the
+    # Scheduler calls these from load_teams, update_teams, divide_groups,
+    # build_bracket, start_group_stage, schedule_round, complete_round and
+    # record_result.
+    def __init__(self, store, tournament_id, name=None):
+        self.store = store
+        self.tournament_id = tournament_id
+        self.name = name
+        self.pending = []           # (winner, tournament, round_no, match_no) not written yet
+
+    def start(self, scheduler):
+        # (Re)starts as a new tournament row, e.g. after new teams are loaded
+        self.pending = []
+        name = self.name or time.strftime("Tournament %Y-%m-%d %H:%M:%S")
+        with self.store.transaction() as db:
+            self.tournament_id = db.execute(
+                "INSERT INTO tournaments (name, created, seed, team_count) VALUES (?, ?, ?, ?)",
+                (name, time.time(), str(scheduler.rng.seed), len(scheduler.teams))).lastrowid
+            self._write_teams(db, scheduler)
+            self._write_groups(db, scheduler)
+            self._write_setup(db, scheduler)
+            for round_name in scheduler.round_names:
+                if round_name in scheduler.round_pairings:
+                    self._write_round(db, scheduler, round_name)
+                    self._write_results(db, scheduler, round_name)
+            self._write_winner(db, scheduler)
+        return self
+
+    def teams(self, scheduler):
+        # After Scheduler.update_teams: the same tournament with the new
+        # teams and groups (indices moved, so both are written again)
+        with self.store.transaction() as db:
+            db.execute("UPDATE tournaments SET team_count = ? WHERE id = ?",
+                       (len(scheduler.teams), self.tournament_id))
+            db.execute("DELETE FROM teams WHERE tournament_id = ?", (self.tournament_id,))
+            db.execute("DELETE FROM groups WHERE tournament_id = ?", (self.tournament_id,))
+            self._write_teams(db, scheduler)
+            self._write_groups(db, scheduler)
+            self._write_setup(db, scheduler)
+
+    def groups(self, scheduler):
+        with self.store.transaction() as db:
+            db.execute("DELETE FROM groups WHERE tournament_id = ?", (self.tournament_id,))
+            self._write_groups(db, scheduler)
+
+    def setup(self, scheduler):
+        # After build_bracket/start_group_stage: options, and rounds that
+        # the new set-up dropped
+        self.flush()
+        with self.store.transaction() as db:
+            self._write_setup(db, scheduler)
+            kept = sum(1 for name in scheduler.round_names if name in scheduler.round_pairings)
+            db.execute("DELETE FROM matches WHERE tournament_id = ? AND round_no >= ?",
+                       (self.tournament_id, kept))
+            db.execute("DELETE FROM rounds WHERE tournament_id = ? AND round_no >= ?",
+                       (self.tournament_id, kept))
+            self._write_winner(db, scheduler)
+
+    def round(self, scheduler, round_name):
+        self.flush()
+        with self.store.transaction() as db:
+            self._write_round(db, scheduler, round_name)
+
+    def results(self, scheduler, round_name):
+        # Whole round at once, after complete_round
+        self.pending = [row for row in self.pending
+                        if row[2] != scheduler.round_names.index(round_name)]
+        self.flush()
+        with self.store.transaction() as db:
+            self._write_results(db, scheduler, round_name)
+            self._write_winner(db, scheduler)
+
+    def result(self, scheduler, round_name, i):
+        # One result; queued until BATCH_SIZE of them or the round closes
+        round_no = scheduler.round_names.index(round_name)
+        match = scheduler.rounds[round_name][i]
+        winner = scheduler.registry.index_of(match.winner)
+        self.pending.append((winner, self.tournament_id, round_no, i))
+        if len(self.pending) >= BATCH_SIZE or scheduler.winner is not None:
+            self.flush(scheduler)
+
+    def flush(self, scheduler=None):
+        if not self.pending and scheduler is None:
+            return
+        pending, self.pending = self.pending, []
+        with self.store.transaction() as db:
+            db.executemany("UPDATE matches SET winner = ? WHERE tournament_id = ? "
+                           "AND round_no = ? AND match_no = ?", pending)
+            if scheduler is not None:
+                self._write_winner(db, scheduler)
+
+    # ---------------------------- ROWS ---------------------------- #
+    def _write_teams(self, db, scheduler):
+        tournament_id = self.tournament_id
+        teams = scheduler.teams
+        if isinstance(teams, storage.TeamTable):
+            # Straight from the columns, without a TeamRef per row
+            strings, name_ids, ranks = teams.strings, teams.name_ids, teams.ranks
+            starts, member_ids = teams.member_starts, teams.member_ids
+            rows = ((tournament_id, i, strings[name_ids[i]], ranks[i],
+                     ",".join([strings[m] for m in member_ids[starts[i]:starts[i + 1]]]))
+                    for i in range(len(teams)))
+        else:
+            rows = ((tournament_id, i, team.name, team.rank, ",".join(team.members))
+                    for i, team in enumerate(teams))
+        db.executemany("INSERT INTO teams (tournament_id, idx, name, rank, members) "
+                       "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def _write_groups(self, db, scheduler):
+        tournament_id = self.tournament_id
+        index_of = scheduler.registry.index_of
+        for g, group in enumerate(scheduler.groups):
+            indices = getattr(group, "indices", None)
+            if indices is None:
+                indices = [index_of(team) for team in group]
+            db.executemany("INSERT INTO groups (tournament_id, team, grp) VALUES (?, ?, ?)",
+                           ((tournament_id, team, g) for team in indices))
+
+    def _write_setup(self, db, scheduler):
+        tree, stage, events = scheduler.bracket, scheduler.group_stage, scheduler.events
+        entrants = events.entrants if tree is not None else None
+        db.execute("UPDATE tournaments SET double_elimination = ?, random_draw = ?, entrants = ?, "
+                   "group_advance = ?, win_points = ?, loss_points = ? WHERE id = ?",
+                   (int(events.double_elimination), int(events.random_draw),
+                    array("i", entrants).tobytes() if entrants is not None else None,
+                    stage.advance if stage is not None else None,
+                    stage.win_points if stage is not None else None,
+                    stage.loss_points if stage is not None else None,
+                    self.tournament_id))
+
+    def _write_round(self, db, scheduler, round_name):
+        tournament_id = self.tournament_id
+        round_no = scheduler.round_names.index(round_name)
+        kind = ("group" if scheduler.is_group_round(round_name)
+                else "knockout" if scheduler.round_pairings.get(round_name) is not None
+                else "draw")
+        db.execute("DELETE FROM matches WHERE tournament_id = ? AND round_no = ?",
+                   (tournament_id, round_no))
+        db.execute("INSERT OR REPLACE INTO rounds (tournament_id, round_no, name, kind) "
+                   "VALUES (?, ?, ?, ?)", (tournament_id, round_no, round_name, kind))
+        db.executemany("INSERT INTO matches (tournament_id, round_no, match_no, team1, team2) "
+                       "VALUES (?, ?, ?, ?, ?)",
+                       ((tournament_id, round_no, i, a, b)
+                        for i, (a, b) in enumerate(scheduler.round_sides(round_name))))
+
+    def _write_results(self, db, scheduler, round_name):
+        tournament_id = self.tournament_id
+        round_no = scheduler.round_names.index(round_name)
+        matches = scheduler.rounds[round_name]
+        if isinstance(matches, storage.MatchRange):
+            winners = matches.table.winners[matches.start:matches.stop]
+        else:
+            # Sides are team indices already, so no index lookup per winner
+            winners = [storage.NO_TEAM if match.winner is None
+                       else a if match.winner is match.team1 else b
+                       for match, (a, b) in zip(matches, scheduler.round_sides(round_name))]
+        db.executemany("UPDATE matches SET winner = ? WHERE tournament_id = ? "
+                       "AND round_no = ? AND match_no = ?",
+                       ((winner, tournament_id, round_no, i)
+                        for i, winner in enumerate(winners) if winner != storage.NO_TEAM))
+
+    def _write_winner(self, db, scheduler):
+        if scheduler.winner is None:
+            db.execute("UPDATE tournaments SET winner = NULL, finished = NULL WHERE id = ?",
+                       (self.tournament_id,))
+            return
+        db.execute("UPDATE tournaments SET winner = ?, finished = COALESCE(finished, ?) "
+                   "WHERE id = ?",
+                   (scheduler.registry.index_of(scheduler.winner), time.time(), self.tournament_id))
@@ -0,0 +1,203 @@
+import csv
+import json
+import os
+from xml.sax.saxutils import escape, quoteattr
+
+import bracket
+
+# Result files. CSV and JSON Lines are written one match (or team) at a
+# time straight into the file, so a million-match tournament costs the same
+# memory as a small one. Bracket drawings go through Pillow (PNG, PDF) or
+# are written as SVG text; they show the last rounds of the knockout, from
+# the first round with at most `max_matches` matches on.
+#
+# Everything here only reads the Scheduler, and progress(done, total) is
+# called every PROGRESS_EVERY rows, so exports can run on a worker thread
+# (see tasks.py) and be cancelled from the progress callback.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+FORMATS = (".csv", ".jsonl", ".png", ".pdf", ".svg")
+PROGRESS_EVERY = 10000
+MATCH_FIELDS = ("round", "match", "team1", "team1_rank", "team2", "team2_rank", "winner",
+                "slot", "room")
+TEAM_FIELDS = ("rank", "name", "members", "group")
+MAX_MATCHES = 32
+
+# Drawing, in pixels; colors follow gui.ColorPalette
+BOX_WIDTH = 220
+BOX_HEIGHT = 44
+COLUMN_GAP = 60
+ROW_GAP = 12
+MARGIN = 30
+BACKGROUND = "#1a1a2e"
+BOX = "#16213e"
+LINE = "#0f3460"
+WINNER = "#e94560"
+TEXT = "#f1f1f1"
+MUTED = "#8a8fa8"
+
+# ---------------------------- ROWS ---------------------------- #
+def match_rows(scheduler):
+    # (round, match number, team1, rank, team2, rank, winner, slot, room)
+    slots = scheduler.timetable
+    for round_name, matches in scheduler.rounds.items():
+        timed = slots is not None and round_name in slots.starts
+        for i, match in enumerate(matches):
+            team1, team2, winner = match.team1, match.team2, match.winner
+            slot = room = None
+            if timed:
+                slot, room = slots.slot_of(round_name, i)
+                room = room.name
+            yield (round_name, i + 1, team1.name, team1.rank, team2.name, team2.rank,
+                   winner.name if winner is not None else None, slot, room)
+
+def team_rows(scheduler):
+    # (rank, name, members, group number or None)
+    group_of = {}
+    if len(scheduler.groups) > 1:
+        for g, group in enumerate(scheduler.groups, 1):
+            for index in getattr(group, "indices", ()):
+                group_of[index] = g
+    for i, team in enumerate(scheduler.teams):
+        yield team.rank, team.name, list(team.members), group_of.get(i)
+
+def match_count(scheduler):
+    return sum(len(matches) for matches in scheduler.rounds.values())
+
+def _counted(rows, total, progress):
+    for done, row in enumerate(rows, 1):
+        if progress is not None and done % PROGRESS_EVERY == 0:
+            progress(done, total)
+        yield row
+
+# ---------------------------- WRITERS ---------------------------- #
+def write_csv(scheduler, out, teams=False, progress=None):
+    writer = csv.writer(out)
+    if teams:
+        writer.writerow(TEAM_FIELDS)
+        writer.writerows((rank, name, ",".join(members), group)
+                         for rank, name, members, group in
+                         _counted(team_rows(scheduler), len(scheduler.teams), progress))
+    else:
+        writer.writerow(MATCH_FIELDS)
+        writer.writerows(_counted(match_rows(scheduler), match_count(scheduler), progress))
+
+def write_jsonl(scheduler, out, teams=False, progress=None):
+    if teams:
+        fields, rows, total = TEAM_FIELDS, team_rows(scheduler), len(scheduler.teams)
+    else:
+        fields, rows, total = MATCH_FIELDS, match_rows(scheduler), match_count(scheduler)
+    dumps = json.dumps
+    for row in _counted(rows, total, progress):
+        out.write(dumps(dict(zip(fields, row))))
+        out.write("\n")
+
+def export(scheduler, path, teams=False, progress=None, max_matches=MAX_MATCHES):
+    # Picks the format from the file extension
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"can't export to {extension or path!r}, use one of {', '.join(FORMATS)}")
+    if extension in (".csv", ".jsonl"):
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            (write_csv if extension == ".csv" else write_jsonl)(scheduler, out, teams, progress)
+    elif extension == ".svg":
+        with open(path, "w", encoding="utf-8") as out:
+            write_svg(scheduler, out, max_matches)
+    else:
+        draw_bracket(scheduler, max_matches).save(path, "PDF" if extension == ".pdf" else "PNG")
+    return path
+
+# ---------------------------- BRACKET LAYOUT ---------------------------- #
+def layout(scheduler, max_matches=MAX_MATCHES):
+    # Boxes and connectors of the knockout tree: boxes are
+    # (x, y, top line, bottom line, which line won: 0, 1 or None), lines are
+    # (x1, y1, x2, y2) elbows from a box to the one its winner goes to and
+    # titles are (x, round name) column headers.
+    # Double elimination draws the winners bracket and the grand final.
+    tree = scheduler.bracket
+    if tree is None:
+        raise ValueError("no knockout bracket to draw yet")
+    winners = tree.winners if isinstance(tree, bracket.DoubleBracket) else tree
+    teams = scheduler.teams
+    slots = winners.slots
+
+    def name(index):
+        if index >= 0:
+            return teams[index].name
+        return "bye" if index == bracket.BYE else "TBD"
+
+    first = 0
+    while (winners.size >> (first + 1)) > max_matches:
+        first += 1
+    height = (winners.size >> (first + 1)) * (BOX_HEIGHT + ROW_GAP)
+    boxes = []
+    lines = []
+    titles = []
+    centers = {}
+    for column, r in enumerate(range(first, winners.depth)):
+        nodes = winners.nodes(r)
+        step = height / len(nodes)
+        x = MARGIN + column * (BOX_WIDTH + COLUMN_GAP)
+        titles.append((x, winners.round_names[r]))
+        for p, node in enumerate(nodes):
+            y = MARGIN + (p + 0.5) * step - BOX_HEIGHT / 2
+            a, b, won = slots[2 * node], slots[2 * node + 1], slots[node]
+            side = None if won < 0 else (0 if won == a else 1)
+            boxes.append((x, y, name(a), name(b), side))
+            centers[node] = (x, y + BOX_HEIGHT / 2)
+            child = centers.get(2 * node), centers.get(2 * node + 1)
+            for start in child:
+                if start is not None:
+                    lines.append((start[0] + BOX_WIDTH, start[1], x, y + BOX_HEIGHT / 2))
+    if winners is not tree:
+        x = MARGIN + (winners.depth - first) * (BOX_WIDTH + COLUMN_GAP)
+        y = MARGIN + height / 2 - BOX_HEIGHT / 2
+        a, b = tree.finalists
+        won = tree.grand_final
+        boxes.append((x, y, name(a), name(b), None if won < 0 else (0 if won == a else 1)))
+        titles.append((x, "Grand Final"))
+        lines.append((centers[1][0] + BOX_WIDTH, centers[1][1], x, y + BOX_HEIGHT / 2))
+    width = 2 * MARGIN + (max(box[0] for box in boxes) - MARGIN) + BOX_WIDTH
+    return int(width), int(height + 2 * MARGIN), boxes, lines, titles
+
+def elbow(x1, y1, x2, y2):
+    middle = (x1 + x2) / 2
+    return [(x1, y1), (middle, y1), (middle, y2), (x2, y2)]
+
+# ---------------------------- DRAWING ---------------------------- #
+def draw_bracket(scheduler, max_matches=MAX_MATCHES):
+    # Pillow image of the bracket (PNG, or PDF via Image.save)
+    from PIL import Image, ImageDraw
+    width, height, boxes, lines, titles = layout(scheduler, max_matches)
+    image = Image.new("RGB", (width, height), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    for x, title in titles:
+        draw.text((x, MARGIN / 2 - 6), title, fill=WINNER)
+    for x1, y1, x2, y2 in lines:
+        draw.line(elbow(x1, y1, x2, y2), fill=LINE, width=2)
+    for x, y, top, bottom, side in boxes:
+        draw.rectangle((x, y, x + BOX_WIDTH, y + BOX_HEIGHT), fill=BOX, outline=LINE)
+        for line, (text, offset) in enumerate(((top, 6), (bottom, BOX_HEIGHT / 2 + 4))):
+            color = WINNER if side == line else (MUTED if side is not None else TEXT)
+            draw.text((x + 8, y + offset), text[:30], fill=color)
+    return image
+
+def write_svg(scheduler, out, max_matches=MAX_MATCHES):
+    # Same layout as draw_bracket, written element by element
+    width, height, boxes, lines, titles = layout(scheduler, max_matches)
+    out.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+              f'font-family="monospace" font-size="12">\n')
+    out.write(f'<rect width="100%" height="100%" fill="{BACKGROUND}"/>\n')
+    for x, title in titles:
+        out.write(f'<text x="{x:.1f}" y="{MARGIN / 2 + 4:.1f}" fill="{WINNER}">{escape(title)}</text>\n')
+    for x1, y1, x2, y2 in lines:
+        points = " ".join(f"{x:.1f},{y:.1f}" for x, y in elbow(x1, y1, x2, y2))
+        out.write(f'<polyline points="{points}" fill="none" stroke="{LINE}" stroke-width="2"/>\n')
+    for x, y, top, bottom, side in boxes:
+        out.write(f'<rect x="{x:.1f}" y="{y:.1f}" width="{BOX_WIDTH}" height="{BOX_HEIGHT}" '
+                  f'fill="{BOX}" stroke="{LINE}"/>\n')
+        for line, (text, offset) in enumerate(((top, 17), (bottom, BOX_HEIGHT / 2 + 15))):
+            color = WINNER if side == line else (MUTED if side is not None else TEXT)
+            out.write(f'<text x="{x + 8:.1f}" y="{y + offset:.1f}" fill={quoteattr(color)}>'
+                      f'{escape(text[:30])}</text>\n')
+    out.write("</svg>\n")
@@ -0,0 +1,83 @@
+# Plain-text views of rounds. Each function builds one string for a slice of a
+# round's matches, so the GUI can hand a whole page to Text.insert in a single
+# call and the CLI can print it as is.
+
+def matchups_text(matches, start=0, stop=None):
+    return "".join(f"Match {i}: {match.team1.name} vs {match.team2.name}\n"
+                   for i, match in enumerate(matches[start:stop], start + 1))
+
+def results_text(matches, start=0, stop=None):
+    return "".join(f"Match {i}: {match.team1.name} vs {match.team2.name}\n"
+                   f"Winner: {winner_name(match)}\n\n"
+                   for i, match in enumerate(matches[start:stop], start + 1))
+
+def summary_text(matches, start=0, stop=None):
+    return "".join(f"- {match.team1.name} vs {match.team2.name} → {winner_name(match)}\n"
+                   for match in matches[start:stop])
+
+def team_matches_text(entries, start=0, stop=None):
+    # entries: (round name, match) pairs from Scheduler.matches_of
+    return "".join(f"- {round_name}: {match.team1.name} vs {match.team2.name} → {winner_name(match)}\n"
+                   for round_name, match in entries[start:stop])
+
+def standings_text(rows, teams, start=0, stop=None):
+    # rows: GroupStage.standings(g), best first
+    header = f"{'#':>3}  {'Team':<24}{'P':>4}{'W':>4}{'L':>4}{'Pts':>5}\n" if start == 0 else ""
+    return header + "".join(
+        f"{place:>3}  {teams[team].name[:23]:<24}{played:>4}{wins:>4}{losses:>4}{points:>5}\n"
+        for place, (team, played, wins, losses, points) in enumerate(rows[start:stop], start + 1))
+
+def history_text(rows, start=0, stop=None):
+    # rows: database.TournamentStore.team_history(name), newest first
+    return "".join(
+        f"- {title}: rank {rank}, {won}/{played} won, "
+        f"{'champion' if champion else f'out in {last}' if last else 'not played yet'}\n"
+        for _, title, rank, played, won, last, champion in rows[start:stop])
+
+def tournaments_text(rows):
+    # rows: database.TournamentStore.tournaments()
+    return "".join(
+        f"{tournament_id:>5}  {title[:32]:<33}{teams:>9} teams  "
+        f"{champion if champion is not None else ('unfinished' if finished is None else '-')}\n"
+        for tournament_id, title, _, finished, teams, champion in rows)
+
+def ratings_text(rows, deviation=False):
+    # rows: ratings.RatingTable.top(); deviation adds Glicko's RD
+    return "".join(
+        f"{place:>4}. {name[:32]:<33}{rating:>7.0f}"
+        f"{f' ±{2 * rd:<4.0f}' if deviation else ''} {wins:>5}/{games:<5} won\n"
+        for place, (name, rating, rd, games, wins) in enumerate(rows, 1))
+
+def clock(slot, start_minute=9 * 60, slot_minutes=30):
+    # Wall clock time of a timetable slot, "09:30" or "Day 2 14:00"
+    day, minute = divmod(start_minute + slot * slot_minutes, 24 * 60)
+    text = f"{minute // 60:02d}:{minute % 60:02d}"
+    return f"Day {day + 1} {text}" if day else text
+
+def timetable_text(summary, start_minute=9 * 60, slot_minutes=30):
+    # summary: timetable.Timetable.summary()
+    makespan = summary["makespan"]
+    hours, minutes = divmod(makespan * slot_minutes, 60)
+    parts = [f"{summary['matches']} matches on {summary['tables']} tables, "
+             f"{makespan} slots ({hours}h{minutes:02d}m at {slot_minutes} min/slot)\n",
+             f"Utilization {summary['utilization']:.1%}, peak {summary['peak']} of "
+             f"{summary['tables']} tables in use\n\n"]
+    for room in summary["rooms"]:
+        parts.append(f"- {room['name']} ({room['capacity']} tables): {room['utilization']:.1%} busy\n")
+    parts.append("\n")
+    for entry in summary["rounds"]:
+        parts.append(f"- {entry['name']}: {entry['matches']} matches, "
+                     f"{clock(entry['first_slot'], start_minute, slot_minutes)} - "
+                     f"{clock(entry['last_slot'] + 1, start_minute, slot_minutes)}\n")
+    return "".join(parts)
+
+def winner_name(match):
+    return match.winner.name if match.winner is not None else "(not played)"
+
+def tournament_summary(rounds):
+    parts = ["Match Results:\n\n"]
+    for round_name, matches in rounds.items():
+        parts.append(f"{round_name}:\n")
+        parts.append(summary_text(matches))
+        parts.append("\n")
+    return "".join(parts)
@@ -0,0 +1,136 @@
+from array import array
+
+# Round-robin group stage. Every group plays all of its pairings over
+# matchdays generated with the circle method: one team stays put, the others
+# rotate one place per matchday, so matchday d of a group of n teams is
+# computed directly in O(n) and nothing ever holds all n(n-1)/2 pairings.
+# Odd groups get a ghost team; whoever meets it sits the matchday out.
+#
+# Standings are columns per group (points, wins, losses, played) indexed by a
+# team's position in its group and bumped in O(1) per result. Sorting only
+# happens when a table is read, and only groups that changed are re-sorted.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+WIN_POINTS = 3
+LOSS_POINTS = 0
+
+# ---------------------------- FIXTURES ---------------------------- #
+def matchday_count(size):
+    return size - 1 if size % 2 == 0 else size
+
+def matchday(size, day):
+    # (i, j) positions playing on matchday `day` (0-based) of a group
+    n = size + size % 2
+    spin = n - 1
+    pairs = []
+    if n - 1 < size:
+        pairs.append((day % spin, n - 1))
+    for k in range(1, n // 2):
+        a = (day + k) % spin
+        b = (day - k) % spin
+        if a < size and b < size:
+            pairs.append((a, b))
+    return pairs
+
+def iter_matchdays(size):
+    for day in range(matchday_count(size)):
+        yield matchday(size, day)
+
+# ---------------------------- STAGE ---------------------------- #
+class GroupStage:
+    def __init__(self, groups, team_count, advance=2, win_points=WIN_POINTS,
+                 loss_points=LOSS_POINTS, prefix="Group Matchday"):
+        # groups: sequences of team indices in seed order
+        self.groups = [array("i", group) for group in groups]
+        self.advance = advance
+        self.win_points = win_points
+        self.loss_points = loss_points
+        days = max((matchday_count(len(group)) for group in self.groups if len(group) > 1),
+                   default=0)
+        self.round_names = [f"{prefix} {d}" for d in range(1, days + 1)]
+        self.round_lookup = {name: d for d, name in enumerate(self.round_names)}
+        self.total_matches = sum(len(group) * (len(group) - 1) // 2 for group in self.groups)
+        self.played = 0
+
+        # Where every team sits: group number and position within the group
+        self.group_of = array("i", [-1]) * team_count
+        self.slot_of = array("i", [-1]) * team_count
+        for g, group in enumerate(self.groups):
+            for slot, team in enumerate(group):
+                self.group_of[team] = g
+                self.slot_of[team] = slot
+        self.points = [array("i", [0]) * len(group) for group in self.groups]
+        self.wins = [array("i", [0]) * len(group) for group in self.groups]
+        self.losses = [array("i", [0]) * len(group) for group in self.groups]
+        self.beaten = [set() for _ in self.groups]   # (winner slot, loser slot)
+        self.fixtures = {}                           # round name -> [(team, team), ...]
+        self._tables = [None] * len(self.groups)     # cached standings order per group
+
+    def pairings(self, round_name):
+        # Team index pairs for one matchday across all groups
+        day = self.round_lookup[round_name]
+        pairs = []
+        for group in self.groups:
+            if day < matchday_count(len(group)) and len(group) > 1:
+                pairs.extend((group[i], group[j]) for i, j in matchday(len(group), day))
+        self.fixtures[round_name] = pairs
+        return pairs
+
+    def record(self, winner, loser):
+        g = self.group_of[winner]
+        w = self.slot_of[winner]
+        l = self.slot_of[loser]
+        self.points[g][w] += self.win_points
+        self.points[g][l] += self.loss_points
+        self.wins[g][w] += 1
+        self.losses[g][l] += 1
+        self.beaten[g].add((w, l))
+        self._tables[g] = None
+        self.played += 1
+
+    @property
+    def finished(self):
+        return self.played >= self.total_matches
+
+    def table(self, g):
+        # Slots of group g in standing order: points, then head-to-head wins
+        # among the teams level on points, then seed
+        if self._tables[g] is None:
+            points = self.points[g]
+            order = sorted(range(len(points)), key=lambda slot: (-points[slot], slot))
+            beaten = self.beaten[g]
+            start = 0
+            while start < len(order):
+                stop = start + 1
+                while stop < len(order) and points[order[stop]] == points[order[start]]:
+                    stop += 1
+                if stop - start > 1:
+                    tied = order[start:stop]
+                    order[start:stop] = sorted(
+                        tied, key=lambda slot: (-sum((slot, other) in beaten for other in tied), slot))
+                start = stop
+            self._tables[g] = order
+        return self._tables[g]
+
+    def standings(self, g):
+        # (team index, played, wins, losses, points) rows, best first
+        group = self.groups[g]
+        wins, losses, points = self.wins[g], self.losses[g], self.points[g]
+        return [(group[slot], wins[slot] + losses[slot], wins[slot], losses[slot], points[slot])
+                for slot in self.table(g)]
+
+    def qualifiers(self, advance=None):
+        # Knockout entrants in seed order: every group winner (best record
+        # first), then every runner-up, and so on
+        advance = self.advance if advance is None else advance
+        entrants = []
+        for place in range(advance):
+            finishers = []
+            for g, group in enumerate(self.groups):
+                order = self.table(g)
+                if place < len(order):
+                    slot = order[place]
+                    finishers.append((-self.points[g][slot], group[slot]))
+            finishers.sort()
+            entrants.extend(team for _, team in finishers)
+        return entrants
@@ -0,0 +1,139 @@
+from array import array
+from itertools import chain
+
+# Splits team indices into K groups. Teams are put in seed order once
+# (loaded teams already are, so usually not even that sort is needed) and
+# every seeding below is a single pass over that order:
+#   pots    consecutive blocks of seeds, N / K per group (the first N % K
+#           groups get one more); with K = 2 this is the classic top half /
+#           bottom half split
+#   snake   1..K, K..1, 1..K, ... so every group gets the same strength;
+#           done with strided array slices, no Python loop per team
+#   random  each tier of K seeds is drawn into the K groups at random
+# An org_of(team index) key keeps teams of the same organization apart:
+# snake and random place each tier of K seeds in K different groups, so the
+# tier is seated around the groups that already have a team's organization,
+# moving other seeds of the tier off their drawn group only when needed. An
+# organization only repeats within a group once every group has it, or when
+# no seating of the tier can avoid it.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+SEEDINGS = ("pots", "snake", "random")
+
+# ---------------------------- HELPERS ---------------------------- #
+def rank_order(team_count, ranks=None):
+    # Team indices, best rank first. ranks=None means the teams are already in
+    # seed order (Scheduler.teams always is), which needs no work at all.
+    if ranks is None or all(a <= b for a, b in zip(ranks, ranks[1:])):
+        return range(team_count)
+    return array("i", sorted(range(team_count), key=ranks.__getitem__))
+
+def tier_targets(group_count, tier, rng=None):
+    # Group of each seed within tier number `tier`
+    targets = list(range(group_count))
+    if rng is not None:
+        rng.shuffle(targets)
+    elif tier % 2:
+        targets.reverse()
+    return targets
+
+# ---------------------------- SEEDINGS ---------------------------- #
+def pots(order, group_count):
+    per, extra = divmod(len(order), group_count)
+    # Slices of a range stay ranges, so the default split copies nothing
+    return [order[g * per + min(g, extra):(g + 1) * per + min(g + 1, extra)]
+            for g in range(group_count)]
+
+def snake(order, group_count):
+    # Group g takes seeds g, 2K-1-g, 2K+g, 4K-1-g, ...: two strided slices
+    # interleaved
+    step = 2 * group_count
+    result = []
+    for g in range(group_count):
+        forward = array("i", order[g::step])
+        backward = array("i", order[step - 1 - g::step])
+        merged = array("i", [0]) * (len(forward) + len(backward))
+        merged[0::2] = forward
+        merged[1::2] = backward
+        result.append(merged)
+    return result
+
+def seat_tier(targets, banned):
+    # Group of each seed of one tier: seed i gets targets[i] unless banned[i]
+    # holds it, else the seeds already seated are moved along an augmenting
+    # path (as in bipartite matching) to free an allowed group. Seeds no
+    # path can seat get the groups left over.
+    seat = [None] * len(banned)
+    holder = {}                 # group -> seed seated in it
+    for i in range(len(banned)):
+        moved_by = {}           # group -> seed that would move into it
+        frontier, free = [i], None
+        while frontier and free is None:
+            reached = []
+            for s in frontier:
+                for g in chain((targets[s],), targets):
+                    if g in moved_by or g in banned[s]:
+                        continue
+                    moved_by[g] = s
+                    if g not in holder:
+                        free = g
+                        break
+                    reached.append(holder[g])
+                if free is not None:
+                    break
+            frontier = reached
+        g = free
+        while g is not None:
+            s = moved_by[g]
+            seat[s], g = g, seat[s]
+            holder[seat[s]] = s
+    left = (g for g in targets if g not in holder)
+    return [g if g is not None else next(left) for g in seat]
+
+def tiered(order, group_count, rng=None, org_of=None):
+    # Snake (rng None) or random draw, one tier of K seeds at a time. With
+    # org_of, taken[org] holds the groups that already got that organization
+    # at its current level and each tier is seated around them (seat_tier).
+    # Once every group has the organization the level goes up and the set
+    # starts over.
+    result = [array("i") for _ in range(group_count)]
+    taken = {}
+    for tier, start in enumerate(range(0, len(order), group_count)):
+        targets = tier_targets(group_count, tier, rng)
+        seeds = order[start:start + group_count]
+        if org_of is None:
+            for team, g in zip(seeds, targets):
+                result[g].append(team)
+            continue
+        orgs = [org_of(team) for team in seeds]
+        seats = seat_tier(targets, [taken.get(org, ()) for org in orgs])
+        for team, org, g in zip(seeds, orgs, seats):
+            groups = taken.get(org)
+            if groups is None:
+                groups = taken[org] = set()
+            groups.add(g)
+            if len(groups) == group_count:
+                groups.clear()
+            result[g].append(team)
+    return result
+
+def divide(team_count, group_count=2, seeding="pots", rng=None, org_of=None, ranks=None):
+    # Returns group_count sequences of team indices, each in seed order. Without
+    # ranks the indices 0..team_count-1 are taken to be in seed order already.
+    if group_count < 1:
+        raise ValueError("need at least one group")
+    if group_count > max(team_count, 1):
+        raise ValueError(f"{group_count} groups need at least {group_count} teams, "
+                         f"got {team_count}")
+    if seeding not in SEEDINGS:
+        raise ValueError(f"unknown seeding {seeding!r}, expected one of {', '.join(SEEDINGS)}")
+    order = rank_order(team_count, ranks)
+    if seeding == "pots":
+        if org_of is not None:
+            raise ValueError("organization separation needs snake or random seeding")
+        return pots(order, group_count)
+    if seeding == "snake" and org_of is None:
+        return snake(order, group_count)
+    if seeding == "random" and rng is None:
+        raise ValueError("random seeding needs an rng")
+    return tiered(order, group_count, rng if seeding == "random" else None, org_of)
@@ -0,0 +1,1437 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, font, filedialog
+from PIL import ImageTk, Image
+import os
+import queue
+import sqlite3
+import bracket_view
+import database
+import formatting
+import profiling
+import watch
+from scheduler import Scheduler
+from tasks import POLL_MS, TaskRunner
+
+# ---------------------------- CONSTANTS ---------------------------- #
+class ColorPalette:
+    PRIMARY = "#1a1a2e"      # Dark navy blue
+    SECONDARY = "#16213e"    # Slightly lighter navy
+    ACCENT = "#0f3460"       # Dark blue accent
+    HIGHLIGHT = "#e94560"    # Coral pink for highlights
+    TEXT = "#f1f1f1"         # Off-white text
+    SUCCESS = "#4CAF50"      # Green for success messages
+    WARNING = "#FF9800"      # Orange for warnings
+    ERROR = "#F44336"        # Red for errors
+
+class Fonts:
+    TITLE = ("SF Pro Display", 24, "bold")
+    SUBTITLE = ("SF Pro Display", 18)
+    BODY = ("SF Pro Text", 12)
+    BUTTON = ("SF Pro Text", 12, "bold")
+    CODE = ("Fira Code", 11)
+
+# ---------------------------- GUI CLASSES ---------------------------- #
+class CustomButton(ttk.Button):
+    # The style itself is set up once, in ModernTournamentGUI.configure_styles
+    def __init__(self, parent, *args, **kwargs):
+        kwargs.setdefault("style", 'CustomButton.TButton')
+        super().__init__(parent, *args, **kwargs)
+        
+class VirtualTreeview(ttk.Frame):
+    # A Treeview that only ever holds the rows that fit on screen plus a small
+    # overscan. Scrolling moves a window over self.items and rewrites the
+    # values of that fixed pool of rows, so 100k teams cost the same as 20.
+    OVERSCAN = 5
+    
+    def __init__(self, parent, columns, row_values, **tree_options):
+        super().__init__(parent, style='Custom.TFrame')
+        self.row_values = row_values   # item -> tuple of column values
+        self.items = []
+        self.offset = 0
+        self.visible = int(tree_options.get("height", 10))
+        self.rendered = {}             # pool iid -> values currently shown
+        
+        self.tree = ttk.Treeview(self,
+                                 columns=columns,
+                                 show="headings",
+                                 **tree_options)
+        self.scrollbar = ttk.Scrollbar(self,
+                                       orient="vertical",
+                                       command=self.yview,
+                                       style='Custom.Vertical.TScrollbar')
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.yview("scroll", -3, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.yview("scroll", 3, "units"))
+        
+    def heading(self, column, **kwargs):
+        self.tree.heading(column, **kwargs)
+        
+    def column(self, column, **kwargs):
+        self.tree.column(column, **kwargs)
+        
+    def set_items(self, items):
+        # Reloads only touch pool rows whose values actually changed
+        self.items = items
+        self.offset = min(self.offset, max(0, len(items) - self.visible))
+        self.render()
+        
+    def render(self):
+        size = max(0, min(self.visible + self.OVERSCAN, len(self.items) - self.offset))
+        for slot in range(size):
+            iid = f"row{slot}"
+            values = self.row_values(self.items[self.offset + slot])
+            shown = self.rendered.get(iid)
+            if shown is None:
+                self.tree.insert("", "end", iid=iid, values=values)
+            elif shown != values:
+                self.tree.item(iid, values=values)
+            self.rendered[iid] = values
+        for slot in range(size, len(self.rendered)):
+            iid = f"row{slot}"
+            self.tree.delete(iid)
+            del self.rendered[iid]
+        self.update_scrollbar()
+        
+    def update_scrollbar(self):
+        total = len(self.items)
+        if total <= self.visible:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.visible) / total)
+            
+    def scroll_to(self, offset):
+        offset = max(0, min(int(offset), len(self.items) - self.visible))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+            
+    def yview(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            step = self.visible if args[2] == "pages" else 1
+            self.scroll_to(self.offset + int(args[1]) * step)
+            
+    def on_mousewheel(self, event):
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+        return "break"
+        
+    def on_resize(self, event):
+        rowheight = int(ttk.Style().lookup('Custom.Treeview', 'rowheight') or 24)
+        visible = max(1, (event.height - rowheight) // rowheight)
+        if visible != self.visible:
+            self.visible = visible
+            self.offset = max(0, min(self.offset, len(self.items) - self.visible))
+            self.render()
+            
+class SectionedText:
+    # Fills a Text widget with titled sections whose bodies are built lazily.
+    # Each page of a section is one string and one Text.insert call; large
+    # sections end with a "load more" link, and collapsible sections only
+    # render their body once their header is clicked.
+    PAGE_SIZE = 500
+    
+    def __init__(self, text):
+        self.text = text
+        self.sections = []
+        self.text.tag_configure("header", font=Fonts.BUTTON, foreground=ColorPalette.HIGHLIGHT)
+        self.text.tag_configure("link", foreground=ColorPalette.WARNING, underline=True)
+        
+    def show(self, sections, intro="", collapsible=True, expanded=()):
+        # sections: (title, item count, page(start, stop) -> str) triples
+        self.text.config(state="normal")
+        self.text.delete("1.0", "end")
+        for i in range(len(self.sections)):
+            self.text.tag_delete(f"h{i}", f"b{i}", f"m{i}")
+        self.sections = [{"title": title, "count": count, "page": page, "shown": 0, "open": False}
+                         for title, count, page in sections]
+        self.collapsible = collapsible
+        
+        # All headers go in with a single insert call
+        args = [intro, ()] if intro else []
+        for i, section in enumerate(self.sections):
+            args += [self.header_line(section, False), ("header", f"h{i}"), "\n", ()]
+        if args:
+            self.text.insert("end", *args)
+        for i in range(len(self.sections)):
+            if collapsible:
+                self.text.tag_bind(f"h{i}", "<Button-1>", lambda e, i=i: self.toggle(i))
+            self.text.tag_bind(f"m{i}", "<Button-1>", lambda e, i=i: self.more(i))
+        for i in expanded:
+            self.expand(i)
+        self.text.config(state="disabled")
+        
+    def header_line(self, section, is_open):
+        if not self.collapsible:
+            return f"{section['title']}\n"
+        arrow = "▼" if is_open else "▶"
+        return f"{arrow} {section['title']} ({section['count']} matches)\n"
+        
+    def toggle(self, i):
+        if self.sections[i]["open"]:
+            self.collapse(i)
+        else:
+            self.expand(i)
+        return "break"
+        
+    def set_header(self, i, is_open):
+        self.text.config(state="normal")
+        start = self.text.index(f"h{i}.first")
+        self.text.delete(start, f"h{i}.last")
+        self.text.insert(start, self.header_line(self.sections[i], is_open), ("header", f"h{i}"))
+        
+    def expand(self, i):
+        self.sections[i]["open"] = True
+        if self.collapsible:
+            self.set_header(i, True)
+        self.append_page(i, f"h{i}.last")
+        
+    def more(self, i):
+        self.append_page(i, f"m{i}.first")
+        return "break"
+        
+    def append_page(self, i, index):
+        section = self.sections[i]
+        start = section["shown"]
+        stop = min(start + self.PAGE_SIZE, section["count"])
+        self.text.config(state="normal")
+        index = self.text.index(index)
+        if self.text.tag_ranges(f"m{i}"):
+            self.text.delete(f"m{i}.first", f"m{i}.last")
+        args = [section["page"](start, stop), (f"b{i}",)]
+        if stop < section["count"]:
+            args += [f"… {section['count'] - stop} more (click to load)\n", (f"m{i}", "link")]
+        self.text.insert(index, *args)
+        section["shown"] = stop
+        self.text.config(state="disabled")
+        
+    def replace_item(self, i, item, text, lines=1):
+        # Rewrites one already shown item of section i in place (every item
+        # of the section takes `lines` lines), e.g. a match that just got a result
+        section = self.sections[i]
+        if not section["open"] or item >= section["shown"] or not self.text.tag_ranges(f"b{i}"):
+            return
+        self.text.config(state="normal")
+        start = self.text.index(f"b{i}.first + {item * lines} lines")
+        self.text.delete(start, f"{start} + {lines} lines")
+        self.text.insert(start, text, (f"b{i}",))
+        self.text.config(state="disabled")
+        
+    def collapse(self, i):
+        self.text.config(state="normal")
+        for tag in (f"b{i}", f"m{i}"):
+            if self.text.tag_ranges(tag):
+                self.text.delete(f"{tag}.first", f"{tag}.last")
+        self.sections[i]["shown"] = 0
+        self.sections[i]["open"] = False
+        self.set_header(i, False)
+        self.text.config(state="disabled")
+        
+class Screen:
+    # One screen's widgets, built once. refresh() redraws what depends on the
+    # tournament and runs only when the screen's version changed; activate()
+    # runs every time the screen is shown. Builders keep the widgets later
+    # methods need as attributes.
+    def __init__(self, frame):
+        self.frame = frame
+        self.version = None
+        self.refresh = None
+        self.activate = None
+        
+class ScreenManager:
+    # Keeps every screen built so far, packed one at a time. Going back to a
+    # screen just packs its frame again; it is redrawn only when the version
+    # passed in (scheduler revisions, see Scheduler.revision) moved on.
+    def __init__(self, parent):
+        self.parent = parent
+        self.screens = {}
+        self.current = None
+        
+    def show(self, key, build, version=None):
+        screen = self.screens.get(key)
+        if screen is None:
+            screen = self.screens[key] = Screen(ttk.Frame(self.parent, style='Custom.TFrame'))
+            build(screen)
+        if self.current is not screen:
+            if self.current is not None:
+                self.current.frame.pack_forget()
+            screen.frame.pack(fill="both", expand=True)
+            self.current = screen
+        if screen.refresh is not None and screen.version != version:
+            screen.version = version
+            screen.refresh()
+        if screen.activate is not None:
+            screen.activate()
+        return screen
+        
+    def get(self, key):
+        return self.screens.get(key)
+        
+    def is_shown(self, key):
+        return self.current is not None and self.screens.get(key) is self.current
+        
+    def drop(self, keep):
+        # Destroys the screens keep(key) turns down, e.g. rounds of an old bracket
+        for key in [key for key in self.screens if not keep(key)]:
+            screen = self.screens.pop(key)
+            if screen is self.current:
+                self.current = None
+            screen.frame.destroy()
+            
+class ModernTournamentGUI:
+    SEARCH_DELAY_MS = 150   # Filter after typing pauses, not on every key
+    SEARCH_TEAMS = 50       # Teams listed in a filtered summary
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Cybersecurity Hackathon Scheduler")
+        self.root.geometry("1200x800")
+        self.root.minsize(1000, 700)
+        self.root.configure(bg=ColorPalette.PRIMARY)
+        
+        # Configure styles
+        self.configure_styles()
+        
+        # Initialize scheduler
+        self.scheduler = Scheduler()
+        
+        # Every tournament is kept in a local SQLite database (database.py),
+        # written from the worker threads as rounds are played
+        try:
+            self.store = database.TournamentStore(database.DATABASE)
+        except (sqlite3.Error, OSError, ValueError):
+            self.store = None
+        
+        # Group division settings (see grouping.py)
+        self.group_count = tk.IntVar(value=2)
+        self.group_seeding = tk.StringVar(value="pots")
+        self.group_stage_advance = tk.IntVar(value=0)   # 0 = straight to the bracket
+        self.double_elimination = tk.BooleanVar(value=False)
+        self.divided = None     # (scheduler, teams revision) the groups were divided for
+        
+        # Background work (loading, rounds, simulation) runs off the Tk thread
+        self.tasks = TaskRunner(self.root)
+        self.current_task = None
+        
+        # Live results from judges (scoring.py), applied on the scoring thread
+        # and pushed here as (changed matches, newly scheduled rounds)
+        self.scoring = None
+        self.live_updates = queue.Queue()
+        self.live_poll = None
+        self.current_round = None
+        
+        # Late registrations: teams.txt changes applied as they are saved (watch.py)
+        self.watcher = None
+        self.watch_poll = None
+        self.bracket_window = None
+        self.bracket_view = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Load custom fonts
+        self.load_fonts()
+        
+        # Status bar stays put while screens change above it; screens are
+        # built once and swapped in and out (ScreenManager)
+        self.build_status_bar()
+        self.screens = ScreenManager(self.root)
+        
+        # Show loading screen first
+        self.show_splash_screen()
+        
+    def configure_styles(self):
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        # Frame style
+        self.style.configure('Custom.TFrame', background=ColorPalette.PRIMARY)
+        
+        # Label styles
+        self.style.configure('Title.TLabel',
+                            font=Fonts.TITLE,
+                            foreground=ColorPalette.TEXT,
+                            background=ColorPalette.PRIMARY)
+                            
+        self.style.configure('Subtitle.TLabel',
+                            font=Fonts.SUBTITLE,
+                            foreground=ColorPalette.HIGHLIGHT,
+                            background=ColorPalette.PRIMARY)
+                            
+        # Entry style
+        self.style.configure('Custom.TEntry',
+                            font=Fonts.BODY,
+                            foreground=ColorPalette.TEXT,
+                            fieldbackground=ColorPalette.SECONDARY,
+                            bordercolor=ColorPalette.ACCENT,
+                            lightcolor=ColorPalette.ACCENT,
+                            darkcolor=ColorPalette.ACCENT)
+        
+        # Treeview style
+        self.style.configure('Custom.Treeview',
+                            font=Fonts.BODY,
+                            rowheight=24,
+                            foreground=ColorPalette.TEXT,
+                            background=ColorPalette.SECONDARY,
+                            fieldbackground=ColorPalette.SECONDARY,
+                            bordercolor=ColorPalette.ACCENT,
+                            lightcolor=ColorPalette.ACCENT)
+                            
+        self.style.map('Custom.Treeview',
+                      background=[('selected', ColorPalette.ACCENT)])
+                      
+        # Checkbutton style
+        self.style.configure('Custom.TCheckbutton',
+                            font=Fonts.BODY,
+                            foreground=ColorPalette.TEXT,
+                            background=ColorPalette.PRIMARY)
+        self.style.map('Custom.TCheckbutton',
+                      background=[('active', ColorPalette.PRIMARY)])
+                      
+        # Status bar styles
+        self.style.configure('Status.TLabel',
+                            font=Fonts.BODY,
+                            foreground=ColorPalette.TEXT,
+                            background=ColorPalette.PRIMARY)
+        self.style.configure('Custom.Horizontal.TProgressbar',
+                            background=ColorPalette.HIGHLIGHT,
+                            troughcolor=ColorPalette.SECONDARY,
+                            bordercolor=ColorPalette.ACCENT)
+                            
+        # Scrollbar style
+        self.style.configure('Custom.Vertical.TScrollbar',
+                            background=ColorPalette.ACCENT)
+        
+        # Button style
+        self.style.configure('CustomButton.TButton',
+                            font=Fonts.BUTTON,
+                            foreground=ColorPalette.TEXT,
+                            background=ColorPalette.ACCENT,
+                            bordercolor=ColorPalette.ACCENT,
+                            focuscolor=self.style.configure('.')['background'],
+                            padding=10,
+                            relief="raised")
+        
+    def build_status_bar(self):
+        status_frame = ttk.Frame(self.root, style='Custom.TFrame')
+        status_frame.pack(side="bottom", fill="x", padx=20, pady=(0, 10))
+        
+        self.status_label = ttk.Label(status_frame, text="Ready", style='Status.TLabel')
+        self.status_label.pack(side="left")
+        
+        self.cancel_btn = CustomButton(status_frame,
+                                      text="CANCEL",
+                                      state="disabled",
+                                      command=self.cancel_task)
+        self.cancel_btn.pack(side="right")
+        
+        # Timing spans and counters (profiling.py), also on F12
+        CustomButton(status_frame,
+                     text="DEBUG",
+                     command=self.show_debug_panel).pack(side="right", padx=(10, 0))
+        self.root.bind("<F12>", lambda event: self.show_debug_panel())
+        self.debug_window = None
+        self.last_profile = None
+        
+        self.progress_bar = ttk.Progressbar(status_frame,
+                                            style='Custom.Horizontal.TProgressbar',
+                                            length=300,
+                                            mode="determinate")
+        self.progress_bar.pack(side="right", padx=10)
+        
+    def run_task(self, fn, *args, name, on_done, use_process=False):
+        # One long operation at a time; the status bar shows its progress
+        if self.current_task is not None:
+            messagebox.showwarning("Busy", f"Please wait for '{self.current_task.name}' to finish.")
+            return None
+            
+        def finished(result):
+            late = self.current_task is not None and self.current_task.cancelled
+            self.end_task(f"{name}: done" + (" (finished before it could stop)" if late else ""))
+            on_done(result)
+            self.refresh_debug_panel()
+            
+        def failed(error):
+            self.end_task(f"{name}: failed")
+            messagebox.showerror("Error", f"{name} failed:\n{error}")
+            
+        def cancelled():
+            self.end_task(f"{name}: cancelled")
+            
+        if profiling.enabled() and not use_process:
+            # Worker time shows up on the worker's own track in the trace
+            fn = profiling.traced(f"task: {name}")(fn)
+        self.current_task = self.tasks.submit(fn, *args,
+                                              name=name,
+                                              on_done=finished,
+                                              on_error=failed,
+                                              on_progress=self.show_progress,
+                                              on_cancelled=cancelled,
+                                              use_process=use_process)
+        self.status_label.config(text=f"{name}...")
+        self.cancel_btn.config(state="normal")
+        if use_process:
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.start(15)
+        else:
+            self.progress_bar.config(mode="determinate", value=0)
+        return self.current_task
+        
+    def show_progress(self, done, total, message):
+        if total:
+            self.progress_bar.config(mode="determinate", maximum=total, value=done)
+        if message:
+            self.status_label.config(text=f"{self.current_task.name}: {message}")
+            
+    def end_task(self, text):
+        self.current_task = None
+        self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate", value=0)
+        self.cancel_btn.config(state="disabled")
+        self.status_label.config(text=text)
+        
+    def cancel_task(self):
+        # The task stays current (so nothing else can touch the scheduler)
+        # until its worker has really stopped; TaskRunner then calls
+        # cancelled() or, if it was too late, finished()
+        if self.current_task is not None and not self.current_task.cancelled:
+            self.current_task.cancel()
+            self.cancel_btn.config(state="disabled")
+            self.status_label.config(text=f"{self.current_task.name}: cancelling...")
+            
+    def show_debug_panel(self):
+        # Breakdown of the spans and counters recorded so far, or of the last
+        # recording once it was switched off
+        if self.debug_window is not None and self.debug_window.winfo_exists():
+            self.debug_window.lift()
+            self.refresh_debug_panel()
+            return
+        window = self.debug_window = tk.Toplevel(self.root)
+        window.title("Profiling")
+        window.geometry("820x480")
+        window.configure(bg=ColorPalette.PRIMARY)
+        
+        controls = ttk.Frame(window, style='Custom.TFrame')
+        controls.pack(fill="x", padx=15, pady=10)
+        self.debug_recording = tk.BooleanVar(value=profiling.enabled())
+        self.debug_memory = tk.BooleanVar(value=profiling.enabled() and profiling.tracer().memory)
+        ttk.Checkbutton(controls, text="Record spans", variable=self.debug_recording,
+                        command=self.toggle_profiling,
+                        style='Custom.TCheckbutton').pack(side="left")
+        ttk.Checkbutton(controls, text="Track allocations (slow)", variable=self.debug_memory,
+                        command=self.toggle_profiling,
+                        style='Custom.TCheckbutton').pack(side="left", padx=15)
+        CustomButton(controls, text="EXPORT TRACE",
+                     command=self.export_trace).pack(side="right")
+        CustomButton(controls, text="CLEAR",
+                     command=self.clear_profile).pack(side="right", padx=10)
+        CustomButton(controls, text="REFRESH",
+                     command=self.refresh_debug_panel).pack(side="right")
+        
+        self.debug_text = tk.Text(window,
+                                  font=Fonts.CODE,
+                                  bg=ColorPalette.SECONDARY,
+                                  fg=ColorPalette.TEXT,
+                                  padx=10,
+                                  pady=10,
+                                  wrap="none")
+        self.debug_text.pack(fill="both", expand=True, padx=15, pady=(0, 15))
+        self.refresh_debug_panel()
+        
+    def toggle_profiling(self):
+        # Changing what is recorded starts a new recording
+        if self.debug_recording.get():
+            profiling.enable(memory=self.debug_memory.get())
+        else:
+            self.last_profile = profiling.disable() or self.last_profile
+        self.refresh_debug_panel()
+        
+    def clear_profile(self):
+        if profiling.enabled():
+            profiling.tracer().clear()
+        self.last_profile = None
+        self.refresh_debug_panel()
+        
+    def refresh_debug_panel(self):
+        if self.debug_window is None or not self.debug_window.winfo_exists():
+            return
+        tracer = profiling.tracer() or self.last_profile
+        if tracer is None:
+            text = "Nothing recorded. Tick 'Record spans', then load teams or play rounds.\n"
+        else:
+            state = "recording" if tracer is profiling.tracer() else "last recording"
+            text = (f"{state}: {len(tracer.spans)} spans\n\n"
+                    + profiling.breakdown_text(tracer.breakdown(), tracer.counters))
+        self.debug_text.config(state="normal")
+        self.debug_text.delete("1.0", "end")
+        self.debug_text.insert("1.0", text)
+        self.debug_text.config(state="disabled")
+        
+    def export_trace(self):
+        tracer = profiling.tracer() or self.last_profile
+        if tracer is None:
+            messagebox.showinfo("Profiling", "Nothing recorded yet.", parent=self.debug_window)
+            return
+        path = filedialog.asksaveasfilename(parent=self.debug_window,
+                                            title="Export Chrome trace",
+                                            defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            tracer.write_chrome_trace(path)
+            self.status_label.config(text=f"Trace written to {path}")
+            
+    def on_close(self):
+        if self.scoring is not None:
+            self.scoring.stop()
+        self.tasks.shutdown()
+        if self.store is not None:
+            if self.scheduler.store is not None:
+                self.scheduler.store.flush(self.scheduler)
+            self.store.close()
+        self.root.destroy()
+        
+    def build_search_box(self, parent, on_search, hint):
+        # Entry that calls on_search(query) once typing pauses
+        frame = ttk.Frame(parent, style='Custom.TFrame')
+        ttk.Label(frame, text=hint, style='Status.TLabel').pack(side="left", padx=(0, 10))
+        query = tk.StringVar()
+        entry = ttk.Entry(frame, textvariable=query, style='Custom.TEntry', font=Fonts.BODY)
+        entry.pack(side="left", fill="x", expand=True)
+        pending = []
+        
+        def changed(*args):
+            for after_id in pending:
+                self.root.after_cancel(after_id)
+            pending[:] = [self.root.after(self.SEARCH_DELAY_MS, lambda: on_search(query.get()))]
+            
+        query.trace_add("write", changed)
+        entry.bind("<Return>", lambda e: on_search(query.get()))
+        return frame, query
+        
+    def load_fonts(self):
+        # Try to load custom fonts (would need to be installed on system)
+        try:
+            custom_font = font.Font(family="SF Pro Display", size=12)
+        except:
+            pass
+        
+    def show_splash_screen(self):
+        self.screens.show("splash", self.build_splash_screen)
+        
+    def build_splash_screen(self, screen):
+        # Splash container
+        splash_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        splash_frame.place(relx=0.5, rely=0.5, anchor="center")
+        
+        # Title
+        ttk.Label(splash_frame, text="CYBERSECURITY\nHACKATHON SCHEDULER",
+                 style='Title.TLabel', justify="center").pack(pady=20)
+        
+        # Subtitle
+        ttk.Label(splash_frame, text="Advanced Tournament Management System",
+                 style='Subtitle.TLabel').pack(pady=10)
+        
+        # Load team button
+        load_btn = CustomButton(splash_frame,
+                               text="LOAD TEAMS",
+                               command=self.show_load_window)
+        load_btn.pack(pady=30, ipadx=20, ipady=10)
+        
+    @profiling.traced("show_load_window")
+    def show_load_window(self):
+        self.screens.show("load", self.build_load_window,
+                          (self.scheduler, self.scheduler.revision("teams")))
+        
+    def build_load_window(self, screen):
+        # Header frame
+        header_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        header_frame.pack(fill="x", padx=20, pady=20)
+        
+        # Back button
+        back_btn = CustomButton(header_frame,
+                               text="← BACK",
+                               command=self.show_splash_screen)
+        back_btn.pack(side="left")
+        
+        # Title
+        ttk.Label(header_frame, text="TEAM MANAGEMENT",
+                 style='Title.TLabel').pack(side="left", padx=20)
+                 
+        # Main content
+        content_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        content_frame.pack(fill="both", expand=True, padx=40, pady=20)
+        
+        # Left panel - team loading
+        left_panel = ttk.Frame(content_frame, style='Custom.TFrame')
+        left_panel.pack(side="left", fill="both", expand=True, padx=10)
+        
+        ttk.Label(left_panel, text="Load Team Data", style='Subtitle.TLabel').pack(pady=10)
+        
+        # Team info text
+        info_text = tk.Text(left_panel,
+                           font=Fonts.BODY,
+                           bg=ColorPalette.SECONDARY,
+                           fg=ColorPalette.TEXT,
+                           height=10,
+                           width=40,
+                           padx=10,
+                           pady=10,
+                           wrap="word")
+        info_text.pack(pady=10)
+        info_text.insert("1.0", "Teams will be loaded from 'teams.txt' in the format:\n\n")
+        info_text.insert("end", "Team Name;Member1,Member2;Rank\n")
+        info_text.insert("end", "Example:\n")
+        info_text.insert("end", "Team Alpha;Alice,Bob;1")
+        info_text.config(state="disabled")
+        
+        # Load button
+        load_btn = CustomButton(left_panel,
+                              text="LOAD TEAMS",
+                              command=self.load_teams)
+        load_btn.pack(pady=20)
+        
+        # Follow teams.txt from now on instead of loading it again
+        self.watch_btn = CustomButton(left_panel,
+                                     text="WATCH FILE",
+                                     command=self.toggle_watch)
+        self.watch_btn.pack()
+        
+        # Right panel - visualization
+        right_panel = ttk.Frame(content_frame, style='Custom.TFrame')
+        right_panel.pack(side="right", fill="both", expand=True, padx=10)
+        
+        ttk.Label(right_panel, text="Team Visualization", style='Subtitle.TLabel').pack(pady=10)
+        
+        # Search by name prefix, member or rank range, served by the registry indexes
+        search_frame, self.team_query = self.build_search_box(
+            right_panel, self.filter_teams, "Search (name, member or rank 100-200):")
+        search_frame.pack(fill="x", pady=(0, 10))
+        
+        # Team treeview (virtualized, only the visible rows exist)
+        self.team_tree = VirtualTreeview(right_panel,
+                                         columns=("Rank", "Name", "Members"),
+                                         row_values=lambda team: (team.rank,
+                                                                  team.name,
+                                                                  ", ".join(team.members)),
+                                         style='Custom.Treeview')
+        self.team_tree.heading("Rank", text="Rank")
+        self.team_tree.heading("Name", text="Team Name")
+        self.team_tree.heading("Members", text="Members")
+        
+        self.team_tree.column("Rank", width=50, anchor="center")
+        self.team_tree.column("Name", width=150)
+        self.team_tree.column("Members", width=200)
+        
+        self.team_tree.pack(fill="both", expand=True)
+        
+        # Next button (disabled until teams are loaded)
+        self.next_btn = CustomButton(content_frame,
+                                    text="DIVIDE GROUPS →",
+                                    state="disabled",
+                                    command=self.show_groups_window)
+        self.next_btn.pack(pady=20)
+        screen.refresh = self.refresh_load_window
+        
+    def refresh_load_window(self):
+        # New teams: the list again, keeping any filter that was typed
+        self.filter_teams(self.team_query.get())
+        self.next_btn.config(state="normal" if len(self.scheduler.teams) else "disabled")
+        
+    def load_teams(self):
+        def work(task):
+            loaded = self.scheduler.load_teams(
+                "teams.txt",
+                progress=lambda report: task.progress(report.bytes_read,
+                                                      report.total_bytes,
+                                                      f"{report.rows:,} teams parsed"))
+            if self.store is not None and self.scheduler.store is None:
+                # Later loads start a new stored tournament by themselves
+                task.progress(0, None, "saving teams to the database")
+                self.scheduler.attach_store(self.store)
+            return loaded
+                                                      
+        self.run_task(work, name="Loading teams", on_done=self.on_teams_loaded)
+        
+    def on_teams_loaded(self, success):
+        if not success:
+            return
+        if self.watcher is not None:
+            self.watcher.baseline()
+        # The user may have left the screen while the file was loading; it
+        # is redrawn when they come back
+        if self.screens.is_shown("load"):
+            self.show_load_window()
+            
+        report = self.scheduler.load_report
+        if report.malformed:
+            details = "\n".join(f"Line {line_no}: {message}"
+                                for line_no, message in report.errors[:10])
+            messagebox.showwarning("Loaded with errors",
+                                   f"Loaded {report.rows} teams, skipped "
+                                   f"{report.malformed} malformed rows:\n\n{details}")
+        else:
+            messagebox.showinfo("Success", "Teams loaded successfully!")
+            
+    def toggle_watch(self):
+        if self.watcher is not None:
+            self.root.after_cancel(self.watch_poll)
+            self.watcher = None
+            self.watch_btn.config(text="WATCH FILE")
+            self.status_label.config(text="Stopped watching teams.txt")
+            return
+        self.watcher = watch.TeamsWatcher(self.scheduler, "teams.txt")
+        self.watch_btn.config(text="STOP WATCHING")
+        self.status_label.config(text="Watching teams.txt for changes")
+        self.watch_poll = self.root.after(int(watch.POLL_SECONDS * 1000), self.poll_teams_file)
+        
+    def poll_teams_file(self):
+        # Not while a task may be changing the scheduler; live scoring
+        # writes under its lock, so the change is applied under it too
+        if self.current_task is None:
+            before = self.scheduler.revision("teams")
+            if self.scoring is not None:
+                with self.scoring.lock:
+                    changes = self.watcher.poll()
+            else:
+                changes = self.watcher.poll()
+            if changes is not None:
+                self.on_teams_changed(changes, before)
+        self.watch_poll = self.root.after(int(watch.POLL_SECONDS * 1000), self.poll_teams_file)
+        
+    def on_teams_changed(self, changes, before):
+        self.status_label.config(text=str(changes))
+        if not changes:
+            return
+        # The groups took the change in place; they don't need dividing again
+        if self.divided == (self.scheduler, before):
+            self.divided = (self.scheduler, self.scheduler.revision("teams"))
+        round_name = self.current_round
+        if self.screens.is_shown("load"):
+            self.show_load_window()
+        elif self.screens.is_shown("groups"):
+            self.show_groups_window()
+        elif self.screens.is_shown(("round", round_name)) and round_name not in self.scheduler.rounds:
+            # The draw was made for the old teams and is gone
+            self.show_groups_window()
+            
+    def filter_teams(self, query):
+        self.team_tree.offset = 0
+        self.team_tree.set_items(self.scheduler.registry.search(query))
+        
+    @profiling.traced("show_groups_window")
+    def show_groups_window(self):
+        # Groups are divided again only for new teams (or by DIVIDE), so
+        # coming back from a round keeps the groups the bracket was drawn from
+        if self.divided != (self.scheduler, self.scheduler.revision("teams")):
+            self.divide_groups()
+        self.screens.show("groups", self.build_groups_window,
+                          (self.scheduler, self.scheduler.revision("groups")))
+        
+    def divide_groups(self):
+        teams = len(self.scheduler.teams)
+        if not teams:
+            return
+        try:
+            self.scheduler.divide_groups(max(1, self.group_count.get()), self.group_seeding.get())
+        except (tk.TclError, ValueError):
+            self.group_count.set(min(2, teams))
+            self.scheduler.divide_groups(min(2, teams), self.group_seeding.get())
+        self.divided = (self.scheduler, self.scheduler.revision("teams"))
+        
+    def redivide_groups(self):
+        self.divide_groups()
+        self.show_groups_window()
+        
+    def build_groups_window(self, screen):
+        # Header frame
+        header_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        header_frame.pack(fill="x", padx=20, pady=20)
+        
+        # Back button
+        back_btn = CustomButton(header_frame,
+                               text="← BACK",
+                               command=self.show_load_window)
+        back_btn.pack(side="left")
+        
+        # Title
+        ttk.Label(header_frame, text="TEAM GROUPS",
+                 style='Title.TLabel').pack(side="left", padx=20)
+                 
+        # Main content
+        content_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        content_frame.pack(fill="both", expand=True, padx=40, pady=20)
+        
+        # Division settings; changing them re-divides and redraws this screen
+        settings_frame = ttk.Frame(content_frame, style='Custom.TFrame')
+        settings_frame.pack(side="top", fill="x", pady=(0, 10))
+        ttk.Label(settings_frame, text="Groups:", style='Status.TLabel').pack(side="left")
+        ttk.Spinbox(settings_frame, from_=1, to=4096, width=6,
+                    textvariable=self.group_count).pack(side="left", padx=(5, 20))
+        ttk.Label(settings_frame, text="Seeding:", style='Status.TLabel').pack(side="left")
+        ttk.Combobox(settings_frame, values=("pots", "snake", "random"), state="readonly",
+                     width=8, textvariable=self.group_seeding).pack(side="left", padx=(5, 20))
+        CustomButton(settings_frame, text="DIVIDE",
+                     command=self.redivide_groups).pack(side="left")
+        
+        # Group A and Group B panes. Two pots groups get a fixed title,
+        # any other division a selector for which of the K groups to show.
+        screen.panes = []
+        for side in ("left", "right"):
+            group_frame = ttk.Frame(content_frame, style='Custom.TFrame')
+            group_frame.pack(side=side, fill="both", expand=True, padx=10)
+            
+            title = ttk.Label(group_frame, style='Subtitle.TLabel')
+            
+            group_tree = VirtualTreeview(group_frame,
+                                         columns=("Rank", "Name"),
+                                         row_values=lambda team: (team.rank, team.name),
+                                         style='Custom.Treeview')
+            group_tree.heading("Rank", text="Rank")
+            group_tree.heading("Name", text="Team Name")
+            group_tree.pack(fill="both", expand=True)
+            screen.panes.append((title, self.group_selector(group_frame, group_tree), group_tree))
+        
+        # Bracket format
+        ttk.Checkbutton(content_frame,
+                        text="Double elimination",
+                        variable=self.double_elimination,
+                        style='Custom.TCheckbutton').pack(pady=(20, 0), anchor="center")
+        
+        # Optional round robin in every group before the bracket
+        stage_frame = ttk.Frame(content_frame, style='Custom.TFrame')
+        stage_frame.pack(pady=(10, 0), anchor="center")
+        ttk.Label(stage_frame, text="Group stage, top N advance (0 = off):",
+                  style='Status.TLabel').pack(side="left")
+        ttk.Spinbox(stage_frame, from_=0, to=64, width=4,
+                    textvariable=self.group_stage_advance).pack(side="left", padx=5)
+        
+        # Next button
+        next_btn = CustomButton(content_frame,
+                               text="START TOURNAMENT →",
+                               command=self.start_tournament)
+        next_btn.pack(pady=20, anchor="center")
+        
+        # Monte Carlo odds
+        simulate_btn = CustomButton(content_frame,
+                                   text="SIMULATE ODDS",
+                                   command=self.simulate_odds)
+        simulate_btn.pack(anchor="center")
+        screen.refresh = lambda: self.refresh_groups_window(screen)
+        
+    def refresh_groups_window(self, screen):
+        groups = self.scheduler.groups
+        classic = len(groups) == 2 and self.group_seeding.get() == "pots"
+        titles = (f"GROUP A (Top {len(self.scheduler.group_A)})",
+                  f"GROUP B (Bottom {len(self.scheduler.group_B)})")
+        names = [f"Group {g} ({len(group)} teams)" for g, group in enumerate(groups, 1)]
+        for pane, (title, selector, tree) in enumerate(screen.panes):
+            shown = min(pane, len(groups) - 1)
+            tree.offset = 0
+            if classic:
+                selector.pack_forget()
+                title.config(text=titles[pane])
+                title.pack(pady=10, before=tree)
+            else:
+                title.pack_forget()
+                selector.config(values=names)
+                if groups:
+                    selector.current(shown)
+                selector.pack(pady=10, before=tree)
+            tree.set_items(groups[shown] if groups else [])
+            
+    def group_selector(self, parent, tree):
+        # Picks which of the K groups a pane shows; packed above its tree
+        selector = ttk.Combobox(parent, state="readonly", font=Fonts.SUBTITLE)
+        
+        def selected(event):
+            tree.offset = 0
+            tree.set_items(self.scheduler.groups[selector.current()])
+            
+        selector.bind("<<ComboboxSelected>>", selected)
+        return selector
+        
+    def simulate_odds(self, runs=100000):
+        try:
+            import simulation
+        except ImportError as e:
+            messagebox.showerror("Error", f"Simulation needs NumPy:\n{e}")
+            return
+        ranks = [team.rank for team in self.scheduler.teams]
+        self.run_task(simulation.simulate, ranks, runs, simulation.RankLogistic(),
+                      name=f"Simulating {runs:,} tournaments",
+                      on_done=self.show_odds_window,
+                      use_process=True)
+                      
+    def show_odds_window(self, result):
+        window = tk.Toplevel(self.root)
+        window.title("Tournament Odds")
+        window.configure(bg=ColorPalette.PRIMARY)
+        
+        odds_text = tk.Text(window,
+                           font=Fonts.CODE,
+                           bg=ColorPalette.SECONDARY,
+                           fg=ColorPalette.TEXT,
+                           height=25,
+                           width=110,
+                           padx=15,
+                           pady=15,
+                           wrap="none")
+        odds_text.pack(fill="both", expand=True, padx=20, pady=20)
+        odds_text.insert("1.0", f"Chance of reaching each round ({result.runs:,} simulated tournaments)\n\n")
+        odds_text.insert("end", result.table(self.scheduler.teams, limit=50))
+        odds_text.config(state="disabled")
+        
+    def start_tournament(self):
+        try:
+            advance = max(0, self.group_stage_advance.get())
+        except tk.TclError:
+            advance = 0
+        if advance:
+            self.scheduler.start_group_stage(advance=advance)
+        else:
+            self.scheduler.build_bracket(self.double_elimination.get(), random_draw=True)
+        self.show_round_window(self.scheduler.round_names[0])
+        
+    def toggle_live_scoring(self, round_name):
+        screen = self.round_screen(round_name)
+        if self.scoring is not None:
+            self.scoring.stop()
+            self.scoring = None
+            self.root.after_cancel(self.live_poll)
+            screen.live_btn.config(text="LIVE SCORING")
+            self.status_label.config(text="Live scoring stopped")
+            return
+        import scoring
+        knockout = (self.double_elimination.get(), True) if self.scheduler.group_stage else None
+        service = scoring.ScoreService(self.scheduler, knockout=knockout)
+        service.listeners.append(lambda changed, scheduled:
+                                 self.live_updates.put((changed, scheduled)))
+        try:
+            host, port = service.start_in_thread()
+        except (OSError, scoring.ScoreError) as e:
+            messagebox.showerror("Error", f"Could not start live scoring:\n{e}")
+            return
+        self.scoring = service
+        screen.live_btn.config(text="STOP LIVE SCORING")
+        self.status_label.config(text=f"Live scoring on {host}:{port}")
+        if round_name in self.scheduler.round_pairings:
+            self.show_results(round_name)
+        self.live_poll = self.root.after(POLL_MS, self.drain_live_updates)
+        
+    def drain_live_updates(self):
+        changed = []
+        try:
+            while True:
+                changed.extend(self.live_updates.get_nowait()[0])
+        except queue.Empty:
+            pass
+        # Only the round on screen is redrawn now; any other round screen
+        # sees its revision moved on and redraws when it is shown next
+        round_name = self.current_round
+        mine = [i for name, i in changed if name == round_name]
+        if mine and self.screens.is_shown(("round", round_name)):
+            screen = self.round_screen(round_name)
+            matches = self.scheduler.rounds[round_name]
+            if not screen.showing_results:
+                self.show_results(round_name)
+            else:
+                # Only the lines of matches that got a result are rewritten
+                for i in mine:
+                    screen.match_sections.replace_item(0, i, formatting.results_text(matches, i, i + 1),
+                                                       lines=3)
+                screen.version = self.round_version(round_name)
+                self.enable_next(round_name)
+        if changed:
+            self.refresh_bracket()
+        if changed:
+            self.status_label.config(text=f"Live scoring on {self.scoring.host}:{self.scoring.port}: "
+                                          f"{self.scoring.applied} results")
+        self.live_poll = self.root.after(POLL_MS, self.drain_live_updates)
+        
+    def start_knockout(self, last_group_round):
+        if self.scheduler.bracket is None:
+            self.scheduler.start_knockout(self.double_elimination.get(), random_draw=True)
+        self.show_round_window(self.get_next_round(last_group_round))
+        
+    def round_screen(self, round_name):
+        return self.screens.get(("round", round_name))
+        
+    def round_version(self, round_name):
+        # A round screen shows the round's matches within the current bracket
+        return (self.scheduler, self.scheduler.revision("bracket", round_name))
+        
+    @profiling.traced("show_round_window", "round_name")
+    def show_round_window(self, round_name):
+        # Rounds of an earlier bracket (or tournament) are gone for good
+        rounds = self.scheduler.rounds
+        self.screens.drop(lambda key: not isinstance(key, tuple) or key[1] in rounds)
+        self.current_round = round_name
+        self.screens.show(("round", round_name),
+                          lambda screen: self.build_round_window(screen, round_name),
+                          self.round_version(round_name))
+        
+    def build_round_window(self, screen, round_name):
+        screen.showing_results = False
+        
+        # Header frame
+        header_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        header_frame.pack(fill="x", padx=20, pady=20)
+        
+        # Back button
+        back_btn = CustomButton(header_frame,
+                               text="← BACK",
+                               command=self.show_groups_window)
+        back_btn.pack(side="left")
+        
+        # Title
+        ttk.Label(header_frame, text=round_name.upper(),
+                 style='Title.TLabel').pack(side="left", padx=20)
+                 
+        # Main content
+        content_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        content_frame.pack(fill="both", expand=True, padx=40, pady=20)
+        
+        # Match frame
+        match_frame = ttk.Frame(content_frame, style='Custom.TFrame')
+        match_frame.pack(fill="both", expand=True, pady=20)
+        
+        # Text widget for match display
+        screen.match_text = tk.Text(match_frame,
+                                  font=Fonts.CODE,
+                                  bg=ColorPalette.SECONDARY,
+                                  fg=ColorPalette.TEXT,
+                                  height=15,
+                                  width=80,
+                                  padx=15,
+                                  pady=15,
+                                  wrap="word")
+        
+        scrollbar = ttk.Scrollbar(match_frame,
+                                 command=screen.match_text.yview,
+                                 style='Custom.Vertical.TScrollbar')
+        screen.match_text.configure(yscrollcommand=scrollbar.set)
+        
+        screen.match_text.pack(side="left", fill="both", expand=True)
+        screen.match_sections = SectionedText(screen.match_text)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Button frame
+        btn_frame = ttk.Frame(content_frame, style='Custom.TFrame')
+        btn_frame.pack(fill="x", pady=20)
+        
+        # Schedule matches button
+        schedule_btn = CustomButton(btn_frame,
+                                   text=f"SCHEDULE {round_name} MATCHES",
+                                   command=lambda: self.schedule_matches(round_name))
+        schedule_btn.pack(side="left", padx=10)
+        
+        # Run matches button
+        run_btn = CustomButton(btn_frame,
+                              text=f"RUN {round_name}",
+                              command=lambda: self.run_round(round_name))
+        run_btn.pack(side="left", padx=10)
+        
+        # Judges' results over the local socket (scoring.py)
+        screen.live_btn = CustomButton(btn_frame,
+                                       text="LIVE SCORING",
+                                       command=lambda: self.toggle_live_scoring(round_name))
+        screen.live_btn.pack(side="left", padx=10)
+        
+        # Graphical bracket in its own window (bracket_view.py)
+        CustomButton(btn_frame,
+                     text="BRACKET",
+                     command=self.show_bracket_window).pack(side="left", padx=10)
+        
+        # Next round, knockout stage or winner; which one is set on refresh
+        screen.next_btn = CustomButton(btn_frame, state="disabled")
+        screen.next_btn.pack(side="right", padx=10)
+        
+        screen.refresh = lambda: self.refresh_round_window(screen, round_name)
+        screen.activate = lambda: screen.live_btn.config(
+            text="STOP LIVE SCORING" if self.scoring else "LIVE SCORING")
+            
+    def refresh_round_window(self, screen, round_name):
+        next_round = self.get_next_round(round_name)
+        if next_round:
+            screen.next_btn.config(text=f"NEXT: {next_round} →",
+                                   command=lambda: self.show_round_window(next_round))
+        elif self.scheduler.is_group_round(round_name):
+            screen.next_btn.config(text="KNOCKOUT STAGE →",
+                                   command=lambda: self.start_knockout(round_name))
+        else:
+            screen.next_btn.config(text="SHOW WINNER", command=self.show_winner_window)
+        screen.next_btn.config(state="disabled")
+        
+        # Whatever the round has got to: nothing yet, matchups or results
+        matches = self.scheduler.rounds.get(round_name, [])
+        if round_name not in self.scheduler.round_pairings and not matches:
+            screen.match_sections.show([])
+            screen.showing_results = False
+        elif self.scheduler.open_matches(round_name) < len(matches):
+            self.show_results(round_name)
+        else:
+            self.show_matchups(round_name, matches)
+            if not matches:
+                self.enable_next(round_name)
+            
+    def schedule_matches(self, round_name):
+        if self.scoring is not None and round_name in self.scheduler.round_pairings:
+            # Live scoring schedules rounds as soon as they can be played
+            self.show_results(round_name)
+            return
+        self.run_task(lambda task: self.scheduler.schedule_round(round_name),
+                      name=f"Scheduling {round_name}",
+                      on_done=lambda matches: self.show_matchups(round_name, matches))
+                      
+    @profiling.traced("show_matchups", "round_name")
+    def show_matchups(self, round_name, matches):
+        screen = self.round_screen(round_name)
+        if screen is None:
+            return
+            
+        # Display matchups, one insert per page of matches
+        if matches:
+            sections = [(f"--- {round_name} Matchups ---", len(matches),
+                         lambda start, stop: formatting.matchups_text(matches, start, stop))]
+        else:
+            sections = [(f"--- {round_name} Matchups ---", 1,
+                         lambda start, stop: "No matches this round, every team has a bye.\n")]
+        screen.match_sections.show(sections, collapsible=False, expanded=[0])
+        screen.showing_results = False
+        screen.version = self.round_version(round_name)
+        
+    def run_round(self, round_name):
+        def work(task):
+            if self.scoring is not None:
+                # Draws the results judges haven't sent yet
+                with self.scoring.lock:
+                    if round_name not in self.scheduler.round_pairings:
+                        self.scheduler.schedule_round(round_name)
+                    winners = self.scheduler.complete_round(round_name)
+                self.scoring.resync()
+                return winners
+            if round_name not in self.scheduler.round_pairings:
+                self.scheduler.schedule_round(round_name)
+            return self.scheduler.complete_round(round_name)
+            
+        self.run_task(work,
+                      name=f"Running {round_name}",
+                      on_done=lambda winners: self.show_results(round_name))
+                      
+    @profiling.traced("show_results", "round_name")
+    def show_results(self, round_name):
+        screen = self.round_screen(round_name)
+        if screen is None:
+            return
+            
+        matches = self.scheduler.rounds[round_name]
+        sections = [(f"--- {round_name} Results ---", len(matches),
+                     lambda start, stop: formatting.results_text(matches, start, stop))]
+        if self.scheduler.is_group_round(round_name):
+            # Standings after this matchday, one collapsed table per group
+            stage, teams = self.scheduler.group_stage, self.scheduler.teams
+            sections.extend((f"Group {g + 1} Standings", len(group),
+                             lambda start, stop, g=g: formatting.standings_text(stage.standings(g),
+                                                                                teams, start, stop))
+                            for g, group in enumerate(stage.groups))
+        screen.match_sections.show(sections, collapsible=len(sections) > 1, expanded=[0])
+        screen.showing_results = True
+        screen.version = self.round_version(round_name)
+        self.enable_next(round_name)
+        self.refresh_bracket()
+        
+    @profiling.traced("show_bracket_window")
+    def show_bracket_window(self):
+        # Stays open across rounds; results redraw only the matches they change
+        if self.scheduler.bracket is None:
+            messagebox.showinfo("Bracket", "The knockout bracket is drawn once the group stage is over.")
+            return
+        if self.bracket_window is not None and self.bracket_window.winfo_exists():
+            self.bracket_window.lift()
+            self.refresh_bracket()
+            return
+        window = self.bracket_window = tk.Toplevel(self.root)
+        window.title("Bracket")
+        window.geometry("1100x760")
+        window.configure(bg=ColorPalette.PRIMARY)
+        
+        ttk.Label(window,
+                 text="Drag to pan, Ctrl+wheel or +/- to zoom",
+                 style='Status.TLabel').pack(fill="x", padx=15, pady=(10, 0))
+        self.bracket_view = bracket_view.BracketCanvas(window, self.scheduler, style='Custom.TFrame')
+        self.bracket_view.pack(fill="both", expand=True, padx=15, pady=15)
+        
+    def refresh_bracket(self):
+        view = self.bracket_view
+        if view is None or not view.winfo_exists() or self.scheduler.bracket is None:
+            return
+        view.refresh(self.scheduler)
+        
+    def enable_next(self, round_name):
+        # Once every match of the round has a result
+        screen = self.round_screen(round_name)
+        if screen is None or self.scheduler.open_matches(round_name):
+            return
+        screen.next_btn.config(state="normal")
+            
+    def get_next_round(self, current_round):
+        try:
+            return self.scheduler.next_round(current_round)
+        except ValueError:
+            return None
+            
+    @profiling.traced("show_winner_window")
+    def show_winner_window(self):
+        # Reads the champion the Final already decided; nothing is played here
+        if self.scheduler.winner is None:
+            messagebox.showinfo("Winner", "The tournament has no champion yet.")
+            return
+        self.screens.show("winner", self.build_winner_window,
+                          (self.scheduler, self.scheduler.revision("bracket", "results")))
+        
+    def build_winner_window(self, screen):
+        # Header frame
+        header_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        header_frame.pack(fill="x", padx=20, pady=20)
+        
+        # Back button
+        back_btn = CustomButton(header_frame,
+                               text="← BACK",
+                               command=lambda: self.show_round_window(self.scheduler.round_names[-1]))
+        back_btn.pack(side="left")
+        
+        # Title
+        ttk.Label(header_frame, text="TOURNAMENT WINNER",
+                 style='Title.TLabel').pack(side="left", padx=20)
+                 
+        # Main content
+        content_frame = ttk.Frame(screen.frame, style='Custom.TFrame')
+        content_frame.pack(fill="both", expand=True, padx=40, pady=20)
+        
+        # Winner display
+        winner_frame = ttk.Frame(content_frame, style='Custom.TFrame')
+        winner_frame.pack(expand=True, pady=50)
+        
+        ttk.Label(winner_frame,
+                 text="🏆 CHAMPION 🏆",
+                 style='Title.TLabel').pack(pady=20)
+                 
+        screen.winner_name = ttk.Label(winner_frame, style='Subtitle.TLabel')
+        screen.winner_name.pack(pady=20)
+                 
+        screen.winner_members = ttk.Label(winner_frame, style='Subtitle.TLabel')
+        screen.winner_members.pack(pady=10)
+                 
+        # Tournament summary
+        summary_frame = ttk.Frame(content_frame, style='Custom.TFrame')
+        summary_frame.pack(fill="x", pady=20)
+        
+        ttk.Label(summary_frame,
+                 text="Tournament Summary",
+                 style='Subtitle.TLabel').pack(pady=10)
+                 
+        search_frame, screen.summary_query = self.build_search_box(summary_frame, self.filter_summary,
+                                                                   "Find a team's matches:")
+        search_frame.pack(fill="x", pady=(0, 10))
+        
+        summary_text = tk.Text(summary_frame,
+                             font=Fonts.BODY,
+                             bg=ColorPalette.SECONDARY,
+                             fg=ColorPalette.TEXT,
+                             height=10,
+                             width=80,
+                             padx=15,
+                             pady=15,
+                             wrap="word")
+        summary_text.pack(fill="x")
+        
+        self.summary_sections = SectionedText(summary_text)
+        
+        # Result files (export.py), written on a worker thread
+        export_frame = ttk.Frame(summary_frame, style='Custom.TFrame')
+        export_frame.pack(pady=(10, 0))
+        CustomButton(export_frame,
+                     text="EXPORT RESULTS",
+                     command=self.export_results).pack(side="left", padx=10)
+        CustomButton(export_frame,
+                     text="EXPORT TEAMS",
+                     command=lambda: self.export_results(teams=True)).pack(side="left", padx=10)
+        screen.refresh = lambda: self.refresh_winner_window(screen)
+        
+    def refresh_winner_window(self, screen):
+        winner = self.scheduler.winner
+        screen.winner_name.config(text=winner.name)
+        screen.winner_members.config(text=f"Team Members: {', '.join(winner.members)}")
+        self.filter_summary(screen.summary_query.get())
+        
+    def export_results(self, teams=False):
+        filetypes = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl")]
+        if not teams:
+            filetypes += [("Bracket PNG", "*.png"), ("Bracket PDF", "*.pdf"), ("Bracket SVG", "*.svg")]
+        path = filedialog.asksaveasfilename(parent=self.root,
+                                            title="Export teams" if teams else "Export results",
+                                            defaultextension=".csv",
+                                            filetypes=filetypes)
+        if not path:
+            return
+        import export
+        
+        def work(task):
+            return export.export(self.scheduler, path, teams,
+                                 progress=lambda done, total: task.progress(done, total,
+                                                                            f"{done:,} rows"))
+            
+        self.run_task(work,
+                      name=f"Exporting {os.path.basename(path)}",
+                      on_done=lambda path: self.status_label.config(text=f"Exported to {path}"))
+        
+    def filter_summary(self, query):
+        if not self.summary_sections.text.winfo_exists():
+            return
+        if not query.strip():
+            # Rounds render on demand: click a round to expand it
+            rounds = self.scheduler.rounds
+            sections = [(round_name, len(matches),
+                         lambda start, stop, matches=matches: formatting.summary_text(matches, start, stop))
+                        for round_name, matches in rounds.items()]
+            # Small tournaments open fully expanded, like before
+            total = sum(len(matches) for matches in rounds.values())
+            expanded = range(len(sections)) if total <= SectionedText.PAGE_SIZE else [len(sections) - 1]
+            self.summary_sections.show(sections, intro="Match Results:\n\n", expanded=expanded)
+            return
+        # One section per matching team, from the team -> matches index
+        teams = self.scheduler.registry.search(query)
+        sections = []
+        for team in teams[:self.SEARCH_TEAMS]:
+            entries = self.scheduler.matches_of(team)
+            sections.append((f"{team.name} (rank {team.rank})", len(entries),
+                             lambda start, stop, entries=entries:
+                                 formatting.team_matches_text(entries, start, stop)))
+            if self.store is not None:
+                # Earlier tournaments, read while workers may still be writing
+                history = self.store.team_history(team.name)
+                if len(history) > 1:
+                    sections.append((f"{team.name}: {len(history)} tournaments", len(history),
+                                     lambda start, stop, history=history:
+                                         formatting.history_text(history, start, stop)))
+        shown = min(len(teams), self.SEARCH_TEAMS)
+        self.summary_sections.show(sections,
+                                   intro=f"{len(teams)} teams match '{query.strip()}'"
+                                         f"{f', showing {shown}' if shown < len(teams) else ''}:\n\n",
+                                   expanded=range(len(sections)))
+        
+# ---------------------------- MAIN EXECUTION ---------------------------- #
+def main():
+    root = tk.Tk()
+    
+    # Set window icon (optional)
+    try:
+        img = tk.Image("photo", file="tournament_icon.png")
+        root.iconphoto(True, img)
+    except:
+        pass
+        
+    app = ModernTournamentGUI(root)
+    root.mainloop()
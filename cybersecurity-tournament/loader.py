@@ -0,0 +1,229 @@
+import csv
+import heapq
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# ---------------------------- CONSTANTS ---------------------------- #
+CHUNK_SIZE = 1 << 20       # Bytes read from disk per chunk
+BATCH_SIZE = 10000         # Parsed rows handed out per batch
+RUN_SIZE = 200000          # Rows held in memory per external sort run
+MAX_REPORTED_ERRORS = 1000 # Keep the error list bounded on very dirty files
+
+# ---------------------------- LOAD REPORT ---------------------------- #
+class LoadReport:
+    def __init__(self):
+        self.rows = 0
+        self.malformed = 0
+        self.errors = []          # (line number, message) pairs
+        self.seconds = 0.0
+        self.peak_rss = None      # Bytes, None if the platform can't tell
+        self.bytes_read = 0
+        self.total_bytes = 0
+        self.progress = None      # Optional callback(report), called once per batch
+
+    @property
+    def rows_per_sec(self):
+        if self.seconds <= 0:
+            return 0.0
+        return self.rows / self.seconds
+
+    @contextmanager
+    def timed(self):
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.peak_rss = peak_rss()
+
+    def add_error(self, line_no, message):
+        self.malformed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_no, message))
+
+    def __str__(self):
+        text = (f"{self.rows} rows in {self.seconds:.3f}s "
+                f"({self.rows_per_sec:,.0f} rows/sec), {self.malformed} malformed")
+        if self.peak_rss is not None:
+            text += f", peak RSS {self.peak_rss / (1 << 20):.1f} MiB"
+        return text
+
+def peak_rss():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kilobytes on Linux but bytes on macOS
+    return usage if sys.platform == "darwin" else usage * 1024
+
+# ---------------------------- PARSING ---------------------------- #
+def parse_row(line):
+    fields = line.split(";")
+    if len(fields) != 3:
+        raise ValueError(f"expected 3 ';'-separated fields, got {len(fields)}")
+    name, members, rank = fields
+    if not name:
+        raise ValueError("empty team name")
+    try:
+        rank = int(rank)
+    except ValueError:
+        raise ValueError(f"rank {rank!r} is not an integer")
+    return name, members.split(","), rank
+
+def iter_lines(filename, chunk_size=CHUNK_SIZE, report=None):
+    # Read big chunks and split them ourselves instead of one readline per row
+    line_no = 0
+    tail = ""
+    with open(filename, "r", buffering=chunk_size) as file:
+        if report is not None:
+            report.total_bytes = os.fstat(file.fileno()).st_size
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            if report is not None:
+                report.bytes_read += len(chunk)
+            lines = (tail + chunk).split("\n")
+            tail = lines.pop()
+            for line in lines:
+                line_no += 1
+                yield line_no, line
+    if tail:
+        yield line_no + 1, tail
+
+def iter_batches(filename, report, chunk_size=CHUNK_SIZE, batch_size=BATCH_SIZE):
+    # Yields lists of (rank, line number, name, members); bad rows go to the report
+    batch = []
+    for line_no, line in iter_lines(filename, chunk_size, report):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            name, members, rank = parse_row(line)
+        except ValueError as e:
+            report.add_error(line_no, str(e))
+            continue
+        batch.append((rank, line_no, name, members))
+        if len(batch) >= batch_size:
+            report.rows += len(batch)
+            if report.progress is not None:
+                report.progress(report)
+            yield batch
+            batch = []
+    if batch:
+        report.rows += len(batch)
+        if report.progress is not None:
+            report.progress(report)
+        yield batch
+
+def iter_rows(filename, report, chunk_size=CHUNK_SIZE):
+    for batch in iter_batches(filename, report, chunk_size):
+        yield from batch
+
+# ---------------------------- RANKED ORDER ---------------------------- #
+# Rows compare by (rank, line number), which keeps file order for equal ranks
+# just like the stable list.sort() this replaces. A key(row) orders them some
+# other way (e.g. ratings.RatingTable.order_key) through the same bounded paths.
+def top_k(filename, k, report, chunk_size=CHUNK_SIZE, key=None):
+    # Bounded heap: memory is O(k) no matter how big the file is
+    if k < 0:
+        raise ValueError(f"top_k must be 0 or more, got {k}")
+    if k == 0:
+        # Still reads the file, so the report counts rows and errors
+        for _ in iter_batches(filename, report, chunk_size):
+            pass
+        return []
+    if key is not None:
+        return heapq.nsmallest(k, iter_rows(filename, report, chunk_size), key=key)
+    heap = []
+    for batch in iter_batches(filename, report, chunk_size):
+        for rank, line_no, name, members in batch:
+            order = (-rank, -line_no)
+            if len(heap) < k:
+                heapq.heappush(heap, (order, name, members))
+            elif order > heap[0][0]:
+                heapq.heapreplace(heap, (order, name, members))
+    rows = [(-order[0], -order[1], name, members) for order, name, members in heap]
+    rows.sort()
+    return rows
+
+def _write_run(rows, directory, key=None):
+    # Tab-separated through csv so names with tabs or quotes come back intact;
+    # members are the trailing fields
+    rows.sort(key=key)
+    fd, path = tempfile.mkstemp(prefix="teams-run-", suffix=".txt", dir=directory)
+    with os.fdopen(fd, "w", buffering=CHUNK_SIZE, encoding="utf-8", newline="") as file:
+        writer = csv.writer(file, delimiter="\t", lineterminator="\n")
+        for rank, line_no, name, members in rows:
+            writer.writerow((rank, line_no, name, *members))
+    return path
+
+def _read_run(path):
+    with open(path, "r", buffering=CHUNK_SIZE, encoding="utf-8", newline="") as file:
+        for rank, line_no, name, *members in csv.reader(file, delimiter="\t"):
+            yield int(rank), int(line_no), name, members
+
+def sorted_rows(filename, report, run_size=RUN_SIZE, chunk_size=CHUNK_SIZE, tmpdir=None,
+                key=None):
+    # External merge sort: sorted runs of run_size rows are spilled to disk and
+    # merged lazily. Small files never leave memory.
+    run = []
+    paths = []
+    try:
+        for batch in iter_batches(filename, report, chunk_size):
+            run.extend(batch)
+            if len(run) >= run_size:
+                paths.append(_write_run(run, tmpdir, key))
+                run = []
+        if not paths:
+            run.sort(key=key)
+            yield from run
+            return
+        if run:
+            paths.append(_write_run(run, tmpdir, key))
+            run = []
+        yield from heapq.merge(*(_read_run(path) for path in paths), key=key)
+    finally:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def iter_ranked(filename, report, k=None, key=None):
+    # Rows are (rank, line number, name, members) in rank order, or key order
+    if k is None:
+        return sorted_rows(filename, report, key=key)
+    return iter(top_k(filename, k, report, key=key))
+
+def load_ranked(filename, k=None, report=None):
+    report = report if report is not None else LoadReport()
+    with report.timed():
+        rows = list(iter_ranked(filename, report, k))
+    return rows, report
+
+# ---------------------------- MAIN EXECUTION ---------------------------- #
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Stream a teams file and report load statistics")
+    parser.add_argument("filename", nargs="?", default="teams.txt")
+    parser.add_argument("--top-k", type=int, default=None,
+                        help="only keep the K best-ranked teams (bounded memory)")
+    args = parser.parse_args()
+
+    report = LoadReport()
+    with report.timed():
+        count = sum(1 for _ in iter_ranked(args.filename, report, args.top_k))
+
+    print(f"kept {count} teams")
+    print(report)
+    for line_no, message in report.errors[:20]:
+        print(f"  line {line_no}: {message}")
@@ -0,0 +1,243 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Opt-in timing spans and counters for the slow paths (loading, division,
+# scheduling, rounds, GUI screens). Nothing is recorded until enable() is
+# called; until then @traced functions cost one global lookup on top of the
+# call, and span()/count() return straight away.
+#
+#   profiling.enable(memory=True)
+#   ... run a tournament ...
+#   print(profiling.breakdown_text(profiling.tracer().breakdown()))
+#   profiling.tracer().write_chrome_trace("trace.json")   # chrome://tracing, Perfetto
+#
+# Spans nest per thread, so work done on TaskRunner workers shows up on its
+# own track. With memory=True every span also records the bytes it left
+# allocated and its peak, through tracemalloc (which slows Python down by a
+# few times; the peak is process-wide, so overlapping spans on other threads
+# count towards it).
+
+_tracer = None
+
+# ---------------------------- RECORDS ---------------------------- #
+class Span:
+    __slots__ = ("name", "args", "thread", "start", "duration", "allocated", "peak",
+                 "_base", "_peak")
+
+    def __init__(self, name, args, thread, start):
+        self.name = name
+        self.args = args
+        self.thread = thread
+        self.start = start          # perf_counter_ns
+        self.duration = 0           # ns
+        self.allocated = None       # Bytes still allocated at the end, None without memory
+        self.peak = None            # Bytes above the start at the highest point
+        self._base = 0
+        self._peak = 0
+
+class Tracer:
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.owns_tracemalloc = False   # Started by enable(), stopped by disable()
+        self.origin = time.perf_counter_ns()
+        self.spans = []
+        self.counters = {}
+        self.samples = []           # (ns, counter name, value after the change)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._threads = {}
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+            thread = threading.current_thread()
+            self._threads[thread.ident] = thread.name
+        return stack
+
+    def begin(self, name, args=None):
+        stack = self._stack()
+        span = Span(name, args, threading.get_ident(), 0)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # Keep the parent's peak before resetting it for the child
+                parent = stack[-1]
+                parent._peak = max(parent._peak, peak)
+            tracemalloc.reset_peak()
+            span._base = span._peak = current
+        stack.append(span)
+        span.start = time.perf_counter_ns()
+        return span
+
+    def end(self, span):
+        span.duration = time.perf_counter_ns() - span.start
+        stack = self._stack()
+        stack.remove(span)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            span._peak = max(span._peak, peak)
+            span.allocated = current - span._base
+            span.peak = span._peak - span._base
+            if stack:
+                stack[-1]._peak = max(stack[-1]._peak, span._peak)
+        self.spans.append(span)
+
+    @contextmanager
+    def span(self, name, **args):
+        span = self.begin(name, args or None)
+        try:
+            yield span
+        finally:
+            self.end(span)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            value = self.counters.get(name, 0) + amount
+            self.counters[name] = value
+            self.samples.append((time.perf_counter_ns(), name, value))
+
+    def clear(self):
+        with self._lock:
+            self.origin = time.perf_counter_ns()
+            self.spans = []
+            self.counters = {}
+            self.samples = []
+
+    # ---------------------------- REPORTS ---------------------------- #
+    def breakdown(self):
+        # One row per span name, slowest total first:
+        # (name, calls, total ms, mean ms, max ms, allocated KiB, peak KiB)
+        totals = {}
+        for span in self.spans:
+            row = totals.setdefault(span.name, [0, 0, 0, None, None])
+            row[0] += 1
+            row[1] += span.duration
+            row[2] = max(row[2], span.duration)
+            if span.allocated is not None:
+                row[3] = (row[3] or 0) + span.allocated
+                row[4] = max(row[4] or 0, span.peak)
+        rows = []
+        for name, (calls, total, longest, allocated, peak) in totals.items():
+            rows.append((name, calls, total / 1e6, total / calls / 1e6, longest / 1e6,
+                         None if allocated is None else allocated / 1024,
+                         None if peak is None else peak / 1024))
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows
+
+    def chrome_trace(self):
+        # Trace Event Format: complete ("X") events for spans, counter ("C")
+        # events for every change of a counter, thread names as metadata
+        pid = os.getpid()
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": ident,
+                   "args": {"name": name}} for ident, name in self._threads.items()]
+        for span in self.spans:
+            args = dict(span.args or {})
+            if span.allocated is not None:
+                args["allocated_bytes"] = span.allocated
+                args["peak_bytes"] = span.peak
+            events.append({"name": span.name, "ph": "X", "pid": pid, "tid": span.thread,
+                           "ts": (span.start - self.origin) / 1000, "dur": span.duration / 1000,
+                           "args": args})
+        for ns, name, value in self.samples:
+            events.append({"name": name, "ph": "C", "pid": pid, "ts": (ns - self.origin) / 1000,
+                           "args": {name: value}})
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"counters": dict(self.counters)}}
+
+    def write_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as out:
+            json.dump(self.chrome_trace(), out, default=str)
+        return path
+
+# ---------------------------- MODULE SWITCH ---------------------------- #
+def enable(memory=False):
+    # Starts recording into a fresh Tracer and returns it
+    global _tracer
+    disable()
+    tracer = Tracer(memory)
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        tracer.owns_tracemalloc = True
+    _tracer = tracer
+    return tracer
+
+def disable():
+    # Stops recording; returns the last Tracer so its results can still be read
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and tracer.owns_tracemalloc:
+        tracemalloc.stop()
+        tracer.owns_tracemalloc = False
+    return tracer
+
+def tracer():
+    return _tracer
+
+def enabled():
+    return _tracer is not None
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+_NO_SPAN = _NoSpan()
+
+def span(name, **args):
+    # with profiling.span("name", key=value): ...
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, **args)
+
+def count(name, amount=1):
+    tracer = _tracer
+    if tracer is not None:
+        tracer.count(name, amount)
+
+def traced(name, *fields):
+    # Decorator recording a span per call. fields are parameter names whose
+    # values go into the span's args (only looked at while recording).
+    def decorate(fn):
+        signature = inspect.signature(fn) if fields else None
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return fn(*args, **kwargs)
+            details = None
+            if signature is not None:
+                bound = signature.bind_partial(*args, **kwargs).arguments
+                details = {field: bound[field] for field in fields if field in bound}
+            span = tracer.begin(name, details)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.end(span)
+        return wrapper
+    return decorate
+
+# ---------------------------- TEXT ---------------------------- #
+def breakdown_text(rows, counters=None):
+    lines = [f"{'span':<28} {'calls':>7} {'total ms':>10} {'mean ms':>9} {'max ms':>9} "
+             f"{'alloc KiB':>10} {'peak KiB':>9}"]
+    for name, calls, total, mean, longest, allocated, peak in rows:
+        memory = (f"{allocated:>10.0f} {peak:>9.0f}" if allocated is not None
+                  else f"{'-':>10} {'-':>9}")
+        lines.append(f"{name[:28]:<28} {calls:>7} {total:>10.2f} {mean:>9.3f} {longest:>9.2f} {memory}")
+    if counters:
+        lines.append("")
+        lines.extend(f"{name:<28} {value:>12,}" for name, value in sorted(counters.items()))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,303 @@
+import math
+from array import array
+
+# Team ratings that carry over from one tournament to the next, keyed by team
+# name. Two systems:
+#
+#   Elo     one number per team, moved by K * (result - expected) per match
+#   Glicko  a rating and a rating deviation (RD): uncertain teams move more,
+#           and the RD grows again between tournaments (Glickman 1999)
+#
+# A RatingTable holds every team ever rated, as columns. Scheduler.load_teams
+# (ratings=table) seeds the teams by rating and binds the table to them; every
+# completed match then updates both teams at once (TournamentRatings.record),
+# and the bound table's model() turns ratings into win probabilities for
+# complete_round and the Monte Carlo simulator.
+#
+# recompute() replays a long match history with NumPy a whole round at a time
+# instead of one match at a time. Every team plays at most once per round, so
+# a round is a Glicko rating period and both modes give the same ratings.
+# Tables are kept in the SQLite store (database.py) together with the newest
+# tournament folded in, so catch_up() only replays what was played since.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+INITIAL_RATING = 1500.0
+INITIAL_RD = 350.0          # Glicko: deviation of a team never seen before
+MIN_RD = 30.0               # Glicko: floor, so ratings never freeze
+RD_GROWTH = 35.0            # Glicko: c, RD added back per tournament
+K_FACTOR = 32.0             # Elo: largest change from one match
+SCALE = 400.0               # Rating points for 10:1 odds
+Q = math.log(10) / SCALE
+
+# ---------------------------- SYSTEMS ---------------------------- #
+class Elo:
+    name = "elo"
+
+    def __init__(self, k=K_FACTOR):
+        self.k = k
+
+    def expected(self, rating_a, rating_b, rd_a=0.0, rd_b=0.0):
+        return 1.0 / (1.0 + 10.0 ** ((rating_b - rating_a) / SCALE))
+
+    def update(self, table, winner, loser):
+        rating = table.rating
+        shift = self.k * (1.0 - self.expected(rating[winner], rating[loser]))
+        rating[winner] += shift
+        rating[loser] -= shift
+
+    def new_period(self, table, rows):
+        pass
+
+    def grow(self, np, rd, rows):
+        pass
+
+    def update_period(self, np, rating, rd, winners, losers):
+        # Every match of the period against the ratings it started with
+        shift = self.k / (1.0 + 10.0 ** ((rating[winners] - rating[losers]) / SCALE))
+        size = len(rating)
+        rating += np.bincount(winners, shift, size) - np.bincount(losers, shift, size)
+
+    def __repr__(self):
+        return f"Elo(k={self.k})"
+
+class Glicko:
+    name = "glicko"
+
+    def __init__(self, growth=RD_GROWTH, min_rd=MIN_RD):
+        self.growth = growth
+        self.min_rd = min_rd
+
+    @staticmethod
+    def g(rd):
+        return 1.0 / math.sqrt(1.0 + 3.0 * Q * Q * rd * rd / (math.pi * math.pi))
+
+    def expected(self, rating_a, rating_b, rd_a=0.0, rd_b=0.0):
+        # Win chance with both sides' uncertainty folded in
+        g = self.g(math.sqrt(rd_a * rd_a + rd_b * rd_b))
+        return 1.0 / (1.0 + 10.0 ** (-g * (rating_a - rating_b) / SCALE))
+
+    def update(self, table, winner, loser):
+        # A one-game rating period for both teams
+        rating, rd = table.rating, table.rd
+        ra, rb, da, db = rating[winner], rating[loser], rd[winner], rd[loser]
+        for row, own, own_rd, other, other_rd, score in ((winner, ra, da, rb, db, 1.0),
+                                                          (loser, rb, db, ra, da, 0.0)):
+            g = self.g(other_rd)
+            e = 1.0 / (1.0 + 10.0 ** (-g * (own - other) / SCALE))
+            d2 = 1.0 / (Q * Q * g * g * e * (1.0 - e))
+            variance = 1.0 / (1.0 / (own_rd * own_rd) + 1.0 / d2)
+            rating[row] = own + Q * variance * g * (score - e)
+            rd[row] = max(self.min_rd, math.sqrt(variance))
+
+    def new_period(self, table, rows):
+        # Time has passed since these teams' last tournament
+        rd, growth = table.rd, self.growth * self.growth
+        for row in rows:
+            rd[row] = min(INITIAL_RD, math.sqrt(rd[row] * rd[row] + growth))
+
+    def grow(self, np, rd, rows):
+        rd[rows] = np.minimum(INITIAL_RD, np.sqrt(rd[rows] ** 2 + self.growth * self.growth))
+
+    def update_period(self, np, rating, rd, winners, losers):
+        sides = np.concatenate((winners, losers))
+        others = np.concatenate((losers, winners))
+        scores = np.concatenate((np.ones(len(winners)), np.zeros(len(losers))))
+        g = 1.0 / np.sqrt(1.0 + 3.0 * Q * Q * rd[others] ** 2 / math.pi ** 2)
+        e = 1.0 / (1.0 + 10.0 ** (-g * (rating[sides] - rating[others]) / SCALE))
+        size = len(rating)
+        inverse_d2 = np.bincount(sides, Q * Q * g * g * e * (1.0 - e), size)
+        pull = np.bincount(sides, g * (scores - e), size)
+        played = inverse_d2 > 0
+        variance = 1.0 / (1.0 / rd[played] ** 2 + inverse_d2[played])
+        rating[played] += Q * variance * pull[played]
+        rd[played] = np.maximum(self.min_rd, np.sqrt(variance))
+
+    def __repr__(self):
+        return f"Glicko(growth={self.growth})"
+
+SYSTEMS = {
+    "elo": Elo,
+    "glicko": Glicko,
+}
+
+# ---------------------------- TABLE ---------------------------- #
+class RatingTable:
+    def __init__(self, system="elo"):
+        self.system = SYSTEMS[system]() if isinstance(system, str) else system
+        self.names = []
+        self.rows = {}
+        self.rating = array("d")
+        self.rd = array("d")
+        self.games = array("i")
+        self.wins = array("i")
+        self.last_tournament = 0    # Newest stored tournament already folded in
+
+    def row(self, name):
+        # A team's row, added at the initial rating the first time it is seen
+        row = self.rows.get(name)
+        if row is None:
+            row = self.rows[name] = len(self.names)
+            self.names.append(name)
+            self.rating.append(INITIAL_RATING)
+            self.rd.append(INITIAL_RD)
+            self.games.append(0)
+            self.wins.append(0)
+        return row
+
+    def rows_of(self, names):
+        # array("i") of rows for many names; one dict lookup each when known
+        rows = list(map(self.rows.get, names))
+        if None in rows:
+            rows = [self.row(name) if row is None else row for name, row in zip(names, rows)]
+        return array("i", rows)
+
+    def __len__(self):
+        return len(self.names)
+
+    def get(self, name):
+        # (rating, rd, games, wins), or None for a team never rated
+        row = self.rows.get(name)
+        if row is None:
+            return None
+        return self.rating[row], self.rd[row], self.games[row], self.wins[row]
+
+    def record(self, winner, loser):
+        # One match between two rows
+        self.system.update(self, winner, loser)
+        self.games[winner] += 1
+        self.games[loser] += 1
+        self.wins[winner] += 1
+
+    def win_probability(self, row_a, row_b):
+        return self.system.expected(self.rating[row_a], self.rating[row_b],
+                                    self.rd[row_a], self.rd[row_b])
+
+    def top(self, limit=None):
+        # [(name, rating, rd, games, wins)], best first
+        order = sorted(range(len(self.names)), key=self.rating.__getitem__, reverse=True)
+        return [(self.names[row], self.rating[row], self.rd[row], self.games[row], self.wins[row])
+                for row in order[:limit]]
+
+    def order_key(self):
+        # Sort key for loader rows (rank, line number, name, members): rating
+        # best first, the file's rank breaks ties (and orders unrated teams).
+        # Passed to loader.iter_ranked, so rated loads stay bounded too.
+        rating, known = self.rating, self.rows
+
+        def key(row):
+            index = known.get(row[2])
+            return (-(INITIAL_RATING if index is None else rating[index]), row[0], row[1])
+        return key
+
+    def ranked(self, rows):
+        # Rows in order_key() order, renumbered 1..N by rating
+        for rank, (_, line, name, members) in enumerate(rows, 1):
+            yield rank, line, name, members
+
+    def bind(self, teams):
+        return TournamentRatings(self, teams)
+
+    # ---------------------------- BATCH ---------------------------- #
+    def recompute(self, tournaments):
+        # Folds in [(team names by index, [(winner indices, loser indices)
+        # per round])] oldest first, e.g. database.TournamentStore.match_history()
+        import numpy as np
+        tournaments = list(tournaments)
+        lookups = [self.rows_of(names) for names, _ in tournaments]
+        rating = np.array(self.rating, dtype=float)
+        rd = np.array(self.rd, dtype=float)
+        games = np.array(self.games, dtype=np.int64)
+        wins = np.array(self.wins, dtype=np.int64)
+        system = self.system
+        for lookup, (_, rounds) in zip(lookups, tournaments):
+            # Each tournament works on its own teams' slice, indexed like the
+            # tournament, so a round costs its field size, not the table's
+            rows = np.frombuffer(lookup, dtype=np.int32).astype(np.int64)
+            size = len(rows)
+            local_rating, local_rd = rating[rows], rd[rows]
+            system.grow(np, local_rd, slice(None))
+            played = np.zeros(size, dtype=np.int64)
+            won = np.zeros(size, dtype=np.int64)
+            for winners, losers in rounds:
+                if not len(winners):
+                    continue
+                winners = np.asarray(winners, dtype=np.int64)
+                losers = np.asarray(losers, dtype=np.int64)
+                system.update_period(np, local_rating, local_rd, winners, losers)
+                won += np.bincount(winners, minlength=size)
+                played += np.bincount(losers, minlength=size)
+            rating[rows], rd[rows] = local_rating, local_rd
+            games[rows] += played + won
+            wins[rows] += won
+        self.rating = array("d", rating.tobytes())
+        self.rd = array("d", rd.tobytes())
+        self.games = array("i", games.astype(np.int32).tobytes())
+        self.wins = array("i", wins.astype(np.int32).tobytes())
+        return len(tournaments)
+
+    def catch_up(self, store):
+        # Folds in the finished tournaments stored since the table was saved
+        history = list(store.match_history(self.last_tournament))
+        self.recompute((names, rounds) for _, names, rounds in history)
+        if history:
+            self.last_tournament = history[-1][0]
+        return len(history)
+
+# ---------------------------- ONE TOURNAMENT ---------------------------- #
+class TournamentRatings:
+    # A RatingTable seen through one tournament's team indices
+    def __init__(self, table, teams):
+        self.table = table
+        self.rows = table.rows_of([team.name for team in teams])
+        self.ranks = array("i", (team.rank for team in teams))
+        table.system.new_period(table, self.rows)
+
+    def record(self, winner, loser):
+        # Team indices of a completed match
+        self.table.record(self.rows[winner], self.rows[loser])
+
+    def rating_of(self, index):
+        return self.table.rating[self.rows[index]]
+
+    def win_probability(self, a, b):
+        return self.table.win_probability(self.rows[a], self.rows[b])
+
+    def model(self):
+        # The ratings as a win probability model, in the rank form
+        # Match.complete and the simulator take (see simulation.py)
+        return RatingModel(self.table, self.rows, self.ranks)
+
+class RatingModel:
+    # win_probability(rank_a, rank_b) from the current ratings, so results
+    # already played in the tournament count. Ranks have to be unique, as they
+    # are after load_teams(ratings=...). Pickles (with its table) for
+    # simulation worker processes.
+    def __init__(self, table, rows, ranks):
+        self.table = table
+        self.row_of = array("i", [-1]) * (max(ranks, default=0) + 1)
+        for row, rank in zip(rows, ranks):
+            if self.row_of[rank] >= 0:
+                raise ValueError(f"rank {rank} is shared by several teams; "
+                                 f"load the teams with ratings so they are ranked by rating")
+            self.row_of[rank] = row
+
+    def __call__(self, rank_a, rank_b):
+        table = self.table
+        # Python and NumPy scalars (the simulator passes np.int64 ranks) take
+        # the scalar path, like np.ndim(rank_a) == 0 without importing NumPy
+        if isinstance(rank_a, (int, float)) or getattr(rank_a, "ndim", None) == 0:
+            return table.win_probability(self.row_of[int(rank_a)], self.row_of[int(rank_b)])
+        import numpy as np
+        row_of = np.frombuffer(self.row_of, dtype=np.int32)
+        a = row_of[np.asarray(rank_a).astype(np.int64)]
+        b = row_of[np.asarray(rank_b).astype(np.int64)]
+        rating = np.array(table.rating, dtype=float)
+        if table.system.name == "glicko":
+            rd = np.array(table.rd, dtype=float)
+            g = 1.0 / np.sqrt(1.0 + 3.0 * Q * Q * (rd[a] ** 2 + rd[b] ** 2) / math.pi ** 2)
+        else:
+            g = 1.0
+        return 1.0 / (1.0 + 10.0 ** (-g * (rating[a] - rating[b]) / SCALE))
+
+    def __repr__(self):
+        return f"RatingModel({self.table.system!r})"
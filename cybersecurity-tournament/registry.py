@@ -0,0 +1,202 @@
+import bisect
+import re
+from array import array
+
+import storage
+
+# Lookup indexes over Scheduler.teams (a list of Team objects or a
+# storage.TeamTable; position = team index). Every index is built on first
+# use, so loading teams stays as fast as before:
+#   names     casefolded name -> team index (best rank wins on duplicates)
+#   members   casefolded member -> team indices
+#   prefixes  sorted casefolded names, for "starts with" search
+#   ranks     rank column in ascending order, for rank range queries
+#   matches   team index -> every match it played, across all rounds
+
+# ---------------------------- CONSTANTS ---------------------------- #
+RANK_RANGE = re.compile(r"^\s*(\d+)\s*(?:-|–|\.\.)\s*(\d+)\s*$")
+
+# ---------------------------- VIEWS ---------------------------- #
+class TeamView:
+    # Read-only sequence of teams picked by index, without materializing them;
+    # enough for VirtualTreeview, which only asks for the visible rows
+    __slots__ = ("teams", "indices")
+
+    def __init__(self, teams, indices):
+        self.teams = teams
+        self.indices = indices
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.teams[index] for index in self.indices[i]]
+        return self.teams[self.indices[i]]
+
+    def __iter__(self):
+        for index in self.indices:
+            yield self.teams[index]
+
+# ---------------------------- REGISTRY ---------------------------- #
+class TeamRegistry:
+    def __init__(self, teams):
+        self.teams = teams
+        self._names = None
+        self._members = None
+        self._prefixes = None
+        self._ranks = None
+        self._rank_order = None
+        self._positions = None
+        self._matches = None
+        self._rounds = []       # (round name, matches) in the order they were indexed
+        self._starts = []       # global number of each round's first match
+
+    # ---------------- team indexes ---------------- #
+    def _names_column(self):
+        teams = self.teams
+        if isinstance(teams, storage.TeamTable):
+            strings = teams.strings
+            return [strings[i] for i in teams.name_ids]
+        return [team.name for team in teams]
+
+    def _members_column(self):
+        teams = self.teams
+        if isinstance(teams, storage.TeamTable):
+            strings = teams.strings
+            starts = teams.member_starts
+            member_ids = teams.member_ids
+            return [[strings[j] for j in member_ids[starts[i]:starts[i + 1]]]
+                    for i in range(len(teams))]
+        return [team.members for team in teams]
+
+    def _build_names(self):
+        # Walked backwards so the best-ranked of two equal names is kept
+        names = self._names_column()
+        self._names = {names[i].casefold(): i for i in range(len(names) - 1, -1, -1)}
+
+    def _build_members(self):
+        # Most members belong to one team: store a bare index and only switch
+        # to a list on the second team, which saves a list per member
+        index = {}
+        get = index.get
+        for i, team_members in enumerate(self._members_column()):
+            for member in team_members:
+                key = member.casefold()
+                teams = get(key)
+                if teams is None:
+                    index[key] = i
+                elif type(teams) is int:
+                    if teams != i:
+                        index[key] = [teams, i]
+                elif teams[-1] != i:
+                    teams.append(i)
+        self._members = index
+
+    def index_of(self, team):
+        if isinstance(team, storage.TeamRef):
+            return team.index
+        if self._positions is None:
+            self._positions = {id(item): i for i, item in enumerate(self.teams)}
+        return self._positions[id(team)]
+
+    def find(self, name):
+        if self._names is None:
+            self._build_names()
+        index = self._names.get(name.casefold())
+        return self.teams[index] if index is not None else None
+
+    def with_member(self, member):
+        if self._members is None:
+            self._build_members()
+        teams = self._members.get(member.casefold(), ())
+        return TeamView(self.teams, (teams,) if type(teams) is int else teams)
+
+    def with_prefix(self, prefix):
+        if self._names is None:
+            self._build_names()
+        if self._prefixes is None:
+            self._prefixes = sorted(self._names)
+        prefix = prefix.casefold()
+        keys = self._prefixes
+        indices = []
+        for i in range(bisect.bisect_left(keys, prefix), len(keys)):
+            if not keys[i].startswith(prefix):
+                break
+            indices.append(self._names[keys[i]])
+        indices.sort()
+        return TeamView(self.teams, indices)
+
+    def rank_range(self, low, high):
+        # Teams with low <= rank <= high, best first. Loaded teams are already
+        # rank-sorted, so this is two bisects over the rank column.
+        if self._ranks is None:
+            ranks = (self.teams.ranks if isinstance(self.teams, storage.TeamTable)
+                     else array("i", [team.rank for team in self.teams]))
+            if all(a <= b for a, b in zip(ranks, ranks[1:])):
+                self._ranks, self._rank_order = ranks, None
+            else:
+                order = sorted(range(len(ranks)), key=ranks.__getitem__)
+                self._ranks = array("i", [ranks[i] for i in order])
+                self._rank_order = array("i", order)
+        start = bisect.bisect_left(self._ranks, low)
+        stop = bisect.bisect_right(self._ranks, high)
+        if self._rank_order is None:
+            return TeamView(self.teams, range(start, stop))
+        return TeamView(self.teams, self._rank_order[start:stop])
+
+    def search(self, query):
+        # What the GUI filter boxes accept: "120" or "100-200" for ranks,
+        # otherwise a team name prefix or a member name
+        query = query.strip()
+        if not query:
+            return self.teams
+        if query.isdigit():
+            return self.rank_range(int(query), int(query))
+        match = RANK_RANGE.match(query)
+        if match:
+            low, high = sorted((int(match.group(1)), int(match.group(2))))
+            return self.rank_range(low, high)
+        indices = set(self.with_prefix(query).indices)
+        indices.update(self.with_member(query).indices)
+        return TeamView(self.teams, sorted(indices))
+
+    # ---------------- match index ---------------- #
+    def sync_rounds(self, rounds, round_pairings):
+        # Brings the reverse match index up to date with Scheduler.rounds.
+        # Newly scheduled rounds are indexed incrementally; if an indexed round
+        # was replaced or dropped the index starts over.
+        if self._matches is None or any(rounds.get(name) is not matches
+                                        for name, matches in self._rounds):
+            self._matches, self._rounds, self._starts = {}, [], []
+        indexed = {name for name, _ in self._rounds}
+        total = self._starts[-1] + len(self._rounds[-1][1]) if self._rounds else 0
+        add = self._matches.setdefault
+        for round_name, matches in rounds.items():
+            if round_name in indexed or not len(matches):
+                continue
+            self._rounds.append((round_name, matches))
+            self._starts.append(total)
+            pairings = round_pairings.get(round_name)
+            if pairings is not None:
+                sides = ((a, b) for _, a, b in pairings)
+            elif isinstance(matches, storage.MatchRange):
+                table = matches.table
+                sides = zip(table.team1[matches.start:matches.stop],
+                            table.team2[matches.start:matches.stop])
+            else:
+                sides = ((self.index_of(match.team1), self.index_of(match.team2))
+                         for match in matches)
+            for number, (a, b) in enumerate(sides, total):
+                add(a, []).append(number)
+                add(b, []).append(number)
+            total += len(matches)
+
+    def matches_of(self, team):
+        # [(round name, match), ...] in play order; call sync_rounds first
+        found = []
+        for number in (self._matches or {}).get(self.index_of(team), ()):
+            r = bisect.bisect_right(self._starts, number) - 1
+            round_name, matches = self._rounds[r]
+            found.append((round_name, matches[number - self._starts[r]]))
+        return found
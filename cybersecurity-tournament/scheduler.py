@@ -0,0 +1,650 @@
+import bisect
+import random
+from array import array
+from operator import attrgetter
+
+import bracket
+import group_stage
+import grouping
+import loader
+import profiling
+import registry
+import storage
+import streams
+
+# ---------------------------- DATA CLASSES ---------------------------- #
+class Team:
+    __slots__ = ("name", "members", "rank")
+
+    def __init__(self, name, members, rank):
+        self.name = name
+        self.members = members
+        self.rank = rank
+
+class Match:
+    __slots__ = ("team1", "team2", "round_name", "status", "winner")
+
+    def __init__(self, team1, team2, round_name):
+        self.team1 = team1
+        self.team2 = team2
+        self.round_name = round_name
+        self.status = "Scheduled"
+        self.winner = None
+
+    def complete(self, win_probability=None, draw=None):
+        # win_probability(rank1, rank2) -> chance team1 wins, e.g. a
+        # simulation.RankLogistic(); a coin flip when not given. draw is the
+        # uniform number that decides it; Scheduler passes one from its own
+        # streams, a lone Match falls back to the random module.
+        if draw is None:
+            draw = random.random()
+        p = 0.5 if win_probability is None else win_probability(self.team1.rank, self.team2.rank)
+        return self.record(self.team1 if draw < p else self.team2)
+
+    def record(self, winner):
+        self.status = "Completed"
+        self.winner = winner
+        return winner
+
+# ---------------------------- HELPERS ---------------------------- #
+rank_of = attrgetter("rank")
+
+def in_sorted(values, value):
+    i = bisect.bisect_left(values, value)
+    return i < len(values) and values[i] == value
+
+class Scheduler:
+    def __init__(self, compact=False, seed=None):
+        # compact=True keeps teams and matches in storage.TeamTable/MatchTable
+        # columns instead of one Python object each. seed fixes every draw and
+        # result (see streams.py); a random one is picked when not given.
+        self.compact = compact
+        self.rng = streams.Streams(seed)
+        self.events = streams.EventLog(self.rng.seed)
+        self.match_table = None
+        self.teams = []
+        self.group_A = []
+        self.group_B = []
+        self.groups = []
+        self.group_seeding = "pots"     # how the groups were divided, see update_teams()
+        self.rounds = {
+            "Round 1": [],
+            "Quarter Final": [],
+            "Semi Final": [],
+            "Final": []
+        }
+        self.winner = None
+        self.load_report = None
+        self.bracket = None
+        self.round_pairings = {}
+        self.group_stage = None
+        self.timetable = None
+        self.store = None               # database.Recorder, see attach_store()
+        self.ratings = None             # ratings.TournamentRatings, see attach_ratings()
+        self._names = None              # (teams, name -> Team), see update_teams()
+        self.revisions = {}             # part of the state -> changes, see revision()
+        self._registry = None
+
+    @profiling.traced("load_teams", "filename")
+    def load_teams(self, filename, top_k=None, progress=None, ratings=None):
+        # Streams the file in chunks; malformed rows end up in self.load_report
+        # instead of aborting. top_k keeps only the best-ranked K teams.
+        # progress(report) is called after every parsed batch and may raise to
+        # abort the load, leaving the previous teams in place. With a
+        # ratings.RatingTable the teams are ranked 1..N by rating instead (the
+        # file's rank breaks ties) and every result updates the table.
+        if ratings is None and self.ratings is not None:
+            ratings = self.ratings.table
+        report = loader.LoadReport()
+        report.progress = progress
+        with report.timed():
+            if ratings is None:
+                rows = loader.iter_ranked(filename, report, top_k)
+            else:
+                rows = ratings.ranked(loader.iter_ranked(filename, report, top_k,
+                                                         ratings.order_key()))
+            if self.compact:
+                teams = storage.TeamTable.from_rows(rows)
+            else:
+                teams = [Team(name, members, rank) for rank, _, name, members in rows]
+        self.teams = teams
+        self.load_report = report
+        profiling.count("teams loaded", report.rows)
+        profiling.count("malformed rows", report.malformed)
+        if self.compact:
+            self.match_table = storage.MatchTable(teams)
+        if ratings is not None:
+            self.ratings = ratings.bind(teams)
+        self._touch("teams", "groups", "bracket", "results")
+        if self.store is not None:
+            # New teams, new tournament in the database
+            self.store.start(self)
+        return True
+
+    @profiling.traced("update_teams")
+    def update_teams(self, rows=(), removed=()):
+        # Applies registration changes without loading the file again (see
+        # watch.py): rows are (name, members, rank) for new teams or new
+        # details of existing ones, removed are names of withdrawn teams.
+        # Teams are identified by name. Changed and new teams are merged
+        # into the rank order (equal ranks go last, as appended lines would)
+        # and the groups keep their teams: a new team joins the group of the
+        # team seeded just above it for pots, the smallest group otherwise.
+        # Once a round is scheduled only member changes are taken, anything
+        # else raises ValueError; a draw without rounds is dropped.
+        # Returns (added, changed, removed) names.
+        if self.compact:
+            raise ValueError("team changes need Team objects, not compact storage")
+        teams = self.teams
+        by_name = self._team_names()
+        added, changed, moved, gone = [], [], {}, {}
+        for name in removed:
+            team = by_name.get(name)
+            if team is not None:
+                gone[self._position(team)] = team
+        for name, members, rank in rows:
+            team = by_name.get(name)
+            if team is None:
+                added.append(Team(name, members, rank))
+            elif team.rank != rank:
+                moved[self._position(team)] = (team, members, rank)
+            elif team.members != members:
+                changed.append((team, members))
+
+        if added or moved or gone:
+            if any(self.round_pairings) or any(len(matches) for matches in self.rounds.values()):
+                raise ValueError("rounds have already been scheduled; only team members can "
+                                 "change now")
+            if self.ratings is not None:
+                raise ValueError("teams are ranked by rating; load the file again instead")
+        for team, members in changed:
+            team.members = members
+        if not (added or moved or gone):
+            return [], [team.name for team, _ in changed], []
+
+        # The teams that stay put, as slices between the ones that leave
+        leaving = sorted(gone.keys() | moved.keys())
+        staying = []
+        segments = []           # (old start, old stop, position in staying)
+        start = 0
+        for i in leaving + [len(teams)]:
+            if i > start:
+                segments.append((start, i, len(staying)))
+                staying.extend(teams[start:i])
+            start = i + 1
+        for team in gone.values():
+            del by_name[team.name]
+
+        # Everything that (re)enters the rank order, in rank order itself,
+        # goes in between slices of the teams that stay
+        incoming = [(team.rank, n, team) for n, team in enumerate(added)]
+        for team, members, rank in moved.values():
+            team.members, team.rank = members, rank
+            incoming.append((rank, len(incoming), team))
+        incoming.sort()
+        new_teams = []
+        shifted = array("i", [0]) * len(staying)   # position in staying -> new index
+        placed = {}                                 # id(incoming team) -> new index
+        start = 0
+        for rank, _, team in incoming:
+            stop = bisect.bisect_right(staying, rank, start, key=rank_of)
+            shifted[start:stop] = array("i", range(len(new_teams), len(new_teams) + stop - start))
+            new_teams.extend(staying[start:stop])
+            placed[id(team)] = len(new_teams)
+            new_teams.append(team)
+            start = stop
+        shifted[start:] = array("i", range(len(new_teams), len(new_teams) + len(staying) - start))
+        new_teams.extend(staying[start:])
+        remap = array("i", [-1]) * len(teams)      # old index -> new index, -1 if gone
+        for old_start, old_stop, position in segments:
+            remap[old_start:old_stop] = shifted[position:position + old_stop - old_start]
+        for i, (team, _, _) in moved.items():
+            remap[i] = placed[id(team)]
+        for team in added:
+            by_name[team.name] = team
+
+        if self.groups:
+            # Same groups over the new indices; moved teams stay in theirs
+            index_of = self.registry.index_of
+            groups = []
+            for group in self.groups:
+                indices = (group.indices if isinstance(group, registry.TeamView)
+                           else map(index_of, group))
+                group = list(map(remap.__getitem__, indices))
+                if gone or moved:
+                    group = sorted(i for i in group if i >= 0)
+                groups.append(group)
+            for i in sorted(placed[id(team)] for team in added):
+                if self.group_seeding == "pots":
+                    g = next((g for g, group in enumerate(groups) if in_sorted(group, i - 1)), 0)
+                else:
+                    g = min(range(len(groups)), key=lambda g: len(groups[g]))
+                bisect.insort(groups[g], i)
+            self.groups = [registry.TeamView(new_teams, array("i", group)) for group in groups]
+            self.group_A = self.groups[0]
+            self.group_B = self.groups[1] if len(self.groups) > 1 else []
+
+        self.teams = new_teams
+        self._names = (new_teams, by_name)
+        draw = self.bracket is not None or self.group_stage is not None
+        if draw:
+            # Drawn for the old teams and not played yet: draw again later
+            self.bracket = None
+            self.group_stage = None
+            self.rounds = {}
+            self.round_pairings = {}
+            self.winner = None
+            self.events = streams.EventLog(self.rng.seed)
+        if self.timetable is not None:
+            self.timetable = type(self.timetable)(self.timetable.rooms, len(new_teams),
+                                                  self.timetable.duration, self.timetable.rest)
+        self._touch("teams", "groups", *(("bracket", "results") if draw else ()))
+        if self.store is not None:
+            self.store.teams(self)
+        return ([team.name for team in added],
+                [team.name for team, _ in changed] + [team.name for team, _, _ in moved.values()],
+                [team.name for team in gone.values()])
+
+    def _team_names(self):
+        # name -> Team, kept up to date by update_teams instead of rebuilt
+        if self._names is None or self._names[0] is not self.teams:
+            self._names = (self.teams, {team.name: team for team in self.teams})
+        return self._names[1]
+
+    def _position(self, team):
+        # Index of a Team: a bisect by rank, as teams are kept in rank order
+        teams = self.teams
+        i = bisect.bisect_left(teams, team.rank, key=rank_of)
+        while i < len(teams) and teams[i] is not team and teams[i].rank == team.rank:
+            i += 1
+        if i < len(teams) and teams[i] is team:
+            return i
+        return self.registry.index_of(team)
+
+    @profiling.traced("divide_groups", "group_count", "seeding")
+    def divide_groups(self, group_count=2, seeding="pots", separate=None):
+        # By default Group A holds the top half of the teams by seed and Group B
+        # the rest. See grouping.py for snake and random seeding; separate(team)
+        # returns an organization key that should not repeat within a group.
+        # More groups than teams are cut down to one team per group, so the
+        # default two groups still work for a single team.
+        group_count = min(group_count, max(1, len(self.teams)))
+        org_of = None
+        if separate is not None:
+            org_of = lambda index: separate(self.teams[index])
+        # self.teams is already in seed order, so no ranks are passed
+        divided = grouping.divide(len(self.teams), group_count, seeding,
+                                  self.rng.stream("groups"), org_of)
+        self.groups = [registry.TeamView(self.teams, indices) for indices in divided]
+        self.group_seeding = seeding
+        self.group_A = self.groups[0]
+        self.group_B = self.groups[1] if len(self.groups) > 1 else []
+        self._touch("groups")
+        if self.store is not None:
+            self.store.groups(self)
+        return self.groups
+
+    @profiling.traced("build_bracket", "double_elimination")
+    def build_bracket(self, double_elimination=False, random_draw=False, entrants=None):
+        # random_draw draws Group A against Group B at random; otherwise the
+        # standard 1 vs N, 2 vs N-1, ... seeding is used. entrants limits the
+        # bracket to those team indices (in seed order); group stage rounds
+        # already played stay in self.rounds ahead of the knockout rounds.
+        rng = self.rng.stream("draw") if random_draw else None
+        self.bracket = bracket.build(len(self.teams), double_elimination, rng, entrants)
+        self.events = streams.EventLog(self.rng.seed, double_elimination, random_draw, entrants)
+        kept = self.group_stage.round_names if self.group_stage is not None else ()
+        self.rounds = {name: self.rounds.get(name, []) for name in kept}
+        self.rounds.update((name, []) for name in self.bracket.round_names)
+        self.round_pairings = {name: self.round_pairings[name]
+                               for name in kept if name in self.round_pairings}
+        self.winner = None
+        if self.bracket.champion >= 0:
+            self.winner = self.teams[self.bracket.champion]
+        if self.compact and not kept:
+            self.match_table = storage.MatchTable(self.teams)
+        if self.timetable is not None and not kept:
+            self.timetable.reset()
+        self._touch("bracket", "results")
+        if self.store is not None:
+            self.store.setup(self)
+        return self.bracket
+
+    @profiling.traced("start_group_stage", "advance")
+    def start_group_stage(self, advance=2, win_points=group_stage.WIN_POINTS,
+                          loss_points=group_stage.LOSS_POINTS):
+        # Round robin inside every group (divide_groups first, any K); the top
+        # `advance` of each group go on to start_knockout()
+        if not self.groups:
+            self.divide_groups()
+        indices = [group.indices if isinstance(group, registry.TeamView)
+                   else [self.registry.index_of(team) for team in group]
+                   for group in self.groups]
+        self.group_stage = group_stage.GroupStage(indices, len(self.teams), advance,
+                                                  win_points, loss_points)
+        self.bracket = None
+        self.rounds = {name: [] for name in self.group_stage.round_names}
+        self.round_pairings = {}
+        self.winner = None
+        if self.compact:
+            self.match_table = storage.MatchTable(self.teams)
+        if self.timetable is not None:
+            self.timetable.reset()
+        self._touch("bracket", "results")
+        if self.store is not None:
+            self.store.setup(self)
+        return self.group_stage
+
+    def start_knockout(self, double_elimination=False, random_draw=False):
+        # Seeds the group stage qualifiers into the bracket: group winners
+        # first, so winners meet runners-up in the first knockout round
+        return self.build_bracket(double_elimination, random_draw,
+                                  self.group_stage.qualifiers())
+
+    def start_timetable(self, rooms, duration=1, rest=0):
+        # Gives every scheduled match a start slot and a room (timetable.py);
+        # rounds scheduled from now on are slotted as they are scheduled
+        import timetable
+        self.timetable = timetable.Timetable(rooms, len(self.teams), duration, rest)
+        for round_name in self.round_names:
+            if round_name in self.round_pairings:
+                self.timetable.assign(round_name, self.round_sides(round_name))
+        return self.timetable
+
+    def attach_store(self, store, name=None):
+        # Keeps this tournament in a database.TournamentStore from now on:
+        # what is there already is written at once, every later load,
+        # division, round and result as it happens
+        self.store = store.create(self, name)
+        return self.store
+
+    def attach_ratings(self, table):
+        # Updates a ratings.RatingTable with every result from now on, e.g.
+        # for a restored tournament; the teams keep their ranks. replay()
+        # leaves the table alone, as those results were counted already.
+        self.ratings = table.bind(self.teams)
+        return self.ratings
+
+    def round_sides(self, round_name):
+        # (team index, team index) of every match of a scheduled round
+        pairings = self.round_pairings.get(round_name)
+        if pairings is not None:
+            return [(a, b) for _, a, b in pairings]
+        if self.is_group_round(round_name):
+            return self.group_stage.fixtures[round_name]
+        index_of = self.registry.index_of
+        return [(index_of(match.team1), index_of(match.team2))
+                for match in self.rounds[round_name]]
+
+    def revision(self, *parts):
+        # How often each part of the state ("teams", "groups", "bracket",
+        # "results" or a round name) has changed, so views can tell whether
+        # what they show is still current without comparing it
+        revisions = self.revisions
+        return tuple(revisions.get(part, 0) for part in parts)
+
+    def _touch(self, *parts):
+        revisions = self.revisions
+        for part in parts:
+            revisions[part] = revisions.get(part, 0) + 1
+
+    def is_group_round(self, round_name):
+        return self.group_stage is not None and round_name in self.group_stage.round_lookup
+
+    @property
+    def registry(self):
+        # Name/member/rank/match indexes over the current teams (registry.py);
+        # rebuilt lazily whenever self.teams is replaced
+        if self._registry is None or self._registry.teams is not self.teams:
+            self._registry = registry.TeamRegistry(self.teams)
+        return self._registry
+
+    def find_team(self, name):
+        return self.registry.find(name)
+
+    def matches_of(self, team):
+        # [(round name, match), ...] for every match the team was scheduled in
+        index = self.registry
+        index.sync_rounds(self.rounds, self.round_pairings)
+        return index.matches_of(team)
+
+    @property
+    def round_names(self):
+        return list(self.rounds)
+
+    def open_matches(self, round_name):
+        # Matches of a round still without a result; compact rounds count
+        # the winner column instead of building a MatchRef per match
+        matches = self.rounds[round_name]
+        if isinstance(matches, storage.MatchRange):
+            return matches.table.winners[matches.start:matches.stop].count(storage.NO_TEAM)
+        return sum(match.winner is None for match in matches)
+
+    def next_round(self, round_name):
+        names = self.round_names
+        index = names.index(round_name) + 1
+        return names[index] if index < len(names) else None
+
+    @profiling.traced("schedule_round", "round_name")
+    def schedule_round(self, round_name):
+        # Matches come from the bracket (byes never show up as matches) or,
+        # for a group matchday, from the round-robin fixtures. A round is
+        # scheduled once it has an entry in round_pairings; group rounds store
+        # None there since they don't advance anyone through the bracket.
+        if self.is_group_round(round_name):
+            fixtures = self.group_stage.pairings(round_name)
+            if self.compact:
+                indices = array("i")
+                for a, b in fixtures:
+                    indices.append(a)
+                    indices.append(b)
+                matches = self.match_table.add_round(indices, round_name)
+            else:
+                matches = [Match(self.teams[a], self.teams[b], round_name) for a, b in fixtures]
+            self.rounds[round_name] = matches
+            self.round_pairings[round_name] = None
+            self._touch(round_name)
+            if self.timetable is not None:
+                self.timetable.assign(round_name, fixtures)
+            if self.store is not None:
+                self.store.round(self, round_name)
+            profiling.count("matches scheduled", len(matches))
+            return matches
+
+        pairings = self.bracket.pairings(self.bracket.round_index(round_name))
+        if self.compact:
+            indices = array("i")
+            for _, a, b in pairings:
+                indices.append(a)
+                indices.append(b)
+            matches = self.match_table.add_round(indices, round_name)
+        else:
+            matches = [Match(self.teams[a], self.teams[b], round_name)
+                       for _, a, b in pairings]
+        self.rounds[round_name] = matches
+        self.round_pairings[round_name] = pairings
+        self._touch(round_name)
+        if self.timetable is not None:
+            self.timetable.assign(round_name, ((a, b) for _, a, b in pairings))
+        if self.store is not None:
+            self.store.round(self, round_name)
+        profiling.count("matches scheduled", len(matches))
+        return matches
+
+    @profiling.traced("schedule_matches", "round_name")
+    def schedule_matches(self, teams, round_name):
+        if self.compact:
+            indices = array("i", (team.index for team in teams))
+            self.rng.stream("shuffle", round_name).shuffle(indices)
+            matches = self.match_table.add_round(indices, round_name)
+        else:
+            self.rng.stream("shuffle", round_name).shuffle(teams)
+            matches = []
+            for i in range(0, len(teams), 2):
+                match = Match(teams[i], teams[i+1], round_name)
+                matches.append(match)
+        self.rounds[round_name] = matches
+        self._touch(round_name)
+        if self.store is not None:
+            self.store.round(self, round_name)
+        return matches
+
+    @profiling.traced("complete_round", "round_name")
+    def complete_round(self, round_name, win_probability=None):
+        # Plays every match of the round that has no winner yet. Match i always
+        # gets the i-th draw of the round's stream, so a round finished in
+        # several goes ends up the same as one played in one go.
+        matches = self.rounds[round_name]
+        stream = self.rng.stream("round", round_name)
+        draws = [stream.random() for _ in range(len(matches))]
+        pairings = self.round_pairings.get(round_name)
+        r = self.bracket.round_index(round_name) if pairings is not None else None
+        fixtures = (self.group_stage.fixtures[round_name]
+                    if self.is_group_round(round_name) else None)
+        winners = []
+        played = 0
+        for i, match in enumerate(matches):
+            if match.winner is not None:
+                winners.append(match.winner)
+                continue
+            winners.append(match.complete(win_probability, draws[i]))
+            self._book(match, i, r, pairings, fixtures, draws[i])
+            played += 1
+        profiling.count("matches played", played)
+
+        if pairings is not None:
+            if self.bracket.champion >= 0:
+                self.winner = self.teams[self.bracket.champion]
+        elif round_name == "Final":
+            self.winner = winners[0]
+        self._touch(round_name, "results")
+        if self.store is not None:
+            self.store.results(self, round_name)
+        return winners
+
+    def record_result(self, round_name, i, winner):
+        # Enters the result of match i from outside (a judge, see scoring.py)
+        # instead of drawing it. winner is the match's team1 or team2; the
+        # event log gets NaN as its draw.
+        match = self.rounds[round_name][i]
+        if match.winner is not None:
+            raise ValueError(f"{round_name} match {i + 1} already has a result")
+        if winner != match.team1 and winner != match.team2:
+            raise ValueError(f"{winner.name} does not play {round_name} match {i + 1}")
+        match.record(winner)
+        pairings = self.round_pairings.get(round_name)
+        r = self.bracket.round_index(round_name) if pairings is not None else None
+        fixtures = (self.group_stage.fixtures[round_name]
+                    if self.is_group_round(round_name) else None)
+        self._book(match, i, r, pairings, fixtures, float("nan"))
+        if pairings is not None:
+            if self.bracket.champion >= 0:
+                self.winner = self.teams[self.bracket.champion]
+        elif round_name == "Final":
+            self.winner = match.winner
+        self._touch(round_name, "results")
+        if self.store is not None:
+            self.store.result(self, round_name, i)
+        return match
+
+    def _book(self, match, i, r, pairings, fixtures, draw):
+        # Carries a decided match into the bracket and event log, or into the
+        # group standings (which move one result at a time), and the ratings
+        if r is not None:
+            key, a, b = pairings[i]
+            winner = a if match.winner == match.team1 else b
+            self.bracket.record(r, key, winner)
+            self.events.record(r, key, winner, draw)
+        elif fixtures is not None:
+            a, b = fixtures[i]
+            if match.winner == match.team1:
+                self.group_stage.record(a, b)
+            else:
+                self.group_stage.record(b, a)
+        elif self.ratings is not None:
+            a = self.registry.index_of(match.team1)
+            b = self.registry.index_of(match.team2)
+        if self.ratings is not None:
+            if match.winner == match.team1:
+                self.ratings.record(a, b)
+            else:
+                self.ratings.record(b, a)
+
+    @profiling.traced("replay", "upto")
+    def replay(self, events=None, upto=None):
+        # Rebuilds the bracket and re-applies the first `upto` results of an
+        # EventLog (all of them by default) to the loaded teams. Nothing is
+        # drawn and no win model runs, so jumping to any point of a finished
+        # tournament is much cheaper than playing it again. The Scheduler
+        # takes over the log's seed, so play can carry on from there.
+        events = events if events is not None else self.events
+        count = len(events) if upto is None else min(upto, len(events))
+        self.rng = streams.Streams(events.seed)
+        self.build_bracket(events.double_elimination, events.random_draw, events.entrants)
+        names = self.bracket.round_names
+        scheduled = 0
+        i = 0
+        while i < count:
+            r = events.rounds[i]
+            # Rounds with no results (all byes) still have to settle in order
+            while scheduled < r:
+                self.schedule_round(names[scheduled])
+                scheduled += 1
+            round_name = names[r]
+            matches = self.schedule_round(round_name)
+            scheduled = r + 1
+            end = bisect.bisect_right(events.rounds, r, i, count)
+            keys = events.keys[i:end]
+            winners = events.winners[i:end]
+            self._replay_round(r, matches, self.round_pairings[round_name], keys, winners)
+            self.events.rounds.extend(events.rounds[i:end])
+            self.events.keys.extend(keys)
+            self.events.winners.extend(winners)
+            self.events.draws.extend(events.draws[i:end])
+            i = end
+        if self.bracket.champion >= 0:
+            self.winner = self.teams[self.bracket.champion]
+        self._touch("results", *names)
+        return self
+
+    def _replay_round(self, r, matches, pairings, keys, winners):
+        # Results are normally logged in pairing order; only look keys up when not
+        if keys == array("i", [key for key, _, _ in pairings[:len(keys)]]):
+            positions = range(len(keys))
+        else:
+            lookup = {key: m for m, (key, _, _) in enumerate(pairings)}
+            positions = [lookup[key] for key in keys]
+        record = self.bracket.record
+        for key, winner in zip(keys, winners):
+            record(r, key, winner)
+        if self.compact and isinstance(positions, range):
+            # Whole block of MatchTable rows at once
+            table = matches.table
+            start = matches.start
+            table.winners[start:start + len(winners)] = winners
+            table.status_codes[start:start + len(winners)] = array(
+                "b", [storage.STATUS_CODES["Completed"]]) * len(winners)
+            return
+        teams = self.teams
+        for m, winner in zip(positions, winners):
+            matches[m].record(teams[winner])
+
+    def save(self, path):
+        # Binary checkpoint, see snapshot.py
+        import snapshot
+        return snapshot.save(self, path)
+
+    @classmethod
+    def restore(cls, path, compact=True):
+        import snapshot
+        return snapshot.load(path, compact)
+
+    def simulate(self, runs, win_probability=None, seed=None, processes=1):
+        # Monte Carlo over the standard seeding of the loaded teams; needs NumPy.
+        # Without a seed the run is still reproducible from the Scheduler's own.
+        # For odds from the ratings pass self.ratings.model().
+        import simulation
+        ranks = [team.rank for team in self.teams]
+        if seed is None:
+            seed = self.rng.split("simulate").seed
+        return simulation.simulate(ranks, runs, win_probability, seed, processes)
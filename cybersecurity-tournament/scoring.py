@@ -0,0 +1,357 @@
+import asyncio
+import json
+import threading
+
+# Live results from judges. A small asyncio server takes score events as JSON
+# Lines over a local TCP socket:
+#   {"round": "Round 1", "match": 3, "winner": "Team A"}
+#   {"round": "Round 1", "match": 3, "winner": 2}           # team1 or team2
+#   {"round": "Round 1", "match": 3, "scores": [120, 95]}   # higher score wins
+#   {"get": "round", "round": "Round 1"}                     # current matchups
+#   {"get": "status"}
+# Match numbers are 1-based, as the GUI and CLI print them. Every line gets
+# exactly one reply line, in order; an "id" field is echoed back.
+#
+# Connections only parse; a single applier task owns the Scheduler. It takes
+# whatever events have queued up (up to BATCH_SIZE), checks them against the
+# current rounds and applies them in one go under `lock`, so the GUI can take
+# the same lock around its own writes. Once a round has all its results the
+# next one is scheduled, so winners move on as soon as their round closes.
+# Listeners get the (round name, match index) pairs each batch changed.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+HOST = "127.0.0.1"
+PORT = 8765
+BATCH_SIZE = 1024
+LINE_LIMIT = 64 * 1024
+
+class ScoreError(ValueError):
+    pass
+
+# ---------------------------- EVENTS ---------------------------- #
+def parse_event(line):
+    # One JSON line -> dict with round, match (0-based) and winner/scores
+    try:
+        event = json.loads(line)
+    except ValueError as e:
+        raise ScoreError(f"not JSON: {e}") from None
+    if not isinstance(event, dict):
+        raise ScoreError("expected a JSON object")
+    if "get" in event:
+        if not isinstance(event["get"], str):
+            raise ScoreError("get must be a query name")
+        if event["get"] == "round" and not isinstance(event.get("round"), str):
+            raise ScoreError("missing round")
+        return event
+    round_name = event.get("round")
+    number = event.get("match")
+    if not isinstance(round_name, str):
+        raise ScoreError("missing round")
+    if not isinstance(number, int) or isinstance(number, bool) or number < 1:
+        raise ScoreError("match must be a number from 1")
+    event["match"] = number - 1
+    if "winner" in event:
+        if not isinstance(event["winner"], (str, int)) or isinstance(event["winner"], bool):
+            raise ScoreError("winner must be a team name, 1 or 2")
+    elif "scores" in event:
+        scores = event["scores"]
+        if (not isinstance(scores, list) or len(scores) != 2
+                or not all(isinstance(x, (int, float)) and not isinstance(x, bool) for x in scores)):
+            raise ScoreError("scores must be [team1, team2] numbers")
+        if scores[0] == scores[1]:
+            raise ScoreError("scores are level, matches need a winner")
+        event["winner"] = 1 if scores[0] > scores[1] else 2
+    else:
+        raise ScoreError("need winner or scores")
+    return event
+
+# ---------------------------- SERVICE ---------------------------- #
+class ScoreService:
+    def __init__(self, scheduler, host=HOST, port=PORT, batch_size=BATCH_SIZE, knockout=None):
+        # knockout: (double_elimination, random_draw) to start the bracket by
+        # itself once a group stage has all its results; None leaves that to
+        # the caller
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.knockout = knockout
+        self.lock = threading.Lock()
+        self.listeners = []
+        self.applied = 0
+        self.rejected = 0
+        self.batches = 0
+        self._remaining = {}     # open round -> matches still without a result
+        self._queue = None
+        self._server = None
+        self._writers = set()
+        self._applier = None
+        self._loop = None
+        self._thread = None
+
+    # ---------------- applying ---------------- #
+    def apply(self, events):
+        # Validates and applies a batch; returns one reply per event. Each
+        # event stands alone: one that fails, however, gets the error and the
+        # results before and after it are kept, replied to and passed on to
+        # the listeners.
+        replies = []
+        changed = []
+        scheduled = []
+        warnings = []
+        with self.lock:
+            for event in events:
+                try:
+                    replies.append(self.apply_one(event, changed))
+                except (ScoreError, ValueError) as e:
+                    self.rejected += 1
+                    replies.append({"ok": False, "error": str(e)})
+                except Exception as e:
+                    self.rejected += 1
+                    replies.append({"ok": False, "error": f"internal error: {e}"})
+            self.applied += len(changed)
+            self.batches += 1
+            if changed:
+                try:
+                    if self.scheduler.store is not None:
+                        # One database transaction per batch of results
+                        self.scheduler.store.flush(self.scheduler)
+                    scheduled = self.advance()
+                except Exception as e:
+                    warnings.append(f"recorded, but not saved or advanced: {e}")
+        if changed or scheduled:
+            for listener in self.listeners:
+                try:
+                    listener(changed, scheduled)
+                except Exception as e:
+                    warnings.append(f"recorded, but a listener failed: {e}")
+        for event, reply in zip(events, replies):
+            if "id" in event:
+                reply["id"] = event["id"]
+            if warnings and reply.get("recorded"):
+                reply["warning"] = "; ".join(warnings)
+            reply.pop("recorded", None)
+        return replies
+
+    def apply_one(self, event, changed):
+        # Reply for one event; appends (round, index) to changed once recorded
+        if "get" in event:
+            return self.query(event)
+        round_name, i = self.check(event)
+        match = self.scheduler.rounds[round_name][i]
+        winner = self.winner_of(match, event["winner"])
+        if match.winner is not None:
+            if match.winner != winner:
+                raise ScoreError(f"{round_name} match {i + 1} was already won by "
+                                 f"{match.winner.name}")
+            return {"ok": True, "duplicate": True}
+        self.scheduler.record_result(round_name, i, winner)
+        self._remaining[round_name] -= 1
+        changed.append((round_name, i))
+        return {"ok": True, "recorded": True}
+
+    def check(self, event):
+        round_name = event["round"]
+        scheduler = self.scheduler
+        if round_name not in scheduler.rounds:
+            raise ScoreError(f"no round called {round_name!r}")
+        if round_name not in scheduler.round_pairings:
+            raise ScoreError(f"{round_name} is not scheduled yet")
+        i = event["match"]
+        if i >= len(scheduler.rounds[round_name]):
+            raise ScoreError(f"{round_name} has {len(scheduler.rounds[round_name])} matches")
+        if round_name not in self._remaining:
+            self._count(round_name)
+        return round_name, i
+
+    def winner_of(self, match, winner):
+        if winner == 1 or winner == 2:
+            return match.team1 if winner == 1 else match.team2
+        if isinstance(winner, str):
+            if winner == match.team1.name:
+                return match.team1
+            if winner == match.team2.name:
+                return match.team2
+        raise ScoreError(f"{winner!r} is not in {match.team1.name} vs {match.team2.name}")
+
+    def _count(self, round_name):
+        self._remaining[round_name] = self.scheduler.open_matches(round_name)
+
+    def resync(self):
+        # After results were entered some other way (e.g. RUN in the GUI)
+        with self.lock:
+            self._remaining.clear()
+            return self.advance()
+
+    def advance(self):
+        # Schedules every round whose predecessors have all their results;
+        # caller holds the lock. Returns the newly scheduled round names.
+        scheduler = self.scheduler
+        scheduled = []
+        while True:
+            for round_name in scheduler.round_names:
+                if round_name not in scheduler.round_pairings:
+                    scheduler.schedule_round(round_name)
+                    scheduled.append(round_name)
+                if round_name not in self._remaining:
+                    self._count(round_name)
+                if self._remaining[round_name]:
+                    return scheduled
+            stage = scheduler.group_stage
+            if self.knockout is None or stage is None or scheduler.bracket is not None:
+                return scheduled
+            scheduler.start_knockout(*self.knockout)
+
+    def query(self, event):
+        scheduler = self.scheduler
+        if event["get"] == "status":
+            return {"ok": True,
+                    "rounds": [{"name": name, "matches": len(scheduler.rounds[name]),
+                                "open": self._remaining.get(name)}
+                               for name in scheduler.round_names if name in scheduler.round_pairings],
+                    "winner": scheduler.winner.name if scheduler.winner is not None else None}
+        if event["get"] == "round":
+            round_name = event.get("round")
+            if round_name not in scheduler.round_pairings:
+                raise ScoreError(f"{round_name!r} is not scheduled")
+            return {"ok": True, "round": round_name,
+                    "matches": [[match.team1.name, match.team2.name,
+                                 match.winner.name if match.winner is not None else None]
+                                for match in scheduler.rounds[round_name]]}
+        raise ScoreError(f"unknown query {event['get']!r}")
+
+    # ---------------- serving ---------------- #
+    async def start(self):
+        if self.scheduler.bracket is None and self.scheduler.group_stage is None:
+            raise ScoreError("build a bracket or start a group stage before taking scores")
+        self._queue = asyncio.Queue()
+        with self.lock:
+            self.advance()
+        self._server = await asyncio.start_server(self._client, self.host, self.port,
+                                                  limit=LINE_LIMIT)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._applier = asyncio.ensure_future(self._apply_batches())
+        return self._server
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+    async def _apply_batches(self):
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                replies = self.apply([event for event, _ in batch])
+            except Exception as e:
+                # apply() answers per event and reports listener failures
+                # itself; anything left is the lock or the batch itself
+                replies = [{"ok": False, "error": f"internal error: {e}"} for _ in batch]
+            for (_, future), reply in zip(batch, replies):
+                if not future.done():
+                    future.set_result(reply)
+
+    async def _client(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        pending = asyncio.Queue()
+        self._writers.add(writer)
+
+        async def reply_in_order():
+            while True:
+                future = await pending.get()
+                if future is None:
+                    break
+                writer.write(json.dumps(await future).encode() + b"\n")
+                if pending.empty():
+                    await writer.drain()
+
+        replier = asyncio.ensure_future(reply_in_order())
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    future = loop.create_future()
+                    future.set_result({"ok": False, "error": "line too long"})
+                    await pending.put(future)
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                future = loop.create_future()
+                try:
+                    event = parse_event(line)
+                except ScoreError as e:
+                    self.rejected += 1
+                    future.set_result({"ok": False, "error": str(e)})
+                else:
+                    await self._queue.put((event, future))
+                await pending.put(future)
+        except ConnectionError:
+            pass
+        finally:
+            await pending.put(None)
+            try:
+                await replier
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writers.discard(writer)
+
+    async def close(self):
+        # Stops listening, hangs up on every client (their handlers finish
+        # the replies they owe as far as the sockets allow) and stops applying
+        self._server.close()
+        handlers = [task for task in asyncio.all_tasks()
+                    if task is not asyncio.current_task() and task is not self._applier]
+        for writer in list(self._writers):
+            writer.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        self._applier.cancel()
+        await asyncio.gather(self._applier, return_exceptions=True)
+
+    # ---------------- background thread ---------------- #
+    def start_in_thread(self):
+        # Runs the server on its own event loop thread (used by the GUI);
+        # returns once the port is bound
+        ready = threading.Event()
+        failure = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            try:
+                loop.run_until_complete(self.start())
+            except (OSError, ScoreError) as e:
+                failure.append(e)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            try:
+                loop.run_forever()
+                loop.run_until_complete(self.close())
+            finally:
+                loop.close()
+
+        self._thread = threading.Thread(target=run, name="scoring", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            self._loop = None
+            raise failure[0]
+        return self.host, self.port
+
+    def stop(self):
+        loop = self._loop
+        if loop is None:
+            return
+        self._loop = None
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
@@ -0,0 +1,500 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import cli
+import loader
+import scoring
+from scheduler import Scheduler
+
+# Hosts many tournaments in one process behind a small JSON-over-HTTP API.
+# Every tournament is its own Scheduler with its own lock, so requests for
+# different tournaments run side by side on the server's threads while two
+# requests for the same one take turns. Monte Carlo odds go to a process pool.
+#
+# Tournaments that nobody touched for `idle_seconds`, or the least recently
+# used ones beyond `max_active`, are written to a snapshot in `directory`
+# (snapshot.py) and dropped from memory; the next request maps them back in.
+# close() snapshots everything, and a host started on the same directory picks
+# those snapshots up again as evicted tournaments.
+#
+#   GET    /stats                              host counters and memory
+#   GET    /tournaments                        every tournament and whether it is loaded
+#   POST   /tournaments                        {"teams": path in directory | "lines": [...],
+#                                              options}
+#   GET    /tournaments/ID                     rounds, progress, winner
+#   DELETE /tournaments/ID
+#   POST   /tournaments/ID/play                {"rounds": n, "model": "coin"}; all by default
+#   GET    /tournaments/ID/rounds/NAME         ?start=0&limit=100 matches of one round
+#   POST   /tournaments/ID/results             score events as in scoring.py (one or a list)
+#   POST   /tournaments/ID/simulate            {"runs": 100000}, on the worker pool
+#   POST   /tournaments/ID/evict               snapshot it now
+
+# ---------------------------- CONSTANTS ---------------------------- #
+HOST = "127.0.0.1"
+PORT = 8080
+IDLE_SECONDS = 300
+MAX_ACTIVE = 64
+PAGE_LIMIT = 100
+BODY_LIMIT = 64 * 1024 * 1024
+TOURNAMENT_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+class NotFound(KeyError):
+    pass
+
+def check_count(value, name, minimum):
+    # Request fields that count something: whole numbers, never bools
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise ValueError(f"{name} must be an integer >= {minimum}, got {value!r}")
+    return value
+
+# ---------------------------- HOST ---------------------------- #
+class Tournament:
+    __slots__ = ("id", "scheduler", "scores", "lock", "last_used", "snapshot", "options")
+
+    def __init__(self, tournament_id, scheduler, snapshot, options):
+        self.id = tournament_id
+        self.scheduler = scheduler
+        self.scores = None          # scoring.ScoreService, no socket of its own
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.snapshot = snapshot
+        self.options = options
+
+class TournamentHost:
+    def __init__(self, directory, idle_seconds=IDLE_SECONDS, max_active=MAX_ACTIVE, workers=None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.idle_seconds = idle_seconds
+        self.max_active = max_active
+        self.workers = workers
+        self.pool = None
+        self.lock = threading.Lock()
+        self.tournaments = OrderedDict()   # id -> Tournament, least recently used first
+        self.evictions = 0
+        self.restores = 0
+        self._ids = 0
+        self._closed = threading.Event()
+        self._sweeper = None
+        self._rescan()
+
+    def _rescan(self):
+        # Tournaments left in the directory by an earlier host, as evicted
+        # entries that the first request maps back in
+        for filename in sorted(os.listdir(self.directory)):
+            tournament_id, extension = os.path.splitext(filename)
+            if extension != ".snap" or not TOURNAMENT_ID.match(tournament_id):
+                continue
+            options = {"double": False, "random_draw": True}
+            try:
+                with open(self._options_path(tournament_id)) as file:
+                    options.update(json.load(file))
+            except (OSError, ValueError):
+                pass
+            self.tournaments[tournament_id] = Tournament(
+                tournament_id, None, self._snapshot_path(tournament_id), options)
+
+    # ---------------- lifecycle ---------------- #
+    def create(self, spec):
+        tournament_id = spec.get("id")
+        with self.lock:
+            if tournament_id is None:
+                while True:
+                    self._ids += 1
+                    tournament_id = f"t{self._ids}"
+                    if tournament_id not in self.tournaments:
+                        break
+            elif not isinstance(tournament_id, str) or not TOURNAMENT_ID.match(tournament_id):
+                raise ValueError("id must be 1-64 letters, digits, '-' or '_'")
+            elif tournament_id in self.tournaments:
+                raise ValueError(f"tournament {tournament_id!r} already exists")
+            # Reserved until loaded, so a second create with the same id fails
+            self.tournaments[tournament_id] = None
+        try:
+            scheduler = self._build(tournament_id, spec)
+        except BaseException:
+            with self.lock:
+                del self.tournaments[tournament_id]
+            raise
+        entry = Tournament(tournament_id, scheduler, self._snapshot_path(tournament_id),
+                           {"double": bool(spec.get("double")),
+                            "random_draw": spec.get("draw", "random") == "random"})
+        # Knockout options the snapshot doesn't hold until the bracket exists
+        with open(self._options_path(tournament_id), "w") as file:
+            json.dump(entry.options, file)
+        with self.lock:
+            self.tournaments[tournament_id] = entry
+        self._trim()
+        return entry
+
+    def _build(self, tournament_id, spec):
+        teams = spec.get("teams")
+        if "lines" in spec:
+            lines = spec["lines"]
+            if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+                raise ValueError("lines must be a list of 'Name;member,member;rank' strings")
+            teams = os.path.join(self.directory, f"{tournament_id}.txt")
+            with open(teams, "w") as file:
+                file.writelines(line.rstrip("\n") + "\n" for line in lines)
+        elif not isinstance(teams, str):
+            raise ValueError("need teams (a file in the host directory) or lines")
+        else:
+            # Only files under the host directory, however the path is spelled
+            base = os.path.realpath(self.directory)
+            teams = os.path.realpath(os.path.join(base, teams))
+            if os.path.commonpath([base, teams]) != base:
+                raise ValueError("teams must be a file inside the host directory")
+        scheduler = Scheduler(compact=bool(spec.get("compact", True)), seed=spec.get("seed"))
+        scheduler.load_teams(teams, top_k=spec.get("top_k"))
+        scheduler.divide_groups(int(spec.get("groups", 2)), spec.get("seeding", "pots"))
+        if spec.get("group_stage"):
+            scheduler.start_group_stage(advance=int(spec["group_stage"]))
+        else:
+            scheduler.build_bracket(bool(spec.get("double")),
+                                    random_draw=spec.get("draw", "random") == "random")
+        return scheduler
+
+    def _snapshot_path(self, tournament_id):
+        return os.path.join(self.directory, f"{tournament_id}.snap")
+
+    def _options_path(self, tournament_id):
+        return os.path.join(self.directory, f"{tournament_id}.json")
+
+    def _entry(self, tournament_id, touch=True):
+        with self.lock:
+            entry = self.tournaments.get(tournament_id)
+            if entry is None:
+                raise NotFound(tournament_id)
+            if touch:
+                self.tournaments.move_to_end(tournament_id)
+            return entry
+
+    @contextmanager
+    def use(self, tournament_id):
+        # The tournament's Scheduler, loaded back from its snapshot if it was
+        # evicted, held under the tournament's lock
+        entry = self._entry(tournament_id)
+        with entry.lock:
+            if entry.scheduler is None:
+                entry.scheduler = Scheduler.restore(entry.snapshot, compact=True)
+                entry.scores = None
+                with self.lock:
+                    self.restores += 1
+            entry.last_used = time.monotonic()
+            yield entry
+            entry.last_used = time.monotonic()
+        self._trim()
+
+    def delete(self, tournament_id):
+        entry = self._entry(tournament_id)
+        with entry.lock:
+            with self.lock:
+                self.tournaments.pop(tournament_id, None)
+            entry.scheduler = entry.scores = None
+            for path in (entry.snapshot, self._options_path(tournament_id),
+                         os.path.join(self.directory, f"{tournament_id}.txt")):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    # ---------------- eviction ---------------- #
+    def evict(self, tournament_id, wait=True):
+        # Snapshot and drop one tournament; False if it is busy (wait=False)
+        # or already on disk
+        entry = self._entry(tournament_id, touch=False)
+        if not entry.lock.acquire(blocking=wait):
+            return False
+        try:
+            if entry.scheduler is None:
+                return False
+            # The old snapshot may still be mapped by this very Scheduler, so
+            # the new one goes in next to it and replaces it in one step
+            partial = entry.snapshot + ".partial"
+            entry.scheduler.save(partial)
+            os.replace(partial, entry.snapshot)
+            entry.scheduler = entry.scores = None
+            with self.lock:
+                self.evictions += 1
+            return True
+        finally:
+            entry.lock.release()
+
+    def evict_idle(self):
+        cutoff = time.monotonic() - self.idle_seconds
+        with self.lock:
+            idle = [entry.id for entry in self.tournaments.values()
+                    if entry is not None and entry.scheduler is not None and entry.last_used < cutoff]
+        return sum(self.evict(tournament_id, wait=False) for tournament_id in idle)
+
+    def _trim(self):
+        # Least recently used first, until at most max_active stay loaded
+        with self.lock:
+            loaded = [entry.id for entry in self.tournaments.values()
+                      if entry is not None and entry.scheduler is not None]
+        for tournament_id in loaded[:max(0, len(loaded) - self.max_active)]:
+            try:
+                self.evict(tournament_id, wait=False)
+            except NotFound:
+                pass
+
+    def start_sweeper(self, every=None):
+        every = every if every is not None else max(1.0, self.idle_seconds / 4)
+
+        def sweep():
+            while not self._closed.wait(every):
+                self.evict_idle()
+
+        self._sweeper = threading.Thread(target=sweep, name="evictor", daemon=True)
+        self._sweeper.start()
+
+    def close(self, save=True):
+        self._closed.set()
+        if save:
+            with self.lock:
+                ids = [tournament_id for tournament_id, entry in self.tournaments.items()
+                       if entry is not None]
+            for tournament_id in ids:
+                self.evict(tournament_id)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    # ---------------- queries ---------------- #
+    def stats(self):
+        with self.lock:
+            entries = [entry for entry in self.tournaments.values() if entry is not None]
+        active = sum(entry.scheduler is not None for entry in entries)
+        return {"tournaments": len(entries), "active": active, "evicted": len(entries) - active,
+                "evictions": self.evictions, "restores": self.restores,
+                "peak_rss_bytes": loader.peak_rss()}
+
+    def listing(self):
+        with self.lock:
+            entries = [entry for entry in self.tournaments.values() if entry is not None]
+        return [{"id": entry.id, "loaded": entry.scheduler is not None,
+                 "idle_seconds": round(time.monotonic() - entry.last_used, 3)}
+                for entry in entries]
+
+    def status(self, tournament_id):
+        with self.use(tournament_id) as entry:
+            scheduler = entry.scheduler
+            rounds = []
+            for name in scheduler.round_names:
+                matches = scheduler.rounds[name]
+                scheduled = name in scheduler.round_pairings
+                rounds.append({"name": name, "scheduled": scheduled, "matches": len(matches),
+                               "open": scheduler.open_matches(name) if scheduled else None})
+            return {"id": tournament_id, "teams": len(scheduler.teams), "seed": scheduler.rng.seed,
+                    "rounds": rounds, "winner": cli.team_json(scheduler.winner)}
+
+    def round_page(self, tournament_id, round_name, start=0, limit=PAGE_LIMIT):
+        check_count(start, "start", 0)
+        check_count(limit, "limit", 1)
+        with self.use(tournament_id) as entry:
+            rounds = entry.scheduler.rounds
+            if round_name not in rounds:
+                raise NotFound(round_name)
+            matches = rounds[round_name]
+            page = matches[start:start + limit]
+            return {"round": round_name, "matches": len(matches), "start": start,
+                    "page": [[match.team1.name, match.team2.name,
+                              match.winner.name if match.winner is not None else None]
+                             for match in page]}
+
+    # ---------------- actions ---------------- #
+    def play(self, tournament_id, rounds=None, model="coin", scale=4.0):
+        # Plays the next `rounds` open rounds (all by default); a finished
+        # group stage moves on to the knockout by itself
+        if rounds is not None:
+            check_count(rounds, "rounds", 1)
+        win_probability = cli.win_model(model, scale)
+        with self.use(tournament_id) as entry:
+            scheduler = entry.scheduler
+            played = []
+            r = 0       # rounds before r are finished and stay finished
+            while rounds is None or len(played) < rounds:
+                names = scheduler.round_names
+                while (r < len(names) and names[r] in scheduler.round_pairings
+                       and not scheduler.open_matches(names[r])):
+                    r += 1
+                if r == len(names):
+                    if scheduler.group_stage is None or scheduler.bracket is not None:
+                        break
+                    scheduler.start_knockout(entry.options["double"], entry.options["random_draw"])
+                    continue
+                if names[r] not in scheduler.round_pairings:
+                    scheduler.schedule_round(names[r])
+                scheduler.complete_round(names[r], win_probability)
+                played.append(names[r])
+            entry.scores = None     # its open-round counts are stale now
+            return {"played": played, "winner": cli.team_json(scheduler.winner)}
+
+    def results(self, tournament_id, events):
+        if isinstance(events, dict):
+            events = [events]
+        with self.use(tournament_id) as entry:
+            if entry.scores is None:
+                entry.scores = scoring.ScoreService(
+                    entry.scheduler, knockout=(entry.options["double"], entry.options["random_draw"]))
+                entry.scores.resync()   # schedules whatever can be played next
+            parsed = []
+            replies = {}
+            for n, event in enumerate(events):
+                try:
+                    parsed.append((n, scoring.parse_event(json.dumps(event))))
+                except scoring.ScoreError as e:
+                    replies[n] = {"ok": False, "error": str(e)}
+            for (n, _), reply in zip(parsed, entry.scores.apply([event for _, event in parsed])):
+                replies[n] = reply
+            return [replies[n] for n in range(len(events))]
+
+    def simulate(self, tournament_id, runs=100000, model="coin", scale=4.0, seed=None, limit=20):
+        # Returns a Future; the Monte Carlo itself runs in the worker pool
+        import simulation
+        with self.use(tournament_id) as entry:
+            scheduler = entry.scheduler
+            ranks = [team.rank for team in scheduler.teams]
+            names = [team.name for team in scheduler.teams]
+            if seed is None:
+                seed = scheduler.rng.split("simulate").seed
+        with self.lock:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        future = self.pool.submit(simulation.simulate, ranks, runs, cli.win_model(model, scale), seed)
+
+        def table(result):
+            champion = result.champion_probabilities
+            order = sorted(range(len(ranks)), key=lambda i: -champion[i])[:limit]
+            return {"runs": result.runs, "rounds": result.round_names,
+                    "teams": [{"name": names[i], "rank": ranks[i],
+                               "reach": [round(float(p), 6) for p in result.probabilities[i]]}
+                              for i in order]}
+        return future, table
+
+# ---------------------------- HTTP ---------------------------- #
+class Handler(BaseHTTPRequestHandler):
+    host = None                 # TournamentHost, set by make_server
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True   # headers and body go out as separate writes
+    routes = [
+        ("GET", re.compile(r"^/stats$"), "get_stats"),
+        ("GET", re.compile(r"^/tournaments$"), "get_tournaments"),
+        ("POST", re.compile(r"^/tournaments$"), "post_tournament"),
+        ("GET", re.compile(r"^/tournaments/([^/]+)$"), "get_tournament"),
+        ("DELETE", re.compile(r"^/tournaments/([^/]+)$"), "delete_tournament"),
+        ("POST", re.compile(r"^/tournaments/([^/]+)/play$"), "post_play"),
+        ("GET", re.compile(r"^/tournaments/([^/]+)/rounds/([^/]+)$"), "get_round"),
+        ("POST", re.compile(r"^/tournaments/([^/]+)/results$"), "post_results"),
+        ("POST", re.compile(r"^/tournaments/([^/]+)/simulate$"), "post_simulate"),
+        ("POST", re.compile(r"^/tournaments/([^/]+)/evict$"), "post_evict"),
+    ]
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+    def dispatch(self, method):
+        url = urlsplit(self.path)
+        try:
+            body = self.read_body()
+            for route_method, pattern, name in self.routes:
+                found = pattern.match(url.path)
+                if found and route_method == method:
+                    if not isinstance(body, dict) and name != "post_results":
+                        raise ValueError("expected a JSON object")
+                    params = [unquote(part) for part in found.groups()]
+                    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                    status, payload = getattr(self, name)(*params, body=body, query=query)
+                    break
+            else:
+                status, payload = 404, {"error": f"no route for {method} {url.path}"}
+        except NotFound as e:
+            status, payload = 404, {"error": f"not found: {e.args[0]}"}
+        except (ValueError, TypeError, OSError, ImportError) as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        self.send_json(status, payload)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > BODY_LIMIT:
+            raise ValueError("request body too large")
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length))
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    # ---------------- routes ---------------- #
+    def get_stats(self, body, query):
+        return 200, self.host.stats()
+
+    def get_tournaments(self, body, query):
+        return 200, {"tournaments": self.host.listing()}
+
+    def post_tournament(self, body, query):
+        entry = self.host.create(body)
+        return 201, {"id": entry.id}
+
+    def get_tournament(self, tournament_id, body, query):
+        return 200, self.host.status(tournament_id)
+
+    def delete_tournament(self, tournament_id, body, query):
+        self.host.delete(tournament_id)
+        return 200, {"deleted": tournament_id}
+
+    def post_play(self, tournament_id, body, query):
+        return 200, self.host.play(tournament_id, body.get("rounds"), body.get("model", "coin"),
+                                   float(body.get("scale", 4.0)))
+
+    def get_round(self, tournament_id, round_name, body, query):
+        return 200, self.host.round_page(tournament_id, round_name,
+                                         query_int(query, "start", 0),
+                                         query_int(query, "limit", PAGE_LIMIT))
+
+    def post_results(self, tournament_id, body, query):
+        return 200, {"results": self.host.results(tournament_id, body)}
+
+    def post_simulate(self, tournament_id, body, query):
+        future, table = self.host.simulate(tournament_id, int(body.get("runs", 100000)),
+                                           body.get("model", "coin"), float(body.get("scale", 4.0)),
+                                           body.get("seed"), int(body.get("limit", 20)))
+        return 200, table(future.result())
+
+    def post_evict(self, tournament_id, body, query):
+        return 200, {"evicted": self.host.evict(tournament_id)}
+
+def query_int(query, name, default):
+    value = query.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}") from None
+
+def make_server(host, address=HOST, port=PORT):
+    handler = type("BoundHandler", (Handler,), {"host": host})
+    server = ThreadingHTTPServer((address, port), handler)
+    server.daemon_threads = True
+    return server
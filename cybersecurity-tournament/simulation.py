@@ -0,0 +1,152 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import bracket
+
+# Monte Carlo estimate of how far each team gets in a single-elimination
+# bracket. Instead of one Match.complete() call per game, a whole batch of
+# tournaments is played at once: the field is a (runs, bracket size) array of
+# team indices and every round halves its width.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+BATCH_CELLS = 1 << 22   # Field cells (runs x bracket size) per batch
+
+# ---------------------------- WIN PROBABILITY MODELS ---------------------------- #
+# A model takes the ranks of two sides (scalars or NumPy arrays) and returns
+# the probability that the first side wins. The same objects can be passed to
+# Match.complete / Scheduler.complete_round. Lower rank = stronger team.
+class CoinFlip:
+    def __call__(self, rank_a, rank_b):
+        return np.full(np.shape(rank_a), 0.5) if np.ndim(rank_a) else 0.5
+
+    def __repr__(self):
+        return "CoinFlip()"
+
+class RankLogistic:
+    # Logistic in the rank difference: a team `scale` places better than its
+    # opponent wins about 73% of the time
+    def __init__(self, scale=4.0):
+        self.scale = scale
+
+    def __call__(self, rank_a, rank_b):
+        diff = (np.asarray(rank_a, dtype=float) - rank_b) / self.scale
+        p = 1.0 / (1.0 + np.exp(diff))
+        return p if np.ndim(p) else float(p)
+
+    def __repr__(self):
+        return f"RankLogistic(scale={self.scale})"
+
+class RankPower:
+    # Bradley-Terry with strength 1 / rank ** alpha
+    def __init__(self, alpha=1.0):
+        self.alpha = alpha
+
+    def __call__(self, rank_a, rank_b):
+        a = np.power(np.asarray(rank_a, dtype=float), -self.alpha)
+        b = np.power(np.asarray(rank_b, dtype=float), -self.alpha)
+        p = a / (a + b)
+        return p if np.ndim(p) else float(p)
+
+    def __repr__(self):
+        return f"RankPower(alpha={self.alpha})"
+
+MODELS = {
+    "coin": CoinFlip,
+    "logistic": RankLogistic,
+    "power": RankPower,
+}
+
+# ---------------------------- RESULTS ---------------------------- #
+class SimulationResult:
+    def __init__(self, counts, runs, round_names):
+        self.counts = counts            # (teams, rounds + 1) int64
+        self.runs = runs
+        self.round_names = round_names  # column labels, last is "Champion"
+
+    @property
+    def probabilities(self):
+        return self.counts / self.runs if self.runs else self.counts.astype(float)
+
+    @property
+    def champion_probabilities(self):
+        return self.probabilities[:, -1]
+
+    def merge(self, other):
+        return SimulationResult(self.counts + other.counts, self.runs + other.runs,
+                                self.round_names)
+
+    def table(self, teams, limit=None):
+        probabilities = self.probabilities
+        order = np.argsort(-probabilities[:, -1], kind="stable")
+        if limit is not None:
+            order = order[:limit]
+        header = f"{'Team':<24}{'Rank':>6}" + "".join(f"{name:>15}" for name in self.round_names[1:])
+        lines = [header]
+        for index in order:
+            team = teams[int(index)]
+            cells = "".join(f"{p:>15.4f}" for p in probabilities[index, 1:])
+            lines.append(f"{team.name[:23]:<24}{team.rank:>6}{cells}")
+        return "\n".join(lines)
+
+# ---------------------------- SIMULATION ---------------------------- #
+def _play_round(field, ranks, model, rng):
+    a = field[:, 0::2]
+    b = field[:, 1::2]
+    winners = np.where(a == bracket.BYE, b, a)
+    real = (a >= 0) & (b >= 0)
+    if real.any():
+        team_a = a[real]
+        team_b = b[real]
+        p = model(ranks[team_a], ranks[team_b])
+        winners[real] = np.where(rng.random(team_a.size) < p, team_a, team_b)
+    return winners
+
+def simulate_counts(leaves, ranks, runs, model, seed=None, batch_cells=BATCH_CELLS):
+    leaves = np.asarray(leaves, dtype=np.int32)
+    ranks = np.asarray(ranks, dtype=float)
+    team_count = len(ranks)
+    depth = len(leaves).bit_length() - 1
+    rng = np.random.default_rng(seed)
+    counts = np.zeros((team_count, depth + 1), dtype=np.int64)
+    counts[:, 0] = runs
+    batch = max(1, batch_cells // len(leaves))
+    done = 0
+    while done < runs:
+        size = min(batch, runs - done)
+        field = np.broadcast_to(leaves, (size, len(leaves)))
+        for r in range(depth):
+            field = _play_round(field, ranks, model, rng)
+            alive = field[field >= 0]
+            counts[:, r + 1] += np.bincount(alive, minlength=team_count)
+        done += size
+    return counts
+
+def _worker(args):
+    return simulate_counts(*args)
+
+def simulate(ranks, runs, model=None, seed=None, processes=1, leaves=None):
+    # ranks: rank of each team, in seed order (index 0 = top seed).
+    # The same seed (and process count) always gives the same result.
+    model = model if model is not None else CoinFlip()
+    if leaves is None:
+        leaves = bracket.seeded_leaves(len(ranks))
+    leaves = np.asarray(leaves, dtype=np.int32)
+    names = bracket.round_names(len(leaves).bit_length() - 1) + ["Champion"]
+
+    if processes <= 1:
+        counts = simulate_counts(leaves, ranks, runs, model, np.random.SeedSequence(seed))
+        return SimulationResult(counts, runs, names)
+
+    # Split the runs, give every worker an independent child seed, add up the counts
+    seeds = np.random.SeedSequence(seed).spawn(processes)
+    share = math.ceil(runs / processes)
+    jobs = []
+    for i, child in enumerate(seeds):
+        part = min(share, runs - i * share)
+        if part > 0:
+            jobs.append((leaves, ranks, part, model, child))
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        counts = sum(pool.map(_worker, jobs))
+    return SimulationResult(counts, runs, names)
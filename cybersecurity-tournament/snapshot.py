@@ -0,0 +1,377 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+import bracket
+import group_stage
+import registry
+import storage
+import streams
+from scheduler import Match, Scheduler, Team
+
+# Binary checkpoints of a whole Scheduler: teams, groups, bracket, every
+# round's matches, the winner, the RNG seed and the event log.
+#
+# Layout (little-endian, every section 8-byte aligned):
+#   header          HEADER
+#   section table   SECTION x len(SECTIONS): (offset, length) in bytes
+#   string_offsets  int64[strings + 1] into string_blob
+#   string_blob     UTF-8 team names, member names and round names
+#   teams           TEAM_RECORD per team, in rank order
+#   member_starts   int32[teams + 1] into member_ids
+#   member_ids      int32 string ids
+#   group_a/b       int32 team indices
+#   bracket         int32 bracket slots (see bracket.py), empty if none
+#   losers          int32 losers-bracket results, all rounds back to back
+#   rounds          ROUND_RECORD per round, in play order
+#   matches         MATCH_RECORD per match
+#   match_status    status byte per match
+#   match_rounds    int16 round index per match
+#   state           small JSON blob (RNG seed, bracket and group stage options)
+#   events          streams.EventLog.tobytes()
+#   groups          int32 group count, group sizes, then every group's team indices
+#
+# load() maps the file and serves teams straight from it through a
+# storage.TeamTable over memoryviews, so even millions of teams come back
+# without re-parsing teams.txt or allocating a Team object per row.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+MAGIC = b"HSCHSNAP"
+VERSION = 2
+FLAG_COMPACT = 1
+BRACKET_NONE, BRACKET_SINGLE, BRACKET_DOUBLE = 0, 1, 2
+
+HEADER = struct.Struct("<8sIIiiIiI")    # magic, version, flags, teams, winner,
+                                        # bracket kind, grand final, sections
+SECTION = struct.Struct("<QQ")
+TEAM_RECORD = struct.Struct("<ii")      # name string id, rank
+ROUND_RECORD = struct.Struct("<iIIi")   # name string id, first match, match count, bracket-driven
+MATCH_RECORD = struct.Struct("<iiii")   # bracket key, team1, team2, winner (-1 if not played)
+
+SECTIONS = ("string_offsets", "string_blob", "teams", "member_starts", "member_ids",
+            "group_a", "group_b", "bracket", "losers", "rounds", "matches",
+            "match_status", "match_rounds", "state", "events", "groups")
+
+class SnapshotError(ValueError):
+    pass
+
+# ---------------------------- HELPERS ---------------------------- #
+def _le(values):
+    # Arrays are written in native order; keep the file little-endian
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+def _team_index(scheduler):
+    if isinstance(scheduler.teams, storage.TeamTable):
+        return lambda team: team.index
+    lookup = {id(team): i for i, team in enumerate(scheduler.teams)}
+    return lambda team: lookup[id(team)]
+
+def _team_columns(teams):
+    # (string list, name ids, ranks, member starts, member ids) for any team list
+    if not isinstance(teams, storage.TeamTable):
+        table = storage.TeamTable()
+        for team in teams:
+            table.append(team.name, team.members, team.rank)
+        teams = table
+    strings = teams.strings
+    return ([strings[i] for i in range(len(strings))], array("i", teams.name_ids),
+            array("i", teams.ranks), array("i", teams.member_starts),
+            array("i", teams.member_ids))
+
+class _Pairings:
+    # Lazy (key, team1, team2) view over a round's match records
+    def __init__(self, records, start, count):
+        self.records = records
+        self.start = start
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        base = 4 * (self.start + i)
+        return self.records[base], self.records[base + 1], self.records[base + 2]
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+# ---------------------------- SAVE ---------------------------- #
+def save(scheduler, path):
+    strings, name_ids, ranks, member_starts, member_ids = _team_columns(scheduler.teams)
+    string_ids = {}
+    index_of = _team_index(scheduler)
+
+    def intern(value):
+        string_id = string_ids.get(value)
+        if string_id is None:
+            string_id = string_ids[value] = len(strings)
+            strings.append(value)
+        return string_id
+
+    teams = array("i", [0]) * (2 * len(ranks))
+    teams[0::2] = name_ids
+    teams[1::2] = ranks
+
+    group_a = array("i", (index_of(team) for team in scheduler.group_A))
+    group_b = array("i", (index_of(team) for team in scheduler.group_B))
+    groups = array("i", [len(scheduler.groups)])
+    groups.extend(len(group) for group in scheduler.groups)
+    for group in scheduler.groups:
+        groups.extend(group.indices if isinstance(group, registry.TeamView)
+                      else (index_of(team) for team in group))
+
+    tree = scheduler.bracket
+    kind, grand_final = BRACKET_NONE, bracket.EMPTY
+    slots, losers = array("i"), array("i")
+    if isinstance(tree, bracket.DoubleBracket):
+        kind, grand_final = BRACKET_DOUBLE, tree.grand_final
+        slots = tree.winners.slots
+        for results in tree.losers:
+            losers.extend(results)
+    elif tree is not None:
+        kind, slots = BRACKET_SINGLE, tree.slots
+
+    rounds = bytearray()
+    matches = array("i")
+    status = bytearray()
+    round_codes = array("h")
+    for round_code, (round_name, round_matches) in enumerate(scheduler.rounds.items()):
+        pairings = scheduler.round_pairings.get(round_name)
+        rounds += ROUND_RECORD.pack(intern(round_name), len(matches) // 4,
+                                    len(round_matches), pairings is not None)
+        keys = (key for key, _, _ in pairings) if pairings is not None else None
+        for match in round_matches:
+            winner = match.winner
+            matches.extend((next(keys) if keys is not None else -1,
+                            index_of(match.team1), index_of(match.team2),
+                            index_of(winner) if winner is not None else -1))
+            status.append(storage.STATUS_CODES[match.status])
+            round_codes.append(round_code)
+
+    events = scheduler.events
+    stage = scheduler.group_stage
+    state = json.dumps({
+        "seed": scheduler.rng.seed,
+        "double_elimination": events.double_elimination,
+        "random_draw": events.random_draw,
+        "entrants": list(events.entrants) if events.entrants is not None else None,
+        "group_stage": {"advance": stage.advance, "win_points": stage.win_points,
+                        "loss_points": stage.loss_points} if stage is not None else None,
+    }).encode()
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = array("q", [0]) * (len(encoded) + 1)
+    total = 0
+    for i, value in enumerate(encoded):
+        total += len(value)
+        string_offsets[i + 1] = total
+
+    sections = {
+        "string_offsets": _le(string_offsets),
+        "string_blob": b"".join(encoded),
+        "teams": _le(teams),
+        "member_starts": _le(member_starts),
+        "member_ids": _le(member_ids),
+        "group_a": _le(group_a),
+        "group_b": _le(group_b),
+        "bracket": _le(slots),
+        "losers": _le(losers),
+        "rounds": bytes(rounds),
+        "matches": _le(matches),
+        "match_status": bytes(status),
+        "match_rounds": _le(round_codes),
+        "state": state,
+        "events": events.tobytes(),
+        "groups": _le(groups),
+    }
+    winner = scheduler.winner
+    flags = FLAG_COMPACT if scheduler.compact else 0
+    header = HEADER.pack(MAGIC, VERSION, flags, len(ranks),
+                         index_of(winner) if winner is not None else -1,
+                         kind, grand_final, len(SECTIONS))
+
+    offset = HEADER.size + SECTION.size * len(SECTIONS)
+    table = []
+    for name in SECTIONS:
+        offset += -offset % 8
+        table.append(SECTION.pack(offset, len(sections[name])))
+        offset += len(sections[name])
+
+    with open(path, "wb") as file:
+        file.write(header)
+        file.write(b"".join(table))
+        for name in SECTIONS:
+            file.write(b"\0" * (-file.tell() % 8))
+            file.write(sections[name])
+    return path
+
+# ---------------------------- LOAD ---------------------------- #
+def _open(path):
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    if len(view) < HEADER.size:
+        raise SnapshotError(f"{path}: file too short")
+    magic, version, flags, team_count, winner, kind, grand_final, count = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path}: not a scheduler snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"{path}: unsupported snapshot version {version}")
+    if HEADER.size + min(count, len(SECTIONS)) * SECTION.size > len(view):
+        raise SnapshotError(f"{path}: section table runs past the end of the file")
+    sections = {}
+    for i, name in enumerate(SECTIONS[:count]):
+        offset, length = SECTION.unpack_from(view, HEADER.size + i * SECTION.size)
+        # A truncated file would otherwise hand out short sections silently
+        if offset + length > len(view):
+            raise SnapshotError(f"{path}: section {name} ({offset}+{length} bytes) runs past "
+                                f"the end of the file ({len(view)} bytes), truncated?")
+        sections[name] = view[offset:offset + length]
+    return flags, team_count, winner, kind, grand_final, sections
+
+def _ints(section, typecode="i"):
+    if sys.byteorder != "little":
+        values = array(typecode, section)
+        values.byteswap()
+        return values
+    return section.cast(typecode)
+
+def load(path, compact=True):
+    # compact=True serves teams from the mapped file (read-only columns);
+    # compact=False materializes regular Team and Match objects
+    flags, team_count, winner, kind, grand_final, sections = _open(path)
+
+    offsets = _ints(sections["string_offsets"], "q")
+    blob = sections["string_blob"]
+    strings = storage.MappedStringTable(offsets, blob)
+    records = _ints(sections["teams"])
+    table = storage.TeamTable.from_columns(strings, records[0::2], records[1::2],
+                                           _ints(sections["member_starts"]),
+                                           _ints(sections["member_ids"]))
+
+    state = json.loads(bytes(sections["state"]))
+    scheduler = Scheduler(compact=compact, seed=state["seed"])
+    entrants = state.get("entrants")
+    if entrants is not None:
+        entrants = array("i", entrants)
+    if "events" in sections:
+        scheduler.events = streams.EventLog.frombytes(
+            sections["events"], state["seed"], state["double_elimination"], state["random_draw"],
+            entrants)
+    if compact:
+        scheduler.teams = table
+        scheduler.match_table = storage.MatchTable(table)
+    else:
+        scheduler.teams = [Team(team.name, team.members, team.rank) for team in table]
+    teams = scheduler.teams
+    scheduler.group_A = [teams[i] for i in _ints(sections["group_a"])]
+    scheduler.group_B = [teams[i] for i in _ints(sections["group_b"])]
+    if "groups" in sections:
+        flat = _ints(sections["groups"])
+        start = 1 + flat[0]
+        for size in flat[1:start]:
+            scheduler.groups.append(registry.TeamView(teams, array("i", flat[start:start + size])))
+            start += size
+
+    slots = array("i", _ints(sections["bracket"]))
+    if kind == BRACKET_SINGLE:
+        scheduler.bracket = bracket.Bracket.from_slots(slots)
+    elif kind == BRACKET_DOUBLE:
+        tree = bracket.DoubleBracket.from_state(slots, None, grand_final)
+        flat = _ints(sections["losers"])
+        start = 0
+        for results in tree.losers:
+            results[:] = array("i", flat[start:start + len(results)])
+            start += len(results)
+        scheduler.bracket = tree
+
+    matches = _ints(sections["matches"])
+    status = sections["match_status"]
+    scheduler.rounds = {}
+    scheduler.round_pairings = {}
+    round_names = []
+    for name_id, first, count, driven in ROUND_RECORD.iter_unpack(sections["rounds"]):
+        round_name = strings[name_id]
+        round_names.append(round_name)
+        if compact:
+            scheduler.rounds[round_name] = storage.MatchRange(scheduler.match_table, first, first + count)
+        else:
+            round_matches = []
+            for i in range(first, first + count):
+                base = 4 * i
+                match = Match(teams[matches[base + 1]], teams[matches[base + 2]], round_name)
+                match.status = storage.STATUS_NAMES[status[i]]
+                if matches[base + 3] >= 0:
+                    match.winner = teams[matches[base + 3]]
+                round_matches.append(match)
+            scheduler.rounds[round_name] = round_matches
+        if driven:
+            scheduler.round_pairings[round_name] = _Pairings(matches, first, count)
+        elif count:
+            scheduler.round_pairings[round_name] = None
+    if compact:
+        match_table = scheduler.match_table
+        match_table.round_names = round_names
+        match_table.team1 = array("i", matches[1::4])
+        match_table.team2 = array("i", matches[2::4])
+        match_table.winners = array("i", matches[3::4])
+        match_table.status_codes = array("b", status)
+        match_table.round_codes = array("h", _ints(sections["match_rounds"], "h"))
+
+    scheduler.winner = teams[winner] if winner >= 0 else None
+
+    # Standings are rebuilt by feeding the stored group results back in
+    options = state.get("group_stage")
+    if options is not None:
+        stage = group_stage.GroupStage([group.indices for group in scheduler.groups], team_count,
+                                       options["advance"], options["win_points"],
+                                       options["loss_points"])
+        for round_name, (name_id, first, count, driven) in zip(
+                round_names, ROUND_RECORD.iter_unpack(sections["rounds"])):
+            if round_name not in stage.round_lookup or not count:
+                continue
+            fixtures = []
+            for i in range(first, first + count):
+                a, b, won = matches[4 * i + 1], matches[4 * i + 2], matches[4 * i + 3]
+                fixtures.append((a, b))
+                if won >= 0:
+                    stage.record(won, b if won == a else a)
+            stage.fixtures[round_name] = fixtures
+        scheduler.group_stage = stage
+    return scheduler
+
+# ---------------------------- JSON EXPORT ---------------------------- #
+def export_json(scheduler, out):
+    # Same content as a snapshot, as plain JSON; written match by match
+    def team_json(team):
+        return {"name": team.name, "rank": team.rank, "members": list(team.members)}
+
+    out.write('{"format": "hackathon-scheduler", "version": 1, "teams": [')
+    for i, team in enumerate(scheduler.teams):
+        out.write((", " if i else "") + json.dumps(team_json(team)))
+    out.write('], "groups": {')
+    out.write(f'"A": {json.dumps([team.name for team in scheduler.group_A])}, ')
+    out.write(f'"B": {json.dumps([team.name for team in scheduler.group_B])}}}, ')
+    out.write(f'"all_groups": {json.dumps([[team.name for team in group] for group in scheduler.groups])}, ')
+    tree = scheduler.bracket
+    kind = ("double" if isinstance(tree, bracket.DoubleBracket)
+            else "single" if tree is not None else None)
+    out.write(f'"bracket": {json.dumps(kind)}, "rounds": [')
+    for r, (round_name, matches) in enumerate(scheduler.rounds.items()):
+        out.write((", " if r else "") + f'{{"name": {json.dumps(round_name)}, "matches": [')
+        for i, match in enumerate(matches):
+            out.write((", " if i else "") + json.dumps({
+                "team1": match.team1.name,
+                "team2": match.team2.name,
+                "status": match.status,
+                "winner": match.winner.name if match.winner is not None else None,
+            }))
+        out.write("]}")
+    winner = scheduler.winner
+    out.write(f'], "winner": {json.dumps(team_json(winner) if winner is not None else None)}}}\n')
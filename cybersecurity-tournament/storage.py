@@ -0,0 +1,257 @@
+import random
+from array import array
+
+# Compact, column-oriented storage for teams and matches. A TeamTable keeps
+# one int per column per team instead of a Python object per team; TeamRef and
+# MatchRef are throwaway views created on access, so callers that only use
+# .name / .members / .rank / .team1 / .winner keep working unchanged.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+NO_TEAM = -1
+STATUS_NAMES = ("Scheduled", "Completed")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+# ---------------------------- STRING TABLE ---------------------------- #
+class StringTable:
+    def __init__(self):
+        self.strings = []
+        self.ids = {}
+
+    def intern(self, value):
+        if self.ids is None:
+            self.ids = {string: i for i, string in enumerate(self.strings)}
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(value)
+            self.ids[value] = string_id
+        return string_id
+
+    def seal(self):
+        # The lookup dict costs more than the strings themselves, so drop it once
+        # loading is done. intern() rebuilds it if it is ever needed again.
+        self.ids = None
+
+    def __getitem__(self, string_id):
+        return self.strings[string_id]
+
+    def __len__(self):
+        return len(self.strings)
+
+class MappedStringTable:
+    # Read-only string table over a snapshot: UTF-8 blob + offsets, decoded on
+    # access. intern() is only needed when teams are added after a reload, and
+    # then falls back to an in-memory overflow list.
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+        self.base = len(offsets) - 1
+        self.extra = []
+        self.ids = None
+
+    def __getitem__(self, string_id):
+        if string_id >= self.base:
+            return self.extra[string_id - self.base]
+        return str(self.blob[self.offsets[string_id]:self.offsets[string_id + 1]], "utf-8")
+
+    def __len__(self):
+        return self.base + len(self.extra)
+
+    def intern(self, value):
+        if self.ids is None:
+            self.ids = {self[i]: i for i in range(len(self))}
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self)
+            self.extra.append(value)
+            self.ids[value] = string_id
+        return string_id
+
+    def seal(self):
+        self.ids = None
+
+# ---------------------------- TEAMS ---------------------------- #
+class TeamRef:
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def name(self):
+        return self.table.strings[self.table.name_ids[self.index]]
+
+    @property
+    def members(self):
+        table = self.table
+        start = table.member_starts[self.index]
+        end = table.member_starts[self.index + 1]
+        return [table.strings[i] for i in table.member_ids[start:end]]
+
+    @property
+    def rank(self):
+        return self.table.ranks[self.index]
+
+    def __eq__(self, other):
+        return (isinstance(other, TeamRef) and other.table is self.table
+                and other.index == self.index)
+
+    def __hash__(self):
+        return hash((id(self.table), self.index))
+
+    def __repr__(self):
+        return f"TeamRef({self.name!r}, rank={self.rank})"
+
+class TeamTable:
+    def __init__(self, strings=None):
+        self.strings = strings if strings is not None else StringTable()
+        self.name_ids = array("i")
+        self.ranks = array("i")
+        self.member_starts = array("i", [0])
+        self.member_ids = array("i")
+
+    @classmethod
+    def from_columns(cls, strings, name_ids, ranks, member_starts, member_ids):
+        # Columns may be arrays or read-only memoryviews over a snapshot
+        table = cls(strings)
+        table.name_ids = name_ids
+        table.ranks = ranks
+        table.member_starts = member_starts
+        table.member_ids = member_ids
+        return table
+
+    @classmethod
+    def from_rows(cls, rows):
+        # rows are loader tuples: (rank, line number, name, members)
+        table = cls()
+        for rank, _, name, members in rows:
+            table.append(name, members, rank)
+        table.strings.seal()
+        return table
+
+    def append(self, name, members, rank):
+        intern = self.strings.intern
+        self.name_ids.append(intern(name))
+        self.ranks.append(rank)
+        self.member_ids.extend(intern(member) for member in members)
+        self.member_starts.append(len(self.member_ids))
+        return len(self.ranks) - 1
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [TeamRef(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("team index out of range")
+        return TeamRef(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield TeamRef(self, i)
+
+# ---------------------------- MATCHES ---------------------------- #
+class MatchRef:
+    __slots__ = ("table", "index")
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    @property
+    def team1(self):
+        return TeamRef(self.table.teams, self.table.team1[self.index])
+
+    @property
+    def team2(self):
+        return TeamRef(self.table.teams, self.table.team2[self.index])
+
+    @property
+    def round_name(self):
+        return self.table.round_names[self.table.round_codes[self.index]]
+
+    @property
+    def status(self):
+        return STATUS_NAMES[self.table.status_codes[self.index]]
+
+    @property
+    def winner(self):
+        winner = self.table.winners[self.index]
+        return None if winner == NO_TEAM else TeamRef(self.table.teams, winner)
+
+    def complete(self, win_probability=None, draw=None):
+        table = self.table
+        team1 = table.team1[self.index]
+        team2 = table.team2[self.index]
+        if draw is None:
+            draw = random.random()
+        p = 0.5
+        if win_probability is not None:
+            ranks = table.teams.ranks
+            p = win_probability(ranks[team1], ranks[team2])
+        return self.record(TeamRef(table.teams, team1 if draw < p else team2))
+
+    def record(self, winner):
+        self.table.status_codes[self.index] = STATUS_CODES["Completed"]
+        self.table.winners[self.index] = winner.index
+        return winner
+
+class MatchRange:
+    # The matches of one round: a contiguous block of rows in a MatchTable
+    __slots__ = ("table", "start", "stop")
+
+    def __init__(self, table, start, stop):
+        self.table = table
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MatchRef(self.table, self.start + i)
+                    for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("match index out of range")
+        return MatchRef(self.table, self.start + index)
+
+    def __iter__(self):
+        for i in range(self.start, self.stop):
+            yield MatchRef(self.table, i)
+
+class MatchTable:
+    def __init__(self, teams):
+        self.teams = teams
+        self.round_names = []
+        self.team1 = array("i")
+        self.team2 = array("i")
+        self.winners = array("i")
+        self.status_codes = array("b")
+        self.round_codes = array("h")
+
+    def round_code(self, round_name):
+        if round_name not in self.round_names:
+            self.round_names.append(round_name)
+        return self.round_names.index(round_name)
+
+    def add_round(self, team_indices, round_name):
+        # team_indices are paired up in order: (0, 1), (2, 3), ...
+        code = self.round_code(round_name)
+        start = len(self.team1)
+        count = len(team_indices) // 2
+        self.team1.extend(team_indices[0:2 * count:2])
+        self.team2.extend(team_indices[1:2 * count:2])
+        self.winners.extend(array("i", [NO_TEAM]) * count)
+        self.status_codes.extend(array("b", [STATUS_CODES["Scheduled"]]) * count)
+        self.round_codes.extend(array("h", [code]) * count)
+        return MatchRange(self, start, start + count)
+
+    def __len__(self):
+        return len(self.team1)
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import random
+import sys
+from array import array
+
+# Reproducible randomness for one Scheduler. Every random decision is drawn
+# from a stream derived from the tournament seed plus a key such as
+# ("round", "Semi Final"), so the same seed always gives the same tournament
+# no matter in which order rounds are played, what else the process is doing
+# or how many Schedulers share it. Nothing here touches the global random
+# module; parallel workers take their own child streams with split().
+#
+# Results go to an EventLog: four flat arrays holding one row per completed
+# match. Replaying a log only stores winners back into the bracket, with no
+# draws and no win model calls.
+
+# ---------------------------- STREAMS ---------------------------- #
+def derive(seed, *key):
+    # 64-bit child seed for (seed, key); repr() of ints and strings is stable
+    # across runs, unlike hash()
+    data = repr((seed,) + key).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+class Streams:
+    __slots__ = ("seed",)
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "little")
+        self.seed = seed
+
+    def split(self, *key):
+        # Independent child, e.g. one per worker process
+        return Streams(derive(self.seed, *key))
+
+    def stream(self, *key):
+        # A fresh random.Random for one round, one match, the draw, ...
+        return random.Random(derive(self.seed, *key))
+
+    def uniform(self, *key):
+        # A single draw in [0, 1) without building a generator
+        return derive(self.seed, *key) / (1 << 64)
+
+    def __repr__(self):
+        return f"Streams(seed={self.seed})"
+
+# ---------------------------- EVENT LOG ---------------------------- #
+class EventLog:
+    # One row per completed bracket match, in the order they were played:
+    # round index (into bracket.round_names), bracket key, winning team index
+    # and the uniform draw that decided it. 18 bytes per match. The seed and
+    # bracket options (and the entrants, when only some teams made the
+    # bracket) are kept so the same bracket can be rebuilt for replay.
+    __slots__ = ("seed", "double_elimination", "random_draw", "entrants",
+                 "rounds", "keys", "winners", "draws")
+
+    def __init__(self, seed=None, double_elimination=False, random_draw=False, entrants=None):
+        self.seed = seed
+        self.double_elimination = double_elimination
+        self.random_draw = random_draw
+        self.entrants = entrants
+        self.rounds = array("h")
+        self.keys = array("i")
+        self.winners = array("i")
+        self.draws = array("d")
+
+    def record(self, r, key, winner, draw):
+        self.rounds.append(r)
+        self.keys.append(key)
+        self.winners.append(winner)
+        self.draws.append(draw)
+
+    def __len__(self):
+        return len(self.rounds)
+
+    def tobytes(self):
+        columns = [self.rounds, self.keys, self.winners, self.draws]
+        if sys.byteorder != "little":
+            columns = [array(column.typecode, column) for column in columns]
+            for column in columns:
+                column.byteswap()
+        return len(self).to_bytes(8, "little") + b"".join(column.tobytes() for column in columns)
+
+    @classmethod
+    def frombytes(cls, data, seed=None, double_elimination=False, random_draw=False,
+                  entrants=None):
+        log = cls(seed, double_elimination, random_draw, entrants)
+        count = int.from_bytes(data[:8], "little")
+        offset = 8
+        for column in (log.rounds, log.keys, log.winners, log.draws):
+            end = offset + count * column.itemsize
+            column.frombytes(data[offset:end])
+            if sys.byteorder != "little":
+                column.byteswap()
+            offset = end
+        return log
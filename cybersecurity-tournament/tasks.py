@@ -0,0 +1,129 @@
+import itertools
+import queue
+import threading
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Runs slow work off the Tk thread. Workers never touch widgets: everything
+# they want to tell the GUI (progress, result, error) goes through a queue
+# that the Tk thread drains with root.after(), so callbacks always run on the
+# main loop.
+#
+# cancel() only asks: a thread worker stops at its next check(), and one
+# that never checks runs to the end. A task is active until its future is
+# done, and then gets exactly one of on_done, on_error or on_cancelled.
+# Work that finished despite a cancel is delivered to on_done.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+POLL_MS = 50
+
+class TaskCancelled(Exception):
+    pass
+
+# ---------------------------- TASK HANDLE ---------------------------- #
+class Task:
+    _ids = itertools.count(1)
+
+    def __init__(self, runner, name, on_done, on_error, on_progress, on_cancelled=None):
+        self.id = next(Task._ids)
+        self.runner = runner
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancelled = on_cancelled
+        self.future = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def check(self):
+        # Called by thread workers at safe points
+        if self._cancel.is_set():
+            raise TaskCancelled(self.name)
+
+    def progress(self, done, total=None, message=None):
+        # Called from the worker; delivered to on_progress on the Tk thread
+        self.check()
+        self.runner.events.put(("progress", self, (done, total, message)))
+
+# ---------------------------- RUNNER ---------------------------- #
+class TaskRunner:
+    def __init__(self, root, threads=2, processes=None, poll_ms=POLL_MS):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.events = queue.Queue()
+        self.thread_pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="scheduler")
+        self.process_count = processes
+        self.process_pool = None
+        self.active = set()
+        self._closed = False
+        self.root.after(self.poll_ms, self._drain)
+
+    def submit(self, fn, *args, name=None, on_done=None, on_error=None,
+               on_progress=None, on_cancelled=None, use_process=False):
+        # Thread tasks get the Task as their first argument so they can report
+        # progress and notice cancellation. Process tasks (CPU-heavy, must be
+        # picklable) only get *args and can only be cancelled before they start.
+        task = Task(self, name or getattr(fn, "__name__", "task"), on_done, on_error, on_progress,
+                    on_cancelled)
+        if use_process:
+            if self.process_pool is None:
+                self.process_pool = ProcessPoolExecutor(max_workers=self.process_count)
+            task.future = self.process_pool.submit(fn, *args)
+        else:
+            task.future = self.thread_pool.submit(fn, task, *args)
+        self.active.add(task)
+        task.future.add_done_callback(lambda future: self.events.put(("finished", task, future)))
+        return task
+
+    @property
+    def busy(self):
+        return bool(self.active)
+
+    def cancel_all(self):
+        for task in list(self.active):
+            task.cancel()
+
+    def _drain(self):
+        try:
+            while True:
+                kind, task, payload = self.events.get_nowait()
+                if kind == "progress":
+                    if task.on_progress and not task.cancelled:
+                        task.on_progress(*payload)
+                else:
+                    self._finish(task, payload)
+        except queue.Empty:
+            pass
+        if not self._closed:
+            self.root.after(self.poll_ms, self._drain)
+
+    def _finish(self, task, future):
+        self.active.discard(task)
+        try:
+            result = future.result()
+        except (CancelledError, TaskCancelled):
+            if task.on_cancelled:
+                task.on_cancelled()
+            return
+        except Exception as e:
+            if task.on_error:
+                task.on_error(e)
+            return
+        # Cancelled too late to stop it: the work happened, so it is delivered
+        if task.on_done:
+            task.on_done(result)
+
+    def shutdown(self):
+        self._closed = True
+        self.cancel_all()
+        self.thread_pool.shutdown(wait=False, cancel_futures=True)
+        if self.process_pool is not None:
+            self.process_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,96 @@
+import random
+from collections import Counter
+
+import pytest
+
+import bracket
+from scheduler import Scheduler
+
+# Any team count: seeding, byes, single and double elimination
+
+@pytest.mark.parametrize("size", [2, 4, 8, 64])
+def test_seed_order_pairs_s_with_size_plus_one_minus_s(size):
+    order = bracket.seed_order(size)
+    assert sorted(order) == list(range(1, size + 1))
+    assert all(a + b == size + 1 for a, b in zip(order[0::2], order[1::2]))
+    if size >= 4:
+        # Seeds 1 and 2 are in different halves, so they can only meet in the final
+        assert (order.index(1) < size // 2) != (order.index(2) < size // 2)
+
+@pytest.mark.parametrize("team_count, names", [
+    (2, ["Final"]),
+    (5, ["Quarter Final", "Semi Final", "Final"]),
+    (17, ["Round 1", "Round 2", "Quarter Final", "Semi Final", "Final"]),
+])
+def test_round_names(team_count, names):
+    assert bracket.Bracket.seeded(team_count).round_names == names
+
+@pytest.mark.parametrize("team_count", [3, 5, 13, 100])
+def test_byes_go_to_the_top_seeds(team_count):
+    tree = bracket.Bracket.seeded(team_count)
+    size = bracket.bracket_size(team_count)
+    byes = size - team_count
+    # Byes are settled up front: the best seeds are already through round 1
+    through = sorted(tree.slots[size // 2:size])
+    assert [team for team in through if team != bracket.EMPTY] == list(range(byes))
+    assert len(tree.pairings(0)) == (team_count - byes) // 2
+
+@pytest.mark.parametrize("team_count", [2, 7, 16, 33])
+def test_single_elimination_plays_every_team_once_out(team_count):
+    tree = bracket.Bracket.seeded(team_count, random.Random(1))
+    losses = Counter()
+    rng = random.Random(2)
+    for r in range(tree.depth):
+        for node, a, b in tree.pairings(r):
+            winner = a if rng.random() < 0.5 else b
+            tree.record(r, node, winner)
+            losses[b if winner == a else a] += 1
+    assert tree.champion in range(team_count)
+    assert losses[tree.champion] == 0
+    assert sorted(losses) == sorted(set(range(team_count)) - {tree.champion})
+    assert set(losses.values()) == {1}
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("team_count", [3, 4, 6, 16, 21])
+def test_double_elimination_needs_two_losses(team_count, seed):
+    tree = bracket.DoubleBracket.seeded(team_count)
+    losses = Counter()
+    rng = random.Random(seed)
+    for r in range(len(tree.round_names)):
+        for key, a, b in tree.pairings(r):
+            winner = a if rng.random() < 0.5 else b
+            tree.record(r, key, winner)
+            losses[b if winner == a else a] += 1
+    champion = tree.champion
+    finalists = set(tree.finalists)
+    assert champion in finalists and len(finalists) == 2
+    assert tree.round_names[-1] == "Grand Final"
+    # Everyone else is out after exactly two defeats. The grand final is a
+    # single game (no reset), so either finalist may finish with one.
+    assert all(losses[team] == 2 for team in range(team_count) if team not in finalists)
+    assert all(1 <= losses[team] + (team == champion) <= 2 for team in finalists)
+    assert losses[champion] <= 1
+
+def test_play_out_picks_a_champion_from_the_field():
+    tree = bracket.Bracket.seeded(1000)
+    assert tree.play_out(random.Random(5)) in range(1000)
+    assert bracket.DoubleBracket.seeded(10).play_out(random.Random(5)) in range(10)
+
+def test_entrants_keep_their_seed_order():
+    tree = bracket.build(4, entrants=[7, 3, 9, 1])
+    assert sorted(tuple(sorted(pair[1:])) for pair in tree.pairings(0)) == [(1, 7), (3, 9)]
+
+@pytest.mark.parametrize("team_count, double", [(11, False), (11, True), (32, False)])
+def test_scheduler_runs_a_bracket_to_the_end(tmp_path, team_count, double):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i};{i}\n" for i in range(1, team_count + 1)))
+    scheduler = Scheduler(seed=3)
+    scheduler.load_teams(str(path))
+    scheduler.divide_groups()
+    scheduler.build_bracket(double)
+    for name in scheduler.round_names:
+        scheduler.schedule_round(name)
+        scheduler.complete_round(name)
+        assert scheduler.open_matches(name) == 0
+    assert scheduler.winner is not None
+    assert scheduler.winner.name in {f"Team {i}" for i in range(1, team_count + 1)}
@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import cli
+
+# Headless runs: what they import, what they print, how they fail
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture
+def teams(tmp_path):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i},B{i};{i}\n" for i in range(1, 9)))
+    return str(path)
+
+def imported_by(*argv):
+    # Modules loaded by one cli.main() call, in a fresh interpreter
+    code = ("import contextlib, io, json, sys\n"
+            "import cli\n"
+            "with contextlib.redirect_stdout(io.StringIO()):\n"
+            f"    cli.main({list(argv)!r})\n"
+            "print(json.dumps(sorted(sys.modules)))\n")
+    result = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True,
+                            text=True, check=True)
+    return set(json.loads(result.stdout))
+
+def test_plain_run_imports_only_core(teams):
+    modules = imported_by("run", teams, "--seed", "1")
+    assert not modules & {"sqlite3", "snapshot", "timetable", "database", "numpy", "simulation"}
+
+def test_rooms_pull_in_timetable(teams):
+    assert "timetable" in imported_by("run", teams, "--seed", "1", "--rooms", "2")
+
+def test_run_json_has_a_winner(teams, capsys):
+    assert cli.main(["run", teams, "--seed", "1", "--format", "json"]) in (0, None)
+    result = json.loads(capsys.readouterr().out)
+    assert result["winner"]["name"].startswith("Team ")
+
+def test_missing_file_is_an_error_not_a_traceback(tmp_path, capsys):
+    assert cli.main(["run", str(tmp_path / "missing.txt")]) == 1
+    assert capsys.readouterr().err.startswith("error: ")
+
+def test_single_team_runs_with_default_options(tmp_path, capsys):
+    path = tmp_path / "teams.txt"
+    path.write_text("Solo;A;1\n")
+    assert cli.main(["run", str(path), "--format", "json"]) in (0, None)
+    assert json.loads(capsys.readouterr().out)["winner"]["name"] == "Solo"
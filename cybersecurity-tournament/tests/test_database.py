@@ -0,0 +1,124 @@
+import pytest
+
+import database
+import ratings
+from scheduler import Scheduler
+
+# The SQLite store: tournaments written as they are played, loaded back the
+# same, and queried across tournaments
+
+@pytest.fixture
+def store(tmp_path):
+    store = database.TournamentStore(str(tmp_path / "tournaments.db"))
+    yield store
+    store.close()
+
+@pytest.fixture
+def teams(tmp_path):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i},B{i};{i}\n" for i in range(1, 11)))
+    return str(path)
+
+def state(scheduler):
+    def name(team):
+        return team.name if team is not None else None
+    return {
+        "teams": [(team.name, team.rank, list(team.members)) for team in scheduler.teams],
+        "groups": [sorted(team.name for team in group) for group in scheduler.groups],
+        "rounds": {round_name: [(name(m.team1), name(m.team2), name(m.winner)) for m in matches]
+                   for round_name, matches in scheduler.rounds.items()},
+        "winner": name(scheduler.winner),
+    }
+
+def play(scheduler, rounds=None):
+    for round_name in scheduler.round_names[:rounds]:
+        if round_name not in scheduler.round_pairings:
+            scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+
+def stored_tournament(store, teams, seed, name, double=False, group_stage=False):
+    scheduler = Scheduler(seed=seed)
+    scheduler.load_teams(teams)
+    scheduler.attach_store(store, name)
+    scheduler.divide_groups(2)
+    if group_stage:
+        scheduler.start_group_stage(advance=2)
+        play(scheduler)
+        scheduler.start_knockout(double)
+    else:
+        scheduler.build_bracket(double, random_draw=True)
+    play(scheduler)
+    return scheduler
+
+@pytest.mark.parametrize("double, group_stage", [(False, False), (True, False), (False, True)])
+def test_played_tournament_loads_back_the_same(store, teams, double, group_stage):
+    scheduler = stored_tournament(store, teams, 3, "Cup", double, group_stage)
+    (tournament_id, name, _, finished, team_count, champion), = store.tournaments()
+    assert (name, team_count, champion) == ("Cup", 10, scheduler.winner.name)
+    assert finished is not None
+    assert state(store.load(tournament_id)) == state(scheduler)
+    assert state(store.load(tournament_id, compact=True)) == state(scheduler)
+
+def test_single_results_are_batched_until_flushed(store, teams):
+    scheduler = Scheduler(seed=1)
+    scheduler.load_teams(teams)
+    recorder = scheduler.attach_store(store, "Live")
+    scheduler.divide_groups()
+    scheduler.build_bracket()
+    first = scheduler.round_names[0]
+    matches = scheduler.schedule_round(first)
+    scheduler.record_result(first, 0, matches[0].team2)
+    assert store.round_matches(recorder.tournament_id, first)[0][3] is None
+    recorder.flush()
+    assert store.round_matches(recorder.tournament_id, first)[0][3] == matches[0].team2.name
+
+def test_resume_carries_on_writing(store, teams):
+    scheduler = Scheduler(seed=5)
+    scheduler.load_teams(teams)
+    recorder = scheduler.attach_store(store)
+    scheduler.divide_groups()
+    scheduler.build_bracket()
+    play(scheduler, 2)
+    resumed = store.resume(recorder.tournament_id)
+    assert state(resumed) == state(scheduler)
+    play(resumed)
+    assert state(store.load(recorder.tournament_id)) == state(resumed)
+    assert resumed.winner is not None
+
+def test_history_queries(store, teams):
+    played = [stored_tournament(store, teams, seed, f"Cup {seed}") for seed in range(1, 4)]
+    assert [row[1] for row in store.tournaments()] == ["Cup 3", "Cup 2", "Cup 1"]
+    assert [row[1] for row in store.tournaments(limit=1, offset=1)] == ["Cup 2"]
+    history = store.team_history("Team 1")
+    assert [row[1] for row in history] == ["Cup 3", "Cup 2", "Cup 1"]
+    for (_, _, rank, games, won, _, champion), scheduler in zip(history, reversed(played)):
+        assert rank == 1 and games >= 1 and champion == (scheduler.winner.name == "Team 1")
+    titles = dict(store.champions())
+    assert sum(titles.values()) == 3
+    met = sorted((round_name, match.winner.name)
+                 for scheduler in played
+                 for round_name, matches in scheduler.rounds.items() for match in matches
+                 if {match.team1 and match.team1.name, match.team2 and match.team2.name}
+                 == {"Team 1", "Team 2"})
+    assert sorted(row[1:] for row in store.head_to_head("Team 1", "Team 2")) == met
+    tournament_id = store.tournaments()[0][0]
+    first = played[-1].round_names[0]
+    whole = store.round_matches(tournament_id, first)
+    assert len(whole) == len(played[-1].rounds[first]) >= 2
+    assert store.round_matches(tournament_id, first, 1, 2) == whole[1:2]
+    with pytest.raises(KeyError):
+        store.round_matches(tournament_id, "No Such Round")
+
+def test_ratings_round_trip_and_catch_up(store, teams):
+    for seed in range(3):
+        stored_tournament(store, teams, seed, f"Cup {seed}")
+    table = ratings.RatingTable("glicko")
+    assert table.catch_up(store) == 3
+    store.save_ratings(table)
+    loaded = store.load_ratings("glicko")
+    assert loaded.last_tournament == table.last_tournament
+    assert {name: loaded.get(name) for name in loaded.names} == \
+        {name: table.get(name) for name in table.names}
+    # Nothing new to fold in
+    assert loaded.catch_up(store) == 0
+    assert store.top_ratings("glicko", 1)[0][0] == table.top(1)[0][0]
@@ -0,0 +1,77 @@
+import csv
+import json
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+
+import export
+import timetable
+from scheduler import Scheduler
+
+# Result files: every match and team, streamed, in every format
+
+@pytest.fixture
+def played(tmp_path):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f'Team {i} "&<x>";A{i},B{i};{i}\n' for i in range(1, 12)))
+    scheduler = Scheduler(seed=2)
+    scheduler.load_teams(str(path))
+    scheduler.divide_groups(2)
+    scheduler.build_bracket()
+    scheduler.start_timetable(timetable.parse_rooms("Main:2"))
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+    return scheduler
+
+def test_csv_has_every_match_with_slot_and_room(played, tmp_path):
+    path = export.export(played, str(tmp_path / "matches.csv"))
+    with open(path, newline="", encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == export.match_count(played)
+    assert list(rows[0]) == list(export.MATCH_FIELDS)
+    final = rows[-1]
+    assert final["round"] == "Final" and final["winner"] == played.winner.name
+    assert all(row["room"] == "Main" and row["slot"] != "" for row in rows)
+
+def test_jsonl_teams_keep_members_and_groups(played, tmp_path):
+    path = export.export(played, str(tmp_path / "teams.jsonl"), teams=True)
+    with open(path, encoding="utf-8") as file:
+        rows = [json.loads(line) for line in file]
+    assert [row["name"] for row in rows] == [team.name for team in played.teams]
+    assert rows[0]["members"] == ["A1", "B1"]
+    assert {row["group"] for row in rows} == {1, 2}
+
+def test_progress_is_reported_while_streaming(played, monkeypatch, tmp_path):
+    monkeypatch.setattr(export, "PROGRESS_EVERY", 2)
+    calls = []
+    export.export(played, str(tmp_path / "m.jsonl"), progress=lambda done, total: calls.append(done))
+    assert calls == list(range(2, export.match_count(played) + 1, 2))
+
+def test_svg_is_well_formed_and_escaped(played, tmp_path):
+    path = export.export(played, str(tmp_path / "bracket.svg"))
+    root = ElementTree.parse(path).getroot()
+    texts = [element.text for element in root.iter("{http://www.w3.org/2000/svg}text")]
+    assert "Final" in texts
+    assert any(text and text.startswith('Team 1 "&<x>"') for text in texts)
+
+@pytest.mark.parametrize("extension, magic", [(".png", b"\x89PNG"), (".pdf", b"%PDF")])
+def test_pillow_drawings(played, tmp_path, extension, magic):
+    pytest.importorskip("PIL")
+    path = export.export(played, str(tmp_path / f"bracket{extension}"), max_matches=2)
+    with open(path, "rb") as file:
+        assert file.read(4) == magic
+
+def test_unknown_format_and_missing_bracket(played, tmp_path):
+    with pytest.raises(ValueError):
+        export.export(played, str(tmp_path / "results.xlsx"))
+    fresh = Scheduler()
+    with pytest.raises(ValueError):
+        export.layout(fresh)
+
+def test_layout_starts_at_the_first_small_enough_round(played):
+    _, _, boxes, lines, titles = export.layout(played, max_matches=2)
+    assert [title for _, title in titles] == ["Semi Final", "Final"]
+    assert len(boxes) == 3 and len(lines) == 2
+    # The final box shows who won it
+    assert boxes[-1][4] is not None
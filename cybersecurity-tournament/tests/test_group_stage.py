@@ -0,0 +1,65 @@
+from itertools import combinations
+
+import pytest
+
+import group_stage
+from scheduler import Scheduler
+
+# Round-robin fixtures, standings and the step into the knockout
+
+@pytest.mark.parametrize("size", [2, 3, 4, 5, 8, 9])
+def test_circle_method_meets_everyone_once(size):
+    met = []
+    for pairs in group_stage.iter_matchdays(size):
+        playing = [team for pair in pairs for team in pair]
+        # Nobody plays twice on a matchday; odd groups rest one team
+        assert len(playing) == len(set(playing)) == size - size % 2
+        met.extend(tuple(sorted(pair)) for pair in pairs)
+    assert sorted(met) == list(combinations(range(size), 2))
+    assert group_stage.matchday_count(size) == (size - 1 if size % 2 == 0 else size)
+
+def test_standings_points_then_head_to_head_then_seed():
+    stage = group_stage.GroupStage([[0, 1, 2, 3]], 4, advance=2)
+    # 3 beats 0, 0 beats 1, 1 beats 3: three teams level on points
+    for winner, loser in [(3, 0), (0, 1), (1, 3), (2, 0), (2, 1), (2, 3)]:
+        stage.record(winner, loser)
+    assert stage.finished
+    rows = stage.standings(0)
+    assert rows[0] == (2, 3, 3, 0, 9)
+    # 0, 1 and 3 each won one of their games against each other: seed decides
+    assert [row[0] for row in rows[1:]] == [0, 1, 3]
+    assert all(row[4] == 3 for row in rows[1:])
+
+def test_head_to_head_breaks_a_two_way_tie():
+    stage = group_stage.GroupStage([[0, 1, 2]], 3)
+    for winner, loser in [(1, 0), (0, 2), (1, 2)]:
+        stage.record(winner, loser)
+    assert [row[0] for row in stage.standings(0)] == [1, 0, 2]
+
+def test_qualifiers_put_group_winners_first():
+    stage = group_stage.GroupStage([[0, 2], [1, 3]], 4, advance=2)
+    stage.record(2, 0)
+    stage.record(1, 3)
+    assert stage.qualifiers() == [1, 2, 0, 3]
+
+@pytest.mark.parametrize("team_count, groups, advance", [(12, 3, 2), (10, 2, 3), (7, 2, 1)])
+def test_scheduler_group_stage_into_knockout(tmp_path, team_count, groups, advance):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i};{i}\n" for i in range(1, team_count + 1)))
+    scheduler = Scheduler(seed=8)
+    scheduler.load_teams(str(path))
+    scheduler.divide_groups(groups, "snake")
+    stage = scheduler.start_group_stage(advance=advance)
+    for round_name in list(scheduler.round_names):
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+    assert stage.finished
+    assert stage.played == sum(len(g) * (len(g) - 1) // 2 for g in stage.groups)
+    qualifiers = stage.qualifiers()
+    assert len(qualifiers) == groups * advance
+    scheduler.start_knockout()
+    knockout = [name for name in scheduler.round_names if not name.startswith("Group")]
+    for round_name in knockout:
+        scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+    assert scheduler.registry.index_of(scheduler.winner) in qualifiers
@@ -0,0 +1,57 @@
+import random
+
+import pytest
+
+import grouping
+from scheduler import Scheduler
+
+# Group sizes, seed order and organization separation of grouping.divide
+
+def divide(team_count, group_count, seeding, org_of=None):
+    rng = random.Random(0) if seeding == "random" else None
+    return grouping.divide(team_count, group_count, seeding, rng=rng, org_of=org_of)
+
+@pytest.mark.parametrize("seeding", grouping.SEEDINGS)
+@pytest.mark.parametrize("team_count, group_count", [(17, 4), (100, 5), (8, 3), (5, 5)])
+def test_groups_are_balanced(team_count, group_count, seeding):
+    groups = divide(team_count, group_count, seeding)
+    sizes = [len(group) for group in groups]
+    assert len(groups) == group_count
+    assert max(sizes) - min(sizes) <= 1
+    assert sorted(i for group in groups for i in group) == list(range(team_count))
+
+def test_pots_are_consecutive_seeds():
+    groups = grouping.divide(17, 4, "pots")
+    assert [list(group) for group in groups] == [
+        list(range(0, 5)), list(range(5, 9)), list(range(9, 13)), list(range(13, 17))]
+    # The default split stays zero-copy
+    assert all(isinstance(group, range) for group in groups)
+
+@pytest.mark.parametrize("seeding", ["snake", "random"])
+@pytest.mark.parametrize("team_count, group_count", [(17, 4), (100, 5)])
+def test_organizations_kept_apart(team_count, group_count, seeding):
+    # As many organizations as groups, each with one team per tier, so every
+    # group can hold exactly one team of each
+    orgs = [(i * 7) % group_count for i in range(team_count)]
+    groups = divide(team_count, group_count, seeding, org_of=orgs.__getitem__)
+    sizes = [len(group) for group in groups]
+    assert max(sizes) - min(sizes) <= 1
+    for group in groups:
+        group_orgs = [orgs[i] for i in group]
+        # An organization only repeats once every group has it
+        assert len(group_orgs) - len(set(group_orgs)) <= len(group) - group_count
+        assert len(set(group_orgs)) == min(len(group), group_count)
+
+@pytest.mark.parametrize("seeding", grouping.SEEDINGS)
+def test_more_groups_than_teams_rejected(seeding):
+    with pytest.raises(ValueError):
+        divide(3, 4, seeding)
+
+def test_scheduler_clamps_groups_to_team_count(tmp_path):
+    path = tmp_path / "teams.txt"
+    path.write_text("Solo;A;1\n")
+    scheduler = Scheduler(seed=1)
+    scheduler.load_teams(str(path))
+    groups = scheduler.divide_groups(2)
+    assert [[team.name for team in group] for group in groups] == [["Solo"]]
+    assert scheduler.group_B == []
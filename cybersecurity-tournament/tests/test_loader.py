@@ -0,0 +1,53 @@
+import pytest
+
+import loader
+import ratings
+from scheduler import Scheduler
+
+# Rows spilled to sorted runs on disk come back exactly as they were parsed
+
+def test_sorted_rows_round_trip_through_runs(tmp_path):
+    names = ["Plain", "Tab\there", 'Quote "x"', "Back\\slash", "Ünïcode"]
+    path = tmp_path / "teams.txt"
+    with open(path, "w", encoding="utf-8") as file:
+        for i in range(40):
+            name = f"{names[i % len(names)]} {i}"
+            file.write(f"{name};M\t{i},{name}, ;{(i * 7) % 13}\n")
+    report = loader.LoadReport()
+    in_memory = list(loader.sorted_rows(str(path), report, run_size=10 ** 6))
+    spilled = list(loader.sorted_rows(str(path), loader.LoadReport(), run_size=3, tmpdir=str(tmp_path)))
+    assert len(in_memory) == 40
+    assert spilled == in_memory
+    assert [row[0] for row in spilled] == sorted(row[0] for row in spilled)
+    # Every run file is removed once the merge is done
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["teams.txt"]
+
+def test_rated_order_is_bounded_and_matches_full_sort(tmp_path):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i};{i % 5 + 1}\n" for i in range(60)))
+    table = ratings.RatingTable()
+    for i in range(0, 60, 3):
+        table.rating[table.row(f"Team {i}")] = 1000 + (i * 37) % 400
+    key = table.order_key()
+    expected = sorted(loader.sorted_rows(str(path), loader.LoadReport()), key=key)
+    spilled = loader.sorted_rows(str(path), loader.LoadReport(), run_size=7,
+                                 tmpdir=str(tmp_path), key=key)
+    assert list(spilled) == expected
+    assert loader.top_k(str(path), 5, loader.LoadReport(), key=key) == expected[:5]
+
+    scheduler = Scheduler()
+    scheduler.load_teams(str(path), top_k=5, ratings=table)
+    assert [(team.rank, team.name) for team in scheduler.teams] == \
+        [(rank, row[2]) for rank, row in enumerate(expected[:5], 1)]
+
+def test_top_k_edges(tmp_path):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i};{(i * 5) % 7}\n" for i in range(20)) + "broken line\n")
+    report = loader.LoadReport()
+    assert loader.top_k(str(path), 0, report) == []
+    assert report.rows == 20 and report.malformed == 1
+    full = list(loader.sorted_rows(str(path), loader.LoadReport()))
+    assert loader.top_k(str(path), 6, loader.LoadReport()) == full[:6]
+    assert loader.top_k(str(path), 100, loader.LoadReport()) == full
+    with pytest.raises(ValueError):
+        loader.top_k(str(path), -1, loader.LoadReport())
@@ -0,0 +1,42 @@
+import pytest
+
+import ratings
+
+# Rating updates and the win probability model the simulator uses
+
+def rated_table(system="elo"):
+    table = ratings.RatingTable(system)
+    for i, rating in enumerate([1700.0, 1500.0, 1300.0]):
+        table.rating[table.row(f"Team {i}")] = rating
+    return table
+
+@pytest.mark.parametrize("system", ["elo", "glicko"])
+def test_winner_gains_and_loser_drops(system):
+    table = rated_table(system)
+    before = list(table.rating)
+    table.record(2, 0)          # the upset moves both teams the most
+    assert table.rating[2] > before[2] and table.rating[0] < before[0]
+    assert table.games[2] == table.games[0] == 1 and table.wins[2] == 1
+
+@pytest.mark.parametrize("system", ["elo", "glicko"])
+def test_model_takes_numpy_scalars_like_ints(system):
+    np = pytest.importorskip("numpy")
+    table = rated_table(system)
+    model = ratings.RatingModel(table, [0, 1, 2], [1, 2, 3])
+    expected = table.win_probability(0, 2)
+    assert model(1, 3) == pytest.approx(expected)
+    # Scalars go through win_probability, not a copy of the whole table
+    calls = []
+    scalar = table.win_probability
+    table.win_probability = lambda a, b: calls.append((a, b)) or scalar(a, b)
+    for rank_a, rank_b in [(np.int64(1), np.int64(3)), (np.int32(1), 3), (1.0, 3.0)]:
+        assert model(rank_a, rank_b) == pytest.approx(expected)
+    assert calls == [(0, 2)] * 3
+    del table.win_probability
+    # Arrays stay vectorised
+    p = model(np.array([1, 2]), np.array([3, 1]))
+    assert p.shape == (2,) and p[0] == pytest.approx(expected) and p[1] < 0.5
+
+def test_shared_ranks_rejected():
+    with pytest.raises(ValueError):
+        ratings.RatingModel(rated_table(), [0, 1], [1, 1])
@@ -0,0 +1,72 @@
+import json
+import socket
+
+import pytest
+
+import scoring
+from scheduler import Scheduler
+
+# The score server keeps answering every client whatever one of them sends
+
+@pytest.fixture
+def service(tmp_path):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i},B{i};{i}\n" for i in range(1, 9)))
+    scheduler = Scheduler(seed=1)
+    scheduler.load_teams(str(path))
+    scheduler.build_bracket()
+    service = scoring.ScoreService(scheduler, port=0)
+    service.start_in_thread()
+    yield service
+    service.stop()
+
+def ask(service, *events):
+    with socket.create_connection((service.host, service.port), timeout=5) as sock:
+        sock.sendall(b"".join(json.dumps(event).encode() + b"\n" for event in events))
+        reader = sock.makefile()
+        return [json.loads(reader.readline()) for _ in events]
+
+@pytest.mark.parametrize("query", [{"get": "round", "round": ["x"]},
+                                   {"get": "round"},
+                                   {"get": ["status"]}])
+def test_malformed_query_leaves_other_clients_served(service, query):
+    assert ask(service, query)[0]["ok"] is False
+    reply, = ask(service, {"round": service.scheduler.round_names[0], "match": 1, "winner": 1})
+    assert reply == {"ok": True}
+
+def test_applier_survives_unexpected_errors(service, monkeypatch):
+    def broken(event):
+        raise RuntimeError("boom")
+    monkeypatch.setattr(service, "query", broken)
+    reply, = ask(service, {"get": "status"})
+    assert reply["ok"] is False and "boom" in reply["error"]
+    reply, = ask(service, {"round": service.scheduler.round_names[0], "match": 2, "scores": [3, 1]})
+    assert reply == {"ok": True}
+
+def test_failing_event_only_fails_itself(service, monkeypatch):
+    # Events around a crashing one are recorded, answered and announced
+    seen = []
+    service.listeners.append(lambda changed, scheduled: seen.append((changed, scheduled)))
+    scheduler = service.scheduler
+    first = scheduler.round_names[0]
+    record = scheduler.record_result
+
+    def flaky(round_name, i, winner):
+        if i == 1:
+            raise RuntimeError("disk on fire")
+        return record(round_name, i, winner)
+    monkeypatch.setattr(scheduler, "record_result", flaky)
+    replies = service.apply([{"round": first, "match": i, "winner": 1, "id": i} for i in range(4)])
+    assert replies[0] == {"ok": True, "id": 0}
+    assert replies[1]["ok"] is False and "disk on fire" in replies[1]["error"]
+    assert replies[2:] == [{"ok": True, "id": 2}, {"ok": True, "id": 3}]
+    assert seen == [([(first, 0), (first, 2), (first, 3)], [])]
+    assert scheduler.rounds[first][1].winner is None
+
+def test_listener_failure_keeps_results(service):
+    def broken(changed, scheduled):
+        raise RuntimeError("redraw failed")
+    service.listeners.append(broken)
+    reply, = ask(service, {"round": service.scheduler.round_names[0], "match": 1, "winner": 2})
+    assert reply["ok"] is True and "redraw failed" in reply["warning"]
+    assert service.scheduler.rounds[service.scheduler.round_names[0]][0].winner is not None
@@ -0,0 +1,132 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+import pytest
+
+import server
+
+# The HTTP host: tournaments survive a restart, bad fields get a clear 400 and
+# teams files stay inside the host directory
+
+def write_teams(path, count=8):
+    path.write_text("".join(f"Team {i};A{i},B{i};{i}\n" for i in range(1, count + 1)))
+
+@pytest.fixture
+def host(tmp_path):
+    write_teams(tmp_path / "teams.txt")
+    host = server.TournamentHost(str(tmp_path), workers=1)
+    yield host
+    host.close(save=False)
+
+@pytest.fixture
+def http(host):
+    httpd = server.make_server(host, port=0)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    def call(method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        request = urllib.request.Request(f"http://127.0.0.1:{httpd.server_address[1]}{path}",
+                                         data=data, method=method)
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+    yield call
+    httpd.shutdown()
+    httpd.server_close()
+
+def test_create_play_and_page(http):
+    status, created = http("POST", "/tournaments", {"teams": "teams.txt", "seed": 1, "id": "cup"})
+    assert (status, created) == (201, {"id": "cup"})
+    status, played = http("POST", "/tournaments/cup/play", {})
+    assert status == 200 and played["winner"] is not None
+    assert len(played["played"]) == 3
+    status, page = http("GET", f"/tournaments/cup/rounds/{quote(played['played'][0])}"
+                        "?start=1&limit=2")
+    assert status == 200 and page["matches"] == 4 and len(page["page"]) == 2
+
+def test_lines_and_results(http):
+    lines = [f"T{i};M{i};{i}" for i in range(1, 5)]
+    assert http("POST", "/tournaments", {"lines": lines, "id": "small", "draw": "seeded"})[0] == 201
+    status, info = http("GET", "/tournaments/small")
+    first = info["rounds"][0]["name"]
+    status, replies = http("POST", "/tournaments/small/results",
+                           [{"round": first, "match": 1, "winner": 1}, {"bogus": True}])
+    assert status == 200
+    assert replies["results"][0]["ok"] is True
+    assert replies["results"][1]["ok"] is False
+
+@pytest.mark.parametrize("body, message", [({"rounds": "x"}, "rounds"),
+                                           ({"rounds": 0}, "rounds"),
+                                           ({"rounds": True}, "rounds")])
+def test_play_rejects_bad_rounds(http, body, message):
+    http("POST", "/tournaments", {"teams": "teams.txt", "id": "cup"})
+    status, reply = http("POST", "/tournaments/cup/play", body)
+    assert status == 400 and reply["error"].startswith(f"{message} must be an integer")
+
+@pytest.mark.parametrize("query", ["start=-1", "start=x", "limit=0"])
+def test_round_page_rejects_bad_slices(http, query):
+    http("POST", "/tournaments", {"teams": "teams.txt", "id": "cup"})
+    name = http("GET", "/tournaments/cup")[1]["rounds"][0]["name"]
+    status, reply = http("GET", f"/tournaments/cup/rounds/{quote(name)}?{query}")
+    assert status == 400 and "must be an integer" in reply["error"]
+
+@pytest.mark.parametrize("teams", ["../outside.txt", "/etc/passwd"])
+def test_teams_outside_directory_rejected(http, tmp_path, teams):
+    write_teams(tmp_path.parent / "outside.txt")
+    status, reply = http("POST", "/tournaments", {"teams": teams})
+    assert status == 400 and "inside the host directory" in reply["error"]
+
+def test_tournaments_survive_restart(tmp_path):
+    write_teams(tmp_path / "teams.txt")
+    host = server.TournamentHost(str(tmp_path), workers=1)
+    host.create({"teams": "teams.txt", "id": "cup", "seed": 3, "double": True})
+    host.play("cup", rounds=1)
+    before = host.status("cup")
+    host.close()
+
+    again = server.TournamentHost(str(tmp_path), workers=1)
+    try:
+        assert again.stats()["evicted"] == 1
+        assert again.status("cup") == before
+        assert again.tournaments["cup"].options["double"] is True
+        assert again.create({"teams": "teams.txt"}).id == "t1"
+        again.delete("cup")
+        assert not (tmp_path / "cup.snap").exists() and not (tmp_path / "cup.json").exists()
+    finally:
+        again.close(save=False)
+
+def test_least_recently_used_are_evicted_and_restored(tmp_path):
+    write_teams(tmp_path / "teams.txt")
+    host = server.TournamentHost(str(tmp_path), max_active=2, workers=1)
+    try:
+        for name in ("a", "b", "c"):
+            host.create({"teams": "teams.txt", "id": name, "seed": 1})
+        loaded = {entry["id"]: entry["loaded"] for entry in host.listing()}
+        assert loaded == {"a": False, "b": True, "c": True}
+        played = host.play("a", rounds=1)
+        assert played["played"] and host.restores == 1
+        # Touching "a" pushed out the least recently used one instead
+        assert host.stats()["active"] == 2 and host.stats()["evicted"] == 1
+        host.idle_seconds = 0
+        assert host.evict_idle() == 2
+        assert host.status("a")["rounds"][0]["open"] == 0
+    finally:
+        host.close(save=False)
+
+def test_simulate_runs_on_the_worker_pool(http):
+    pytest.importorskip("numpy")
+    http("POST", "/tournaments", {"teams": "teams.txt", "id": "cup", "seed": 2})
+    status, table = http("POST", "/tournaments/cup/simulate", {"runs": 2000, "limit": 3})
+    assert status == 200 and table["runs"] == 2000 and len(table["teams"]) == 3
+    # Each team's odds of reaching later rounds only go down
+    for team in table["teams"]:
+        assert team["reach"] == sorted(team["reach"], reverse=True)
+
+def test_unknown_tournament_is_404(http):
+    status, reply = http("GET", "/tournaments/nope")
+    assert status == 404 and "nope" in reply["error"]
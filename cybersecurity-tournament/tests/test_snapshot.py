@@ -0,0 +1,117 @@
+import io
+import json
+import struct
+
+import pytest
+
+import snapshot
+from scheduler import Scheduler
+
+# Snapshots bring back the whole Scheduler, mid-tournament included, and
+# refuse files that are cut short or not snapshots at all
+
+def write_teams(tmp_path, count):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i},B{i};{i}\n" for i in range(1, count + 1)))
+    return str(path)
+
+def state(scheduler):
+    # Everything a snapshot has to keep, as plain values
+    def name(team):
+        return team.name if team is not None else None
+    return {
+        "teams": [(team.name, team.rank, list(team.members)) for team in scheduler.teams],
+        "groups": [[team.name for team in group] for group in scheduler.groups],
+        "rounds": {round_name: [(name(m.team1), name(m.team2), name(m.winner), m.status)
+                                for m in matches]
+                   for round_name, matches in scheduler.rounds.items()},
+        "scheduled": sorted(scheduler.round_pairings),
+        "winner": name(scheduler.winner),
+        "seed": scheduler.rng.seed,
+    }
+
+def play(scheduler, rounds=None):
+    for round_name in scheduler.round_names[:rounds]:
+        if round_name not in scheduler.round_pairings:
+            scheduler.schedule_round(round_name)
+        scheduler.complete_round(round_name)
+
+@pytest.fixture
+def saved(tmp_path):
+    scheduler = Scheduler(seed=1)
+    scheduler.load_teams(write_teams(tmp_path, 8))
+    scheduler.divide_groups(2)
+    scheduler.build_bracket()
+    out = tmp_path / "state.snap"
+    snapshot.save(scheduler, str(out))
+    return scheduler, out
+
+def test_round_trip(saved):
+    scheduler, path = saved
+    loaded = snapshot.load(str(path), compact=False)
+    assert [team.name for team in loaded.teams] == [team.name for team in scheduler.teams]
+    assert [[team.name for team in group] for group in loaded.groups] == \
+        [[team.name for team in group] for group in scheduler.groups]
+
+@pytest.mark.parametrize("compact", [True, False])
+@pytest.mark.parametrize("double", [False, True])
+def test_mid_tournament_round_trip_plays_on_the_same(tmp_path, compact, double):
+    scheduler = Scheduler(seed=4, compact=compact)
+    scheduler.load_teams(write_teams(tmp_path, 13))
+    scheduler.divide_groups(3, "snake")
+    scheduler.build_bracket(double, random_draw=True)
+    play(scheduler, 2)
+    path = str(tmp_path / "mid.snap")
+    scheduler.save(path)
+    loaded = Scheduler.restore(path, compact=compact)
+    assert state(loaded) == state(scheduler)
+    # Both go on with the same per-round RNG streams
+    play(scheduler)
+    play(loaded)
+    assert state(loaded) == state(scheduler)
+    assert loaded.winner is not None
+
+def test_group_stage_round_trip(tmp_path):
+    scheduler = Scheduler(seed=2, compact=False)
+    scheduler.load_teams(write_teams(tmp_path, 12))
+    scheduler.divide_groups(3)
+    scheduler.start_group_stage(advance=2)
+    play(scheduler, 1)
+    path = str(tmp_path / "groups.snap")
+    scheduler.save(path)
+    loaded = Scheduler.restore(path, compact=False)
+    assert state(loaded) == state(scheduler)
+    assert loaded.group_stage is not None and loaded.group_stage.advance == 2
+
+def test_export_json_is_valid(saved):
+    scheduler, _ = saved
+    out = io.StringIO()
+    snapshot.export_json(scheduler, out)
+    exported = json.loads(out.getvalue())
+    assert len(exported["groups"]["A"]) + len(exported["groups"]["B"]) == 8
+
+def test_other_files_rejected(tmp_path, saved):
+    _, path = saved
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<I", data, 8, snapshot.VERSION - 1)
+    path.write_bytes(bytes(data))
+    with pytest.raises(snapshot.SnapshotError, match="version"):
+        snapshot.load(str(path))
+    other = tmp_path / "teams.snap"
+    other.write_bytes(b"Team 1;A;1\n" * 20)
+    with pytest.raises(snapshot.SnapshotError, match="not a scheduler snapshot"):
+        snapshot.load(str(other))
+
+@pytest.mark.parametrize("keep", [1, 8, 100])
+def test_truncated_snapshot_rejected(saved, keep):
+    _, path = saved
+    data = path.read_bytes()
+    path.write_bytes(data[:len(data) - keep])
+    with pytest.raises(ValueError, match="state.snap"):
+        snapshot.load(str(path))
+
+def test_short_section_table_rejected(saved):
+    _, path = saved
+    path.write_bytes(path.read_bytes()[:snapshot.HEADER.size + snapshot.SECTION.size])
+    with pytest.raises(snapshot.SnapshotError, match="section table"):
+        snapshot.load(str(path))
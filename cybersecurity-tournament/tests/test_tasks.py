@@ -0,0 +1,72 @@
+import threading
+
+import tasks
+
+# Cancelling only asks; a task counts as running until its worker returns
+
+class FakeRoot:
+    # Just enough of Tk for TaskRunner: after() callbacks run when pumped
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def pump(self):
+        callbacks, self.pending = self.pending, []
+        for callback in callbacks:
+            callback()
+
+def settle(runner, root):
+    while runner.busy:
+        root.pump()
+
+def run(work, **callbacks):
+    root = FakeRoot()
+    runner = tasks.TaskRunner(root, threads=2)
+    calls = []
+    task = runner.submit(work, name="work",
+                         on_done=lambda result: calls.append(("done", result)),
+                         on_error=lambda error: calls.append(("error", error)),
+                         on_cancelled=lambda: calls.append(("cancelled",)))
+    return root, runner, task, calls
+
+def test_cancel_keeps_task_active_until_worker_stops():
+    release = threading.Event()
+
+    def work(task):
+        release.wait(10)        # e.g. schedule_round, which never checks
+        return 42
+    root, runner, task, calls = run(work)
+    task.cancel()
+    root.pump()
+    assert runner.busy and calls == []
+    release.set()
+    settle(runner, root)
+    # Too late to stop it, so the finished work is delivered
+    assert calls == [("done", 42)] and not runner.busy
+    runner.shutdown()
+
+def test_cancel_at_check_reports_cancelled():
+    started, release = threading.Event(), threading.Event()
+
+    def work(task):
+        started.set()
+        release.wait(10)
+        task.check()
+        return "unreachable"
+    root, runner, task, calls = run(work)
+    started.wait(10)
+    task.cancel()
+    release.set()
+    settle(runner, root)
+    assert calls == [("cancelled",)]
+    runner.shutdown()
+
+def test_errors_reach_on_error():
+    def work(task):
+        raise RuntimeError("bad")
+    root, runner, task, calls = run(work)
+    settle(runner, root)
+    assert calls[0][0] == "error" and str(calls[0][1]) == "bad"
+    runner.shutdown()
@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+import timetable
+from scheduler import Scheduler
+
+# Slots and rooms: no table or team is ever double-booked and rest is kept
+
+def test_parse_rooms():
+    rooms = timetable.parse_rooms("Hall A:8, Lab 1:4,Lab 2")
+    assert [(room.name, room.capacity) for room in rooms] == [("Hall A", 8), ("Lab 1", 4),
+                                                              ("Lab 2", 1)]
+    for spec in ("", "Hall:0", "Hall:x", ":3"):
+        with pytest.raises(ValueError):
+            timetable.parse_rooms(spec)
+
+def check(slots, rounds, duration, rest):
+    # rounds: [(round name, sides)]; every match against every other
+    booked = {}         # table -> [(start, end)]
+    team_games = {}     # team -> [(start, end)]
+    for round_name, sides in rounds:
+        for i, (a, b) in enumerate(sides):
+            start = slots.starts[round_name][i]
+            table = slots.tables[round_name][i]
+            booked.setdefault(table, []).append((start, start + duration))
+            for team in (a, b):
+                team_games.setdefault(team, []).append((start, start + duration))
+    for spans in booked.values():
+        spans.sort()
+        assert all(end <= start for (_, end), (start, _) in zip(spans, spans[1:]))
+    for spans in team_games.values():
+        # In play order already: later rounds never start before the rest is over
+        assert all(end + rest <= start for (_, end), (start, _) in zip(spans, spans[1:]))
+    assert max(slots.usage, default=0) <= len(slots.room_of)
+
+@pytest.mark.parametrize("duration, rest", [(1, 0), (2, 1), (3, 2)])
+def test_random_rounds_never_double_book(duration, rest):
+    rng = random.Random(duration * 10 + rest)
+    rooms = timetable.parse_rooms("A:3,B:2")
+    slots = timetable.Timetable(rooms, 40, duration, rest)
+    rounds = []
+    for r in range(6):
+        teams = rng.sample(range(40), 2 * rng.randint(3, 20))
+        sides = list(zip(teams[0::2], teams[1::2]))
+        slots.assign(f"Round {r}", sides)
+        rounds.append((f"Round {r}", sides))
+    check(slots, rounds, duration, rest)
+    summary = slots.summary()
+    assert summary["matches"] == sum(len(sides) for _, sides in rounds)
+    assert 0 < summary["utilization"] <= 1
+    assert summary["peak"] <= summary["tables"] == 5
+
+def test_full_tables_wait_for_the_first_free_one():
+    slots = timetable.Timetable([timetable.Room("Only", 2)], 8)
+    starts = slots.assign("Round 1", [(0, 1), (2, 3), (4, 5), (6, 7)])
+    assert list(starts) == [0, 0, 1, 1]
+    assert slots.slot_of("Round 1", 3) == (1, slots.rooms[0])
+    assert slots.utilization == 1.0
+
+@pytest.mark.parametrize("rest", [0, 1])
+def test_scheduler_slots_every_match(tmp_path, rest):
+    path = tmp_path / "teams.txt"
+    path.write_text("".join(f"Team {i};A{i};{i}\n" for i in range(1, 25)))
+    scheduler = Scheduler(seed=6)
+    scheduler.load_teams(str(path))
+    scheduler.divide_groups()
+    scheduler.build_bracket(True)
+    slots = scheduler.start_timetable(timetable.parse_rooms("Main:3,Side"), 2, rest)
+    rounds = []
+    for round_name in scheduler.round_names:
+        scheduler.schedule_round(round_name)
+        rounds.append((round_name, list(scheduler.round_sides(round_name))))
+        scheduler.complete_round(round_name)
+    check(slots, rounds, 2, rest)
+    assert slots.matches == sum(len(sides) for _, sides in rounds)
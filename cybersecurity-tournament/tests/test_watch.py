@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from scheduler import Scheduler
+from watch import TeamsWatcher
+
+# Following teams.txt edits: appended, edited and removed lines reach the
+# Scheduler, malformed lines are reported, and late changes are refused
+
+def lines(first, last):
+    return "".join(f"Team {i};A{i},B{i};{i}\n" for i in range(first, last + 1))
+
+class TeamsFile:
+    def __init__(self, path):
+        self.path = path
+        self.tick = 1_000_000_000
+
+    def write(self, text):
+        self.path.write_text(text)
+        # Moves the mtime on even when two writes land in the same clock tick
+        self.tick += 1_000_000_000
+        os.utime(self.path, ns=(self.tick, self.tick))
+
+    def append(self, text):
+        self.write(self.path.read_text() + text)
+
+@pytest.fixture
+def teams_file(tmp_path):
+    teams_file = TeamsFile(tmp_path / "teams.txt")
+    teams_file.write(lines(1, 6))
+    return teams_file
+
+@pytest.fixture
+def scheduler(teams_file):
+    scheduler = Scheduler(seed=1)
+    scheduler.load_teams(str(teams_file.path))
+    scheduler.divide_groups(2)
+    return scheduler
+
+def names(scheduler):
+    return [team.name for team in scheduler.teams]
+
+def test_unchanged_file_polls_nothing(scheduler, teams_file):
+    watcher = TeamsWatcher(scheduler, str(teams_file.path))
+    assert watcher.poll() is None
+    teams_file.write(teams_file.path.read_text())
+    changes = watcher.poll()
+    assert not changes and changes.refused is None
+
+def test_appended_lines_add_teams_in_rank_order(scheduler, teams_file):
+    watcher = TeamsWatcher(scheduler, str(teams_file.path))
+    teams_file.append("Team 0;A0;0\nTeam 7;A7;7\n")
+    changes = watcher.poll()
+    assert sorted(changes.added) == ["Team 0", "Team 7"]
+    assert names(scheduler) == [f"Team {i}" for i in range(8)]
+    assert sorted(team.name for group in scheduler.groups for team in group) == \
+        sorted(names(scheduler))
+
+def test_line_completed_later_is_read_once(scheduler, teams_file):
+    watcher = TeamsWatcher(scheduler, str(teams_file.path))
+    teams_file.append("Team 7;A7")
+    assert watcher.poll().errors
+    teams_file.append(";7\n")
+    changes = watcher.poll()
+    assert changes.added == ["Team 7"] and not changes.errors
+    assert names(scheduler)[-1] == "Team 7"
+
+def test_edited_and_removed_lines(scheduler, teams_file):
+    watcher = TeamsWatcher(scheduler, str(teams_file.path))
+    text = teams_file.path.read_text()
+    text = text.replace("Team 2;A2,B2;2\n", "").replace("Team 5;A5,B5;5", "Team 5;A5,B5;0")
+    text = text.replace("Team 3;A3,B3;3", "Team 3;C3;3")
+    teams_file.write(text)
+    changes = watcher.poll()
+    assert changes.removed == ["Team 2"]
+    assert sorted(changes.changed) == ["Team 3", "Team 5"]
+    assert names(scheduler) == ["Team 5", "Team 1", "Team 3", "Team 4", "Team 6"]
+    assert [team.members for team in scheduler.teams if team.name == "Team 3"] == [["C3"]]
+
+def test_malformed_lines_are_reported_with_line_numbers(scheduler, teams_file):
+    watcher = TeamsWatcher(scheduler, str(teams_file.path))
+    teams_file.append("no separators\nTeam 7;A7;seven\nTeam 8;A8;8\n")
+    changes = watcher.poll()
+    assert changes.added == ["Team 8"]
+    assert [line_no for line_no, _ in changes.errors] == [7, 8]
+    assert "1 added" in str(changes) and "2 malformed lines" in str(changes)
+
+def test_changes_refused_once_rounds_are_scheduled(scheduler, teams_file):
+    watcher = TeamsWatcher(scheduler, str(teams_file.path))
+    scheduler.build_bracket()
+    scheduler.schedule_round(scheduler.round_names[0])
+    teams_file.append("Team 7;A7;7\n")
+    changes = watcher.poll()
+    assert changes.refused and "refused" in str(changes)
+    assert "Team 7" not in names(scheduler)
+    # The refused line stays pending; a member change still goes through
+    teams_file.write(teams_file.path.read_text().replace("Team 1;A1,B1;1", "Team 1;C1;1"))
+    changes = watcher.poll()
+    assert changes.refused
+    teams_file.write(teams_file.path.read_text().replace("Team 7;A7;7\n", ""))
+    changes = watcher.poll()
+    assert changes.refused is None and changes.changed == ["Team 1"]
+    assert scheduler.teams[0].members == ["C1"]
+
+def test_empty_scheduler_registers_every_line(teams_file):
+    scheduler = Scheduler(seed=1)
+    watcher = TeamsWatcher(scheduler, str(teams_file.path))
+    changes = watcher.poll()
+    assert len(changes.added) == 6
+    assert names(scheduler) == [f"Team {i}" for i in range(1, 7)]
@@ -0,0 +1,128 @@
+import heapq
+from array import array
+
+# When and where matches are played. Time is counted in slots of one match
+# length; every room has `capacity` tables, i.e. matches it can host side by
+# side. A team never plays two matches at once and sits out `rest` slots
+# between its matches.
+#
+# Allocation is list scheduling over a heap of tables keyed by the slot each
+# one frees up: a round's matches go in the order their teams become ready,
+# and each takes the table that frees up first, starting once the table and
+# both teams are free. That is O(m log T) for m matches over T tables, and
+# start slots and tables are kept as one array each per round.
+
+# ---------------------------- ROOMS ---------------------------- #
+class Room:
+    __slots__ = ("name", "capacity")
+
+    def __init__(self, name, capacity=1):
+        if capacity < 1:
+            raise ValueError(f"room {name!r} needs a capacity of at least 1")
+        self.name = name
+        self.capacity = capacity
+
+def parse_rooms(spec):
+    # "Hall A:8,Lab 1:4,Lab 2" -> rooms; a room without :N holds one match
+    rooms = []
+    for part in spec.split(","):
+        name, colon, capacity = part.strip().rpartition(":")
+        if not colon:
+            name, capacity = capacity, "1"
+        try:
+            rooms.append(Room(name.strip(), int(capacity)))
+        except ValueError:
+            raise ValueError(f"bad room {part.strip()!r}, expected NAME or NAME:CAPACITY") from None
+    if not rooms or not all(room.name for room in rooms):
+        raise ValueError("need at least one named room")
+    return rooms
+
+# ---------------------------- TIMETABLE ---------------------------- #
+class Timetable:
+    def __init__(self, rooms, team_count, duration=1, rest=0):
+        if duration < 1 or rest < 0:
+            raise ValueError("matches need a duration of at least one slot and rest >= 0")
+        self.rooms = list(rooms)
+        self.team_count = team_count
+        self.duration = duration
+        self.rest = rest
+        # Table t belongs to room room_of[t]; rooms listed first fill first
+        self.room_of = array("i")
+        for r, room in enumerate(self.rooms):
+            self.room_of.extend(array("i", [r]) * room.capacity)
+        self.reset()
+
+    def reset(self):
+        self._free = [(0, t) for t in range(len(self.room_of))]   # already a heap
+        self.ready = array("i", [0]) * self.team_count              # first slot a team may play
+        self.starts = {}        # round name -> start slot of every match
+        self.tables = {}        # round name -> table of every match
+        self.usage = array("i")  # matches running in each slot
+        self.matches = 0
+        self.makespan = 0
+
+    def assign(self, round_name, sides):
+        # sides: (team index, team index) per match, in match order. Returns
+        # the start slot of every match.
+        sides = list(sides)
+        ready = self.ready
+        after = [max(ready[a], ready[b]) for a, b in sides]
+        starts = array("i", [0]) * len(sides)
+        tables = array("i", [0]) * len(sides)
+        free = self._free
+        duration = self.duration
+        gap = duration + self.rest
+        usage = self.usage
+        for m in sorted(range(len(sides)), key=after.__getitem__):
+            slot, table = free[0]
+            start = max(slot, after[m])
+            heapq.heapreplace(free, (start + duration, table))
+            starts[m] = start
+            tables[m] = table
+            a, b = sides[m]
+            ready[a] = ready[b] = start + gap
+            end = start + duration
+            if end > len(usage):
+                usage.extend(array("i", [0]) * (end - len(usage)))
+            for s in range(start, end):
+                usage[s] += 1
+            if end > self.makespan:
+                self.makespan = end
+        self.starts[round_name] = starts
+        self.tables[round_name] = tables
+        self.matches += len(sides)
+        return starts
+
+    def slot_of(self, round_name, i):
+        # (start slot, room) of match i of a round
+        return self.starts[round_name][i], self.rooms[self.room_of[self.tables[round_name][i]]]
+
+    @property
+    def utilization(self):
+        # Share of table-slots up to the makespan that host a match
+        capacity = len(self.room_of) * self.makespan
+        return self.matches * self.duration / capacity if capacity else 0.0
+
+    def summary(self):
+        rounds = []
+        for round_name, starts in self.starts.items():
+            if len(starts):
+                rounds.append({"name": round_name, "matches": len(starts),
+                               "first_slot": min(starts),
+                               "last_slot": max(starts) + self.duration - 1})
+        room_busy = [0] * len(self.rooms)
+        room_of = self.room_of
+        for tables in self.tables.values():
+            for table in tables:
+                room_busy[room_of[table]] += self.duration
+        return {
+            "matches": self.matches,
+            "tables": len(self.room_of),
+            "makespan": self.makespan,
+            "utilization": self.utilization,
+            "peak": max(self.usage, default=0),
+            "rooms": [{"name": room.name, "capacity": room.capacity,
+                       "utilization": busy / (room.capacity * self.makespan) if self.makespan else 0.0}
+                      for room, busy in zip(self.rooms, room_busy)],
+            "rounds": rounds,
+        }
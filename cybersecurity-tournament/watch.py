@@ -0,0 +1,182 @@
+import locale
+import os
+import time
+import zlib
+
+import loader
+
+# Watches teams.txt while registrations are still coming in and feeds what
+# changed into a Scheduler (Scheduler.update_teams) instead of loading the
+# whole file again.
+#
+# poll() costs one os.stat() while the file is unchanged. When the size or
+# mtime moved, the file is read and checked against a CRC of everything up to
+# its last complete line: if that is unchanged, lines were only appended and
+# just the bytes after it are looked at. Otherwise every line is compared
+# with the set of lines seen before; either way only lines that are new or
+# gone are parsed. Teams are identified by name, so a line whose rank or
+# members changed shows up as a changed team, not a new one.
+#
+# A change the Scheduler refuses (rounds already scheduled) is reported and
+# left pending: the watcher keeps its previous view of the file, so the next
+# edit is compared against what the Scheduler actually has.
+
+# ---------------------------- CONSTANTS ---------------------------- #
+POLL_SECONDS = 1.0          # How often the GUI and `watch.py` look at the file
+
+# ---------------------------- CHANGES ---------------------------- #
+class TeamChanges:
+    # What one poll did to the Scheduler's teams
+    def __init__(self, added=(), changed=(), removed=(), errors=(), refused=None):
+        self.added = list(added)        # names of new teams
+        self.changed = list(changed)    # names of teams with a new rank or members
+        self.removed = list(removed)    # names of withdrawn teams
+        self.errors = list(errors)      # (line number, message) of malformed new lines
+        self.refused = refused          # why the Scheduler refused the change, or None
+        self.seconds = 0.0
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.removed)
+
+    def __str__(self):
+        if self.refused is not None:
+            return f"teams file change refused: {self.refused}"
+        text = (f"{len(self.added)} added, {len(self.changed)} changed, "
+                f"{len(self.removed)} removed in {self.seconds * 1000:.1f} ms")
+        if self.errors:
+            text += f", {len(self.errors)} malformed lines"
+        return text
+
+# ---------------------------- WATCHER ---------------------------- #
+class TeamsWatcher:
+    def __init__(self, scheduler, filename, encoding=None):
+        self.scheduler = scheduler
+        self.filename = filename
+        self.encoding = encoding or locale.getpreferredencoding(False)
+        self.baseline()
+
+    def baseline(self):
+        # Takes the file as it is now to be what the Scheduler holds, e.g.
+        # right after load_teams; a Scheduler without teams starts from an
+        # empty file, so the first poll registers every line
+        self.stamp = None
+        self.lines = set()          # every stripped line seen, parsed or not
+        self.complete = 0           # bytes up to and including the last "\n"
+        self.crc = 0                # CRC32 of those bytes
+        self.line_count = 0         # lines in those bytes
+        self.partial = ""           # the last line when it has no "\n" yet
+        if len(self.scheduler.teams):
+            data = self.read()
+            if data is not None:
+                self.commit(data, *self.diff(data))
+
+    def stat(self):
+        try:
+            info = os.stat(self.filename)
+        except OSError:
+            return None
+        return info.st_mtime_ns, info.st_size, info.st_ino
+
+    def read(self):
+        self.stamp = self.stat()
+        try:
+            with open(self.filename, "rb") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def diff(self, data):
+        # (new lines with their line numbers, lines gone); only the part
+        # after the last complete line if nothing before it changed
+        if len(data) >= self.complete and zlib.crc32(data[:self.complete]) == self.crc:
+            text = data[self.complete:].decode(self.encoding, errors="replace")
+            first = self.line_count + 1
+            gone = {self.partial} if self.partial else set()
+        else:
+            text = data.decode(self.encoding, errors="replace")
+            first = 1
+            gone = set(self.lines)
+        seen = self.lines
+        new = []
+        for line_no, line in enumerate(text.split("\n"), first):
+            line = line.strip()
+            if not line:
+                continue
+            gone.discard(line)
+            if line not in seen:
+                new.append((line_no, line))
+        return new, gone
+
+    def commit(self, data, new, gone):
+        self.lines.difference_update(gone)
+        self.lines.update(line for _, line in new)
+        self.complete = data.rfind(b"\n") + 1
+        self.crc = zlib.crc32(data[:self.complete])
+        self.line_count = data.count(b"\n", 0, self.complete)
+        self.partial = data[self.complete:].decode(self.encoding, errors="replace").strip()
+
+    def poll(self):
+        # TeamChanges when the file changed since the last poll, else None
+        stamp = self.stat()
+        if stamp == self.stamp or stamp is None:
+            return None
+        start = time.perf_counter()
+        data = self.read()
+        if data is None:
+            return None
+        new, gone = self.diff(data)
+        rows = {}
+        errors = []
+        for line_no, line in new:
+            try:
+                name, members, rank = loader.parse_row(line)
+            except ValueError as e:
+                errors.append((line_no, str(e)))
+                continue
+            rows[name] = (name, members, rank)
+        removed = []
+        for line in gone:
+            try:
+                name = loader.parse_row(line)[0]
+            except ValueError:
+                continue        # was skipped as malformed when it came in
+            # Still registered if another line with that name is left
+            marker = f"\n{name};".encode(self.encoding)
+            if name not in rows and not (data.startswith(marker[1:]) or marker in data):
+                removed.append(name)
+        try:
+            added, changed, removed = self.scheduler.update_teams(rows.values(), removed)
+        except ValueError as e:
+            changes = TeamChanges(errors=errors, refused=str(e))
+        else:
+            self.commit(data, new, gone)
+            changes = TeamChanges(added, changed, removed, errors)
+        changes.seconds = time.perf_counter() - start
+        return changes
+
+# ---------------------------- MAIN EXECUTION ---------------------------- #
+if __name__ == "__main__":
+    import argparse
+
+    from scheduler import Scheduler
+
+    parser = argparse.ArgumentParser(description="Load a teams file and follow its changes")
+    parser.add_argument("filename", nargs="?", default="teams.txt")
+    parser.add_argument("--interval", type=float, default=POLL_SECONDS, help="seconds between polls")
+    args = parser.parse_args()
+
+    scheduler = Scheduler()
+    scheduler.load_teams(args.filename)
+    print(f"{len(scheduler.teams)} teams, watching {args.filename} (Ctrl+C to stop)")
+    watcher = TeamsWatcher(scheduler, args.filename)
+    try:
+        while True:
+            time.sleep(args.interval)
+            changes = watcher.poll()
+            if changes is None:
+                continue
+            print(f"{len(scheduler.teams)} teams: {changes}")
+            for line_no, message in changes.errors[:20]:
+                print(f"  line {line_no}: {message}")
+    except KeyboardInterrupt:
+        pass